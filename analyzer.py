@@ -6,147 +6,168 @@ It handles fetching repository data, analyzing code quality, activity metrics,
 and community engagement.
 """
 
+import asyncio
+import base64
+import codecs
 import concurrent.futures
 import contextlib
+import copy
 import dataclasses
+import functools
+import itertools
 import json
+import re
+import tarfile
+import threading
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union, BinaryIO
 
+import requests
 from github.GithubException import GithubException, RateLimitExceededException
 from github.Repository import Repository
 from tqdm.auto import tqdm
 
-from config import BINARY_EXTENSIONS, CONFIG_FILES, EXCLUDED_DIRECTORIES, LANGUAGE_EXTENSIONS, \
+from config import BINARY_EXTENSIONS, CONFIG_FILES, EXCLUDED_DIRECTORIES, \
     SPECIAL_FILENAMES, PACKAGE_FILES, DEPLOYMENT_FILES, RELEASE_FILES, Configuration, is_game_repo, \
-    MEDIA_FILE_EXTENSIONS, get_media_type, AUDIO_FILE_EXTENSIONS
+    MEDIA_FILE_EXTENSIONS, get_media_type, AUDIO_FILE_EXTENSIONS, TEST_PATH_PATTERNS, RELEASE_PATH_PATTERNS, \
+    CICD_PATH_PATTERNS, CICD_FILENAMES, CICD_FILE_TYPES, CONFIG_FILE_TYPES, PACKAGE_FILE_TYPES, DEPLOYMENT_FILE_TYPES
+from async_client import AsyncGithubClient, ASYNC_AVAILABLE
+from blob_cache import BlobCache
+from content_filter import ContentFilter
+from directory_tree import DirectoryAggregator
 from console import rprint, logger, RateLimitDisplay
+from language_engine import LanguageEngine, language_engine
+from loc_pool import LocProcessPool
+from loc_scanner import LocScanner
+from local_repo import RepoCloner, LocalRepoFile, GitObjectReader, GitError
 from models import RepoStats, BaseRepoInfo, CodeStats, QualityIndicators, ActivityMetrics, CommunityMetrics, \
     AnalysisScores, MediaMetrics
-from utilities import ensure_utc
+from notebook_scanner import NotebookScanner, count_notebook_source
+from path_classifier import PathInfo, as_path_info, path_classifier, FILE_DOCS, FILE_TEST, FILE_CICD, FILE_CONFIG, \
+    FILE_PACKAGE, FILE_DEPLOYMENT, FILE_RELEASE, FILE_BINARY
+from rate_budget import RateBudget
+from repo_scheduler import RepoScheduler
+from token_pool import create_token_session
+from utilities import ensure_utc, IncrementalEntry, IncrementalStore
+
+# Chunk size when a buffer has to be decoded to be counted
+BUFFER_CHUNK_SIZE = 1024 * 1024
+# Bytes str whitespace rules treat differently from bytes ones
+_NON_ASCII_BYTE = re.compile(rb'[\x1c-\x1f\x80-\xff]')
 
 # Initialize the rate limit display
 rate_display = RateLimitDisplay()
 
 
-def is_binary_file(file_path: str) -> bool:
+def is_binary_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if file is binary"""
-    ext = Path(file_path).suffix.lower()
+    ext = as_path_info(file_path).extension
     return ext in BINARY_EXTENSIONS or ext in MEDIA_FILE_EXTENSIONS
 
 
-def is_deployment_file(file_path: str) -> bool:
+def is_deployment_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if file is related to deployment"""
-    filename = Path(file_path).name.lower()
+    info = as_path_info(file_path)
+    filename = info.lower_name
 
     # Check against DEPLOYMENT_FILES set
-    if filename in DEPLOYMENT_FILES or any(pattern in file_path.lower() for pattern in DEPLOYMENT_FILES):
+    if filename in DEPLOYMENT_FILES or any(pattern in info.lower_path for pattern in DEPLOYMENT_FILES):
         return True
 
     # Check if it's in the special filenames dictionary and is a deployment file
-    base_filename = Path(file_path).name
+    base_filename = info.name
     if base_filename in SPECIAL_FILENAMES:
         file_type = SPECIAL_FILENAMES[base_filename]
-        if any(deploy_type in file_type for deploy_type in
-               ['Docker', 'Kubernetes', 'Deploy', 'Terraform']):
+        if any(deploy_type in file_type for deploy_type in DEPLOYMENT_FILE_TYPES):
             return True
 
     return False
 
 
-def is_release_file(file_path: str) -> bool:
+def is_release_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if file is related to releases"""
-    filename = Path(file_path).name.lower()
+    info = as_path_info(file_path)
+    filename = info.lower_name
 
     # Check against RELEASE_FILES set
-    if filename in RELEASE_FILES or any(pattern in file_path.lower() for pattern in RELEASE_FILES):
+    if filename in RELEASE_FILES or any(pattern in info.lower_path for pattern in RELEASE_FILES):
         return True
 
     # Check for specific release patterns
-    release_patterns = [
-        'changelog', 'changes', 'releases', 'version', 'semver',
-        'semantic-release', '.github/releases'
-    ]
-    if any(pattern in file_path.lower() for pattern in release_patterns):
+    if any(pattern in info.lower_path for pattern in RELEASE_PATH_PATTERNS):
         return True
 
     return False
 
 
-def is_test_file(file_path: str) -> bool:
+def is_test_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if file is a test file"""
-    file_path_lower = file_path.lower()
-    filename = Path(file_path).name.lower()
+    info = as_path_info(file_path)
+    file_path_lower = info.lower_path
+    filename = info.lower_name
 
     # Check various test file patterns
-    test_patterns = [
-        '/test/', '/tests/', '/spec/', '/specs/',
-        'test_', '_test.', '.test.', '.spec.',
-        'test.', 'spec.', 'tests.', 'specs.'
-    ]
-
     return any(pattern in file_path_lower or filename.startswith(pattern) or filename.endswith(pattern)
-               for pattern in test_patterns)
+               for pattern in TEST_PATH_PATTERNS)
 
 
-def is_package_file(file_path: str) -> bool:
+def is_package_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if file is related to package management"""
-    filename = Path(file_path).name.lower()
+    info = as_path_info(file_path)
+    filename = info.lower_name
 
     # Check against PACKAGE_FILES set
-    if filename in PACKAGE_FILES or any(pattern in file_path.lower() for pattern in PACKAGE_FILES):
+    if filename in PACKAGE_FILES or any(pattern in info.lower_path for pattern in PACKAGE_FILES):
         return True
 
     # Check if it's in the special filenames dictionary and is a package file
-    base_filename = Path(file_path).name
+    base_filename = info.name
     if base_filename in SPECIAL_FILENAMES:
         file_type = SPECIAL_FILENAMES[base_filename]
-        if any(pkg_type in file_type for pkg_type in
-               ['TOML', 'JSON', 'Package', 'Requirements', 'Gemfile', 'Cargo']):
+        if any(pkg_type in file_type for pkg_type in PACKAGE_FILE_TYPES):
             return True
 
     return False
 
 
-def is_cicd_file(file_path: str) -> bool:
+def is_cicd_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if a file is likely related to CI/CD pipelines."""
-    file_path_lower = file_path.lower()
+    info = as_path_info(file_path)
+    file_path_lower = info.lower_path
 
     # Check for common CI/CD directory patterns
-    ci_cd_patterns = ['.github/workflows', '.circleci', '.travis', 'jenkins', 'gitlab-ci']
-    for pattern in ci_cd_patterns:
+    for pattern in CICD_PATH_PATTERNS:
         if pattern in file_path_lower:
             return True
 
     # Check special filenames for CI/CD related files
-    base_filename = Path(file_path).name
+    base_filename = info.name
     if base_filename in SPECIAL_FILENAMES:
         file_type = SPECIAL_FILENAMES[base_filename]
-        if any(ci_type in file_type for ci_type in
-               ['Docker', 'Jenkinsfile', 'YAML', 'CI', 'CD']):
+        if any(ci_type in file_type for ci_type in CICD_FILE_TYPES):
             return True
 
     # Check for common CI/CD file names without extensions
-    ci_cd_filenames = {'dockerfile', 'jenkinsfile', 'vagrantfile', 'procfile'}
-    if base_filename.lower() in ci_cd_filenames:
+    if info.lower_name in CICD_FILENAMES:
         return True
 
     return False
 
 
-def is_excluded_file(file_path: str) -> bool:
+def is_excluded_file(file_path: Union[str, PathInfo]) -> bool:
     """Check if file should be excluded from analysis"""
+    info = as_path_info(file_path)
 
     # Skip .gitkeep files
-    filename = Path(file_path).name.lower()
+    filename = info.lower_name
     if filename == '.gitkeep' or filename == '.gitignore':
         return True
 
     # Check if it's a binary file
-    if is_binary_file(file_path):
+    if is_binary_file(info):
         return True
 
     return False
@@ -159,6 +180,10 @@ class LineProcessResult:
     in_block_comment: bool
 
 
+class AnalysisPaused(Exception):
+    """Raised when a repository's file analysis stops for the rate limit after saving its progress"""
+
+
 @dataclasses.dataclass
 class AnalysisState:
     """Encapsulates the state of an ongoing analysis"""
@@ -169,6 +194,137 @@ class AnalysisState:
     total_repos: int
 
 
+class TreeFile:
+    """
+    A file entry from the Git Trees API.
+
+    Exposes the same ``path``, ``size``, ``sha`` and ``decoded_content``
+    attributes the file analysis pipeline reads from ``ContentFile`` objects,
+    but only downloads the blob when its content is actually needed.
+    """
+
+    type = "file"
+
+    def __init__(self, repo: Repository, path: str, sha: str, size: Optional[int]):
+        self.repo = repo
+        self.path = path
+        self.path_info = PathInfo(path)
+        self.sha = sha
+        self.size = size or 0
+        self.known_loc: Optional[int] = None  # LOC carried over from a previous run of the same blob
+        self.known_language: Optional[str] = None  # Language sniffed from the same blob by that run
+        self._content: Optional[bytes] = None
+        self._stream: Optional[BinaryIO] = None
+
+    @property
+    def decoded_content(self) -> bytes:
+        """Fetch and decode the blob content on first access"""
+        if self._content is None and self._stream is not None:
+            self._content, self._stream = self._stream.read(), None
+        if self._content is None:
+            blob = self.repo.get_git_blob(self.sha)
+            self._content = base64.b64decode(blob.content) if blob.encoding == "base64" else blob.content.encode()
+        return self._content
+
+    def iter_chunks(self, chunk_size: int, session: Optional[requests.Session] = None) -> Iterator[bytes]:
+        """
+        Yield the blob content in chunks without holding all of it.
+
+        Content already in memory or preloaded as a stream is used as-is;
+        otherwise the raw blob is streamed through ``session``, which must
+        carry the token's Authorization header.
+        """
+        if self._stream is not None:
+            stream, self._stream = self._stream, None
+            yield from iter(lambda: stream.read(chunk_size), b'')
+            return
+
+        if self._content is not None or session is None:
+            yield self.decoded_content
+            return
+
+        yield from self.iter_blob_chunks(chunk_size, session)
+
+    def iter_blob_chunks(self, chunk_size: int, session: requests.Session) -> Iterator[bytes]:
+        """Stream the raw blob from the API through ``session``, ignoring any preloaded content"""
+        with session.get(f"{self.repo.url}/git/blobs/{self.sha}", stream=True,
+                         headers={'Accept': 'application/vnd.github.raw'}) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
+    def preload(self, content: Union[bytes, BinaryIO]) -> None:
+        """
+        Provide content obtained elsewhere (e.g. from an archive) so no blob request is made.
+
+        A file object is read only when the content is needed, whole or in chunks.
+        """
+        if isinstance(content, bytes):
+            self._content = content
+        else:
+            self._stream = content
+
+    def release(self) -> None:
+        """Drop cached content once the file has been analyzed"""
+        self._content = None
+        self._stream = None
+
+    def __repr__(self) -> str:
+        return f'TreeFile(path="{self.path}", sha="{self.sha}")'
+
+
+class ArchiveMemberStream:
+    """
+    Content of an archive member, read as the archive streams past.
+
+    When the archive breaks off in the middle of the member, the rest of the
+    content comes from ``resume`` (the blob streamed from the API) instead, so
+    the file is still counted whole; ``error`` keeps what broke the archive.
+    """
+
+    def __init__(self, member: BinaryIO, resume: Callable[[], Iterator[bytes]]):
+        self.error: Optional[Exception] = None
+        self._member = member
+        self._resume = resume
+        self._offset = 0
+        self._rest: Optional[Iterator[bytes]] = None
+        # Bytes of the last resumed chunk not returned yet
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes (all that is left when negative); b'' at the end"""
+        if self._rest is None:
+            try:
+                data = self._member.read(size)
+            except Exception as e:
+                self.error = e
+                self._rest = self._skip(self._resume(), self._offset)
+            else:
+                self._offset += len(data)
+                return data
+
+        if size is None or size < 0:
+            data, self._buffer = self._buffer + b''.join(self._rest), b''
+            return data
+
+        while not self._buffer:
+            chunk = next(self._rest, None)
+            if chunk is None:
+                return b''
+            self._buffer = chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    @staticmethod
+    def _skip(chunks: Iterator[bytes], count: int) -> Iterator[bytes]:
+        """The chunks after their first ``count`` bytes"""
+        for chunk in chunks:
+            if count >= len(chunk):
+                count -= len(chunk)
+                continue
+            yield chunk[count:]
+            count = 0
+
+
 class CodeAnalyzer:
     """
     A comprehensive class for analyzing code across multiple languages.
@@ -181,65 +337,16 @@ class CodeAnalyzer:
         """Initialize the CodeAnalyzer with language-specific comment patterns."""
         # Language comment pattern definitions
         self.language_patterns = self._get_language_patterns()
-        # Map file extensions to language types
-        self.extension_to_language = self._get_extension_to_language()
-
-    @staticmethod
-    def _get_extension_to_language() -> Dict[str, str]:
-        """Get mapping of file extensions to language types"""
-        return {
-            # Python
-            '.py': 'python', '.pyx': 'python', '.pyd': 'python', '.pyi': 'python',
-            '.ipynb': 'jupyter',  # Special handling for Jupyter notebooks
-
-            # JavaScript/TypeScript
-            '.js': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript',
-            '.ts': 'typescript', '.tsx': 'typescript', '.jsx': 'javascript',
-
-            # Web
-            '.html': 'html', '.htm': 'html', '.xhtml': 'html',
-            '.css': 'css', '.scss': 'scss', '.sass': 'scss', '.less': 'less',
-            '.svg': 'svg', '.xml': 'xml',
-
-            # JVM languages
-            '.java': 'java', '.kt': 'kotlin', '.kts': 'kotlin',
-            '.scala': 'scala', '.sc': 'scala',
-            '.groovy': 'java', '.clj': 'clojure', '.cljs': 'clojure',
-
-            # C-family
-            '.c': 'c', '.h': 'c',
-            '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
-            '.hpp': 'cpp', '.hxx': 'cpp', '.hh': 'cpp',
-            '.cs': 'c#',
-
-            # Other programming languages
-            '.rb': 'ruby', '.erb': 'ruby',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.php': 'php', '.phtml': 'php',
-            '.swift': 'swift',
-            '.m': 'objc', '.mm': 'objc',  # Objective-C
-            '.lua': 'lua',
-            '.hs': 'haskell', '.lhs': 'haskell',
-            '.pl': 'perl', '.pm': 'perl',
-            '.jl': 'julia',
-            '.r': 'r', '.rmd': 'r',
-            '.dart': 'dart',
-
-            # Shell and scripting
-            '.sh': 'shell', '.bash': 'bash', '.zsh': 'zsh', '.fish': 'fish',
-            '.ps1': 'powershell', '.psm1': 'powershell', '.psd1': 'powershell',
-
-            # Configuration and data
-            '.json': 'json', '.yaml': 'yaml', '.yml': 'yaml',
-            '.toml': 'toml', '.ini': 'text',
-            '.sql': 'sql',
-
-            # Documentation
-            '.md': 'markdown', '.markdown': 'markdown',
-            '.tex': 'latex', '.ltx': 'latex', '.latex': 'latex',
-            '.txt': 'text',
-        }
+        # Compiled whole-buffer scanners, one per language
+        self.scanners = {language: LocScanner(patterns) for language, patterns in self.language_patterns.items()}
+        self._plain_scanner = LocScanner({'line_comment': None, 'block_start': None, 'block_end': None})
+        # Notebook code cells are read without building the outputs
+        self.notebook_scanner = NotebookScanner()
+        # The same scanners over raw bytes, for memory-mapped ASCII files
+        self.byte_scanners = {language: LocScanner(patterns, binary=True)
+                              for language, patterns in self.language_patterns.items()}
+        self._plain_byte_scanner = LocScanner({'line_comment': None, 'block_start': None, 'block_end': None},
+                                              binary=True)
 
     @staticmethod
     def _get_language_patterns() -> Dict[str, Dict[str, str]]:
@@ -314,7 +421,7 @@ class CodeAnalyzer:
             'text': {'line_comment': None, 'block_start': None, 'block_end': None},
         }
 
-    def get_language_from_file(self, file_path: str) -> str:
+    def get_language_from_file(self, file_path: Union[str, PathInfo]) -> str:
         """
         Determine the language type based on file extension.
         
@@ -324,10 +431,9 @@ class CodeAnalyzer:
         Returns:
             The language identifier or 'text' if unknown
         """
-        ext = Path(file_path).suffix.lower()
-        return self.extension_to_language.get(ext, 'text')
+        return language_engine.resolve(file_path).comment_style
 
-    def count_lines_of_code(self, content: str, file_path: str) -> int:
+    def count_lines_of_code(self, content: str, file_path: Union[str, PathInfo]) -> int:
         """
         Count lines of code, excluding empty lines and comments.
         
@@ -342,29 +448,151 @@ class CodeAnalyzer:
         if not content:
             return 0
 
-        # Handle binary files
-        if is_binary_file(file_path):
-            return 0
-
-        # Skip meta files, .gitkeep files and other excluded files
-        filename = Path(file_path).name.lower()
-        if filename == '.gitkeep' or filename == '.gitignore' or filename.endswith('.meta'):
+        info = as_path_info(file_path)
+        language = self._get_counted_language(info, content)
+        if language is None:
             return 0
 
-        # Get language type from file extension
-        language = self.get_language_from_file(file_path)
-
         # Special handling for Jupyter notebooks
         if language.lower() == 'jupyter':
-            return self._count_jupyter_notebook_loc(content, file_path)
+            return self._count_jupyter_notebook_loc(content, info.path)
 
         # Regular file handling
         return self._count_standard_file_loc(content, language)
 
+    def count_lines_of_code_stream(self, chunks: Iterable[bytes], file_path: Union[str, PathInfo]) -> int:
+        """
+        Count lines of code from UTF-8 byte chunks, such as an HTTP stream or a tar member.
+
+        The chunks are decoded incrementally and counted a run of whole lines at
+        a time, carrying the block comment state across chunk boundaries, so
+        memory stays at one chunk plus the longest line. The count equals
+        ``count_lines_of_code`` on the whole decoded content.
+
+        Args:
+            chunks: File content as an iterable of byte strings
+            file_path: Path to the file (for language detection)
+
+        Returns:
+            Number of non-blank, non-comment lines of code
+        """
+        chunks = iter(chunks)
+        head = None
+        if language_engine.resolve(file_path).needs_content:
+            head, chunks = self._peek_head(chunks)
+
+        language = self._get_counted_language(file_path, head)
+        if language is None:
+            return 0
+
+        # Notebooks are scanned from their whole text (the notebook scanner isn't incremental)
+        if language.lower() == 'jupyter':
+            return self.count_lines_of_code(b''.join(chunks).decode('utf-8', errors='ignore'), file_path)
+
+        scanner = self.scanners.get(language, self._plain_scanner)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        loc = 0
+        in_block = False
+        pending = ''
+
+        for chunk in chunks:
+            text = pending + decoder.decode(chunk)
+            line_end = text.rfind('\n')
+            if line_end == -1:
+                pending = text
+                continue
+
+            piece_loc, in_block = scanner.scan(text[:line_end + 1], in_block)
+            loc += piece_loc
+            pending = text[line_end + 1:]
+
+        return loc + scanner.scan(pending + decoder.decode(b'', final=True), in_block)[0]
+
+    def count_lines_of_code_buffer(self, buffer, file_path: Union[str, PathInfo]) -> Optional[int]:
+        """
+        Count lines of code directly on a bytes-like buffer such as an ``mmap``.
+
+        ASCII content is counted on the raw bytes without decoding; anything
+        else is decoded a chunk at a time. The count equals
+        ``count_lines_of_code`` on the decoded content.
+
+        Args:
+            buffer: File content supporting ``find`` and slicing (``bytes`` or ``mmap``)
+            file_path: Path to the file (for language detection)
+
+        Returns:
+            Number of non-blank, non-comment lines of code, or None when a NUL
+            byte near the start shows the content is binary
+        """
+        language = self._get_counted_language(file_path, buffer)
+        if language is None:
+            return 0
+
+        # Git's heuristic: text files have no NUL byte in their first 8000 bytes
+        if buffer.find(b'\0', 0, ContentFilter.PROBE_SIZE) != -1:
+            return None
+
+        # Bytes-level whitespace rules only agree with str ones on ASCII without separator characters
+        if language.lower() == 'jupyter' or _NON_ASCII_BYTE.search(buffer):
+            chunks = (buffer[pos:pos + BUFFER_CHUNK_SIZE] for pos in range(0, len(buffer), BUFFER_CHUNK_SIZE))
+            return self.count_lines_of_code_stream(chunks, file_path)
+
+        return self.byte_scanners.get(language, self._plain_byte_scanner).count(buffer)
+
+    @staticmethod
+    def _peek_head(chunks: Iterator[bytes]) -> Tuple[bytes, Iterator[bytes]]:
+        """The first bytes of a stream, enough to sniff its language, and the whole stream again"""
+        head, size = [], 0
+        for chunk in chunks:
+            head.append(chunk)
+            size += len(chunk)
+            if size >= LanguageEngine.SNIFF_SIZE:
+                break
+
+        data = b''.join(head)
+        return data, itertools.chain([data], chunks)
+
+    def _get_counted_language(self, file_path: Union[str, PathInfo], head=None) -> Optional[str]:
+        """
+        Language whose rules count a file, or None for binary, meta and other excluded files.
+
+        ``head`` is the start of the content (str, bytes or a buffer), used
+        when the path alone can't tell the language.
+        """
+        info = as_path_info(file_path)
+
+        # Handle binary files
+        if is_binary_file(info):
+            return None
+
+        # Skip meta files, .gitkeep files and other excluded files
+        filename = info.lower_name
+        if filename == '.gitkeep' or filename == '.gitignore' or filename.endswith('.meta'):
+            return None
+
+        # Get language type from file extension, name or content
+        return language_engine.detect(info, head).comment_style
+
     def _count_standard_file_loc(self, content: str, language: str) -> int:
         """
         Count lines of code in a standard text-based file.
 
+        Args:
+            content: File content as string
+            language: The programming language identifier
+
+        Returns:
+            Number of non-blank, non-comment lines
+        """
+        return self.scanners.get(language, self._plain_scanner).count(content)
+
+    def _count_standard_file_loc_by_lines(self, content: str, language: str) -> int:
+        """
+        Count lines of code one line at a time.
+
+        This is the reference implementation of the counting rules; the
+        compiled scanners used by ``_count_standard_file_loc`` must agree with it.
+
         Args:
             content: File content as string
             language: The programming language identifier
@@ -526,11 +754,32 @@ class CodeAnalyzer:
     def _count_jupyter_notebook_loc(self, content: str, file_path: str) -> int:
         """
         Count lines of code in a Jupyter notebook.
-        
+
+        Well-formed notebooks are walked by the notebook scanner, which never
+        builds cell outputs; anything else is parsed with ``json.loads``.
+
         Args:
             content: File content as string (should be JSON)
             file_path: Path to the notebook file
-            
+
+        Returns:
+            Number of actual executable lines of code
+        """
+        actual_loc = self.notebook_scanner.count(content)
+        if actual_loc is not None:
+            return actual_loc
+        return self._count_jupyter_notebook_loc_parsed(content, file_path)
+
+    def _count_jupyter_notebook_loc_parsed(self, content: str, file_path: str) -> int:
+        """
+        Count lines of code in a Jupyter notebook parsed whole with ``json.loads``.
+
+        This is the reference implementation the notebook scanner must agree with.
+
+        Args:
+            content: File content as string (should be JSON)
+            file_path: Path to the notebook file
+
         Returns:
             Number of actual executable lines of code
         """
@@ -550,18 +799,8 @@ class CodeAnalyzer:
                 if cell_type != 'code':
                     continue
 
-                # The 'source' can be a list of strings or a single string
-                if isinstance(source, str):
-                    lines = source.splitlines()
-                else:
-                    # Flatten and remove trailing newlines
-                    lines = [line.rstrip('\n') for line in source]
-
                 # Count non-blank, non-comment lines
-                for line in lines:
-                    stripped_line = line.strip()
-                    if stripped_line and not stripped_line.startswith('#'):
-                        actual_loc += 1
+                actual_loc += count_notebook_source(source)
 
             return actual_loc
 
@@ -578,7 +817,7 @@ class CodeAnalyzer:
 code_analyzer = CodeAnalyzer()
 
 
-def count_lines_of_code(content: str, file_path: str) -> int:
+def count_lines_of_code(content: str, file_path: Union[str, PathInfo]) -> int:
     """
     Count non-blank lines of code in a file.
     
@@ -592,7 +831,21 @@ def count_lines_of_code(content: str, file_path: str) -> int:
     return code_analyzer.count_lines_of_code(content, file_path)
 
 
-def is_config_file(file_path: str) -> bool:
+def count_lines_of_code_stream(chunks: Iterable[bytes], file_path: Union[str, PathInfo]) -> int:
+    """
+    Count non-blank lines of code in a file read as byte chunks.
+
+    Args:
+        chunks: File content as an iterable of byte strings
+        file_path: Path to the file (for language detection)
+
+    Returns:
+        Number of non-blank lines of code
+    """
+    return code_analyzer.count_lines_of_code_stream(chunks, file_path)
+
+
+def is_config_file(file_path: Union[str, PathInfo]) -> bool:
     """
     Check if a file is likely a configuration file based on its name or extension.
     
@@ -602,24 +855,48 @@ def is_config_file(file_path: str) -> bool:
     Returns:
         True if file is likely a config file, False otherwise
     """
-    filename = Path(file_path).name.lower()
+    info = as_path_info(file_path)
+    filename = info.lower_name
 
     # First check against the CONFIG_FILES set
     if filename in CONFIG_FILES:
         return True
 
     # Then check if it's in the special filenames dictionary and is a config file
-    base_filename = Path(file_path).name
+    base_filename = info.name
     if base_filename in SPECIAL_FILENAMES:
         # Check if the file type indicates it's a configuration file
         file_type = SPECIAL_FILENAMES[base_filename]
-        if any(config_type in file_type for config_type in
-               ['JSON', 'YAML', 'TOML', 'INI', 'XML', 'Config']):
+        if any(config_type in file_type for config_type in CONFIG_FILE_TYPES):
             return True
 
     return False
 
 
+def analyze_file_batch(batch: List[Tuple[str, Optional[bytes]]]) -> List[Tuple[str, Optional[int], int]]:
+    """
+    Count and classify a batch of files; runs in LocProcessPool worker processes.
+
+    Args:
+        batch: (path, content) pairs; content is None for files whose LOC isn't counted
+
+    Returns:
+        (language, loc, flags) per file, with loc None when it wasn't counted
+    """
+    results = []
+    for file_path, content in batch:
+        loc = None
+        if content is not None:
+            try:
+                loc = count_lines_of_code(content.decode('utf-8', errors='ignore'), file_path)
+            except Exception as e:
+                logger.debug(f"Could not count {file_path}: {e}")
+        results.append((GithubAnalyzer.get_file_language(file_path, content), loc))
+
+    flags = path_classifier.classify_many([file_path for file_path, _ in batch])
+    return [(language, loc, file_flags) for (language, loc), file_flags in zip(results, flags)]
+
+
 class SingleRepoAnalyzer:
     """Class responsible for analyzing a single GitHub repository"""
 
@@ -628,19 +905,30 @@ class SingleRepoAnalyzer:
         self.github_analyzer = github_analyzer
         self.github = github_analyzer.github
         self.config = github_analyzer.config
+        self.failed = False
 
-    def analyze(self, repo: Repository) -> RepoStats:
-        """Analyze a single repository and return detailed statistics"""
+    def analyze(self, repo: Repository, file_stats: Optional[Dict[str, Any]] = None) -> RepoStats:
+        """
+        Analyze a single repository and return detailed statistics.
+
+        Args:
+            repo: Repository to analyze
+            file_stats: Precomputed file analysis results; analyzed here when omitted
+        """
         logger.info(f"Analyzing repository: {repo.name}")
 
         try:
             # Get file analysis
-            file_stats = self.github_analyzer.analyze_repository_files(repo)
+            if file_stats is None:
+                file_stats = self.github_analyzer.analyze_repository_files(repo)
+
+            # Counts batched over GraphQL, when available
+            metadata = self.github_analyzer.get_repo_metadata(repo)
 
             # Build analysis components
-            activity_data = self._analyze_repository_activity(repo)
-            community_data = self._analyze_community_metrics(repo)
-            language_data = self._analyze_languages(repo, file_stats)
+            activity_data = self._analyze_repository_activity(repo, metadata)
+            community_data = self._analyze_community_metrics(repo, metadata)
+            language_data = self._analyze_languages(repo, file_stats, metadata)
 
             # Create repository statistics object
             repo_stats = self._build_repo_stats(repo, file_stats, activity_data, community_data, language_data)
@@ -650,12 +938,18 @@ class SingleRepoAnalyzer:
 
             return repo_stats
 
+        except AnalysisPaused:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing repository {repo.name}: {e}")
+            self.failed = True
             return self._create_minimal_repo_stats(repo)
 
-    def _analyze_repository_activity(self, repo: Repository) -> Dict:
+    def _analyze_repository_activity(self, repo: Repository, metadata: Optional[Dict] = None) -> Dict:
         """Analyze repository activity metrics including commits and dates"""
+        if metadata is not None:
+            return self._activity_from_metadata(repo, metadata)
+
         activity_data = {
             'is_active': False,
             'last_commit_date': None,
@@ -677,19 +971,33 @@ class SingleRepoAnalyzer:
 
         return activity_data
 
+    def _activity_from_metadata(self, repo: Repository, metadata: Dict) -> Dict:
+        """Build activity metrics from prefetched GraphQL metadata"""
+        if metadata['last_commit_date'] is None:
+            logger.info(f"Repository {repo.name} has no commits")
+            return self._activity_from_pushed_at(repo)
+
+        return self._build_activity_data(repo, metadata['last_commit_date'],
+                                         metadata['commits_last_month'], metadata['commits_last_year'])
+
     def _process_commit_history(self, repo: Repository, commits: List) -> Dict:
         """Process commit history to extract activity metrics"""
         latest_commit = commits[0]
         last_commit_date = latest_commit.commit.author.date
 
+        # Get recent commit counts
+        commits_last_month, commits_last_year = self._count_recent_commits(repo)
+
+        return self._build_activity_data(repo, last_commit_date, commits_last_month, commits_last_year)
+
+    def _build_activity_data(self, repo: Repository, last_commit_date: datetime,
+                             commits_last_month: int, commits_last_year: int) -> Dict:
+        """Combine the latest commit date and recent commit counts into activity metrics"""
         # Calculate activity status
         inactive_threshold = datetime.now().replace(tzinfo=timezone.utc) - timedelta(
             days=self.config["INACTIVE_THRESHOLD_DAYS"])
         is_active = last_commit_date > inactive_threshold if last_commit_date else False
 
-        # Get recent commit counts
-        commits_last_month, commits_last_year = self._count_recent_commits(repo)
-
         # Calculate commit frequency
         commit_frequency = self._calculate_commit_frequency(repo, commits_last_year)
 
@@ -701,9 +1009,45 @@ class SingleRepoAnalyzer:
             'commit_frequency': commit_frequency
         }
 
+    def _count_recent_commits(self, repo: Repository) -> tuple[int, int]:
+        """
+        Count commits in the last month and year.
+
+        GraphQL history counts are used when batched metadata is available (see
+        ``_activity_from_metadata``); otherwise the commit-activity statistics
+        are tried before falling back to listing a year of commits.
+        """
+        counts = self._count_commits_from_activity_stats(repo)
+        if counts is not None:
+            return counts
+
+        return self._count_commits_by_listing(repo)
+
+    @staticmethod
+    def _count_commits_from_activity_stats(repo: Repository) -> Optional[tuple[int, int]]:
+        """Count recent commits from the weekly commit-activity statistics (one request)"""
+        try:
+            weeks = repo.get_stats_commit_activity()
+        except GithubException as e:
+            logger.debug(f"Could not get commit activity for {repo.name}: {e}")
+            return None
+
+        # GitHub answers 202 with no data while the statistics are still being computed
+        if not weeks:
+            return None
+
+        one_month_ago = datetime.now().replace(tzinfo=timezone.utc) - timedelta(days=30)
+        commits_last_month = 0
+        for week in weeks:
+            week_start = ensure_utc(week.week)
+            commits_last_month += sum(count for offset, count in enumerate(week.days)
+                                      if week_start + timedelta(days=offset) > one_month_ago)
+
+        return commits_last_month, sum(week.total for week in weeks)
+
     @staticmethod
-    def _count_recent_commits(repo: Repository) -> tuple[int, int]:
-        """Count commits in the last month and year"""
+    def _count_commits_by_listing(repo: Repository) -> tuple[int, int]:
+        """Count recent commits by listing every commit of the last year"""
         one_month_ago = datetime.now().replace(tzinfo=timezone.utc) - timedelta(days=30)
         one_year_ago = datetime.now().replace(tzinfo=timezone.utc) - timedelta(days=365)
 
@@ -737,6 +1081,16 @@ class SingleRepoAnalyzer:
 
     def _handle_commit_analysis_error(self, repo: Repository, error: GithubException) -> Dict:
         """Handle errors during commit analysis"""
+        # Handle empty repository specifically
+        if error.status == 409 and "Git Repository is empty" in str(error):
+            logger.info(f"Repository {repo.name} has no commits")
+        else:
+            logger.warning(f"Could not get commit info for {repo.name}: {error}")
+
+        return self._activity_from_pushed_at(repo)
+
+    def _activity_from_pushed_at(self, repo: Repository) -> Dict:
+        """Build activity metrics from the last push when no commit information is available"""
         activity_data = {
             'is_active': False,
             'last_commit_date': None,
@@ -745,14 +1099,7 @@ class SingleRepoAnalyzer:
             'commit_frequency': 0.0
         }
 
-        # Handle empty repository specifically
-        if error.status == 409 and "Git Repository is empty" in str(error):
-            logger.info(f"Repository {repo.name} has no commits")
-            last_commit_date = repo.pushed_at
-        else:
-            logger.warning(f"Could not get commit info for {repo.name}: {error}")
-            last_commit_date = repo.pushed_at
-
+        last_commit_date = repo.pushed_at
         if last_commit_date:
             inactive_threshold = datetime.now().replace(tzinfo=timezone.utc) - timedelta(
                 days=self.config["INACTIVE_THRESHOLD_DAYS"])
@@ -762,12 +1109,15 @@ class SingleRepoAnalyzer:
 
         return activity_data
 
-    def _analyze_community_metrics(self, repo: Repository) -> Dict:
+    def _analyze_community_metrics(self, repo: Repository, metadata: Optional[Dict] = None) -> Dict:
         """Analyze community-related metrics"""
+        # GraphQL has no contributor count, so that one comes from REST unless prefetched elsewhere
+        contributors_count = metadata.get('contributors_count') if metadata else None
         community_data = {
-            'contributors_count': self._get_contributors_count(repo),
-            'open_prs': self._get_open_prs_count(repo),
-            'closed_issues': self._get_closed_issues_count(repo)
+            'contributors_count': (contributors_count if contributors_count is not None
+                                   else self._get_contributors_count(repo)),
+            'open_prs': metadata['open_prs'] if metadata else self._get_open_prs_count(repo),
+            'closed_issues': metadata['closed_issues'] if metadata else self._get_closed_issues_count(repo)
         }
 
         return community_data
@@ -793,17 +1143,17 @@ class SingleRepoAnalyzer:
 
     @staticmethod
     def _get_closed_issues_count(repo: Repository) -> int:
-        """Get the number of closed issues"""
+        """Get the number of closed issues, closed pull requests included"""
         try:
             return repo.get_issues(state='closed').totalCount
         except Exception as e:
             logger.warning(f"Could not get closed issues for {repo.name}: {e}")
             return 0
 
-    def _analyze_languages(self, repo: Repository, file_stats: Dict) -> Dict:
+    def _analyze_languages(self, repo: Repository, file_stats: Dict, metadata: Optional[Dict] = None) -> Dict:
         """Analyze repository languages and calculate test coverage"""
         # Get languages from GitHub API (for reference/debugging)
-        github_languages = self._get_github_languages(repo)
+        github_languages = metadata['languages'] if metadata else self._get_github_languages(repo)
 
         # Use our file analysis languages instead of GitHub API data
         combined_languages = dict(file_stats['languages'])
@@ -899,6 +1249,7 @@ class SingleRepoAnalyzer:
             size_kb=size_kb,
             excluded_file_count=file_stats.get('excluded_file_count', 0),
             project_structure=file_stats.get('project_structure', {}),
+            directory_tree=file_stats.get('directory_tree'),
             is_game_repo=file_stats.get('is_game_repo', False),
             game_engine=file_stats.get('game_engine', 'None'),
             game_confidence=file_stats.get('game_confidence', 0.0)
@@ -1022,11 +1373,34 @@ class SingleRepoAnalyzer:
 class AnalyzerRepoFiles:
     """Class responsible for analyzing files within a single repository"""
 
+    # Files at least this large are counted from a stream instead of being read whole
+    STREAM_THRESHOLD = 1024 * 1024
+    STREAM_CHUNK_SIZE = 256 * 1024
+    # Files processed together on one thread, and between rate limit checks that may pause the analysis
+    SHARD_SIZE = 32
+    # Whether processing stops and saves its progress when the rate limit runs low
+    PAUSES_FOR_RATE_LIMIT = True
+
     def __init__(self, github_analyzer):
         """Initialize with reference to parent GithubAnalyzer"""
         self.github_analyzer = github_analyzer
         self.github = github_analyzer.github
         self.config = github_analyzer.config
+        self.max_loc_file_size = (self.config.get("MAX_LOC_FILE_SIZE_MB", 20) if self.config else 20) * 1024 * 1024
+
+        # Blob listing and per-file LOC kept for the next incremental run
+        self.record_manifest = bool(self.config and self.config.get("INCREMENTAL_ANALYSIS"))
+        self._manifest_entries: Optional[List] = None
+        self._manifest_locs: Dict[str, int] = {}
+        # Languages sniffed from content, so the next run can reuse them with the LOC
+        self._manifest_languages: Dict[str, str] = {}
+
+        # Files queued for the LOC process pool while it's in use
+        self._loc_batch = None
+        # FILE_* flags of the listing, classified together before processing
+        self._path_flags: Dict[str, int] = {}
+        # Per-directory totals of the processed files
+        self._directories = DirectoryAggregator()
 
     def analyze(self, repo: Repository) -> Dict[str, Any]:
         """Analyze files in a repository with improved detection capabilities"""
@@ -1038,12 +1412,21 @@ class AnalyzerRepoFiles:
 
             # Main analysis pipeline
             files_to_process = self._collect_repository_files(repo, stats)
+            self._start_loc_batch(stats)
+            self._classify_files(files_to_process)
             self._process_files(repo, files_to_process, stats)
+            stats['directory_tree'] = self._directories.build()
             self._process_additional_metadata(repo, stats)
             self._finalize_stats(repo, stats)
 
+            if self.record_manifest and self._manifest_entries is not None:
+                stats['manifest'] = {'blob_entries': self._manifest_entries, 'file_locs': self._manifest_locs,
+                                     'file_languages': self._manifest_languages}
+
             return dict(stats)
 
+        except AnalysisPaused:
+            raise
         except (RateLimitExceededException, GithubException, Exception) as e:
             return self._handle_analysis_error(repo, stats, e)
 
@@ -1106,6 +1489,100 @@ class AnalyzerRepoFiles:
 
     def _collect_repository_files(self, repo: Repository, stats: Dict[str, Any]) -> List:
         """Collect all files from repository, handling directories and exclusions"""
+        if self.config.get("USE_GIT_TREES", True):
+            try:
+                return self._collect_from_git_tree(repo, stats)
+            except GithubException as e:
+                if e.status == 409 and "Git Repository is empty" in str(e):
+                    logger.info(f"Repository {repo.name} is empty")
+                    stats['is_empty'] = True
+                    return []
+                logger.warning(f"Git Trees listing failed for {repo.name}, walking contents instead: {e}")
+            except Exception as e:
+                logger.warning(f"Git Trees listing failed for {repo.name}, walking contents instead: {e}")
+
+        return self._collect_from_contents(repo, stats)
+
+    def _collect_from_git_tree(self, repo: Repository, stats: Dict[str, Any]) -> List:
+        """Collect files from a single recursive Git Trees call, filtering the flat list locally"""
+        tree = repo.get_git_tree(repo.default_branch, recursive=True)
+
+        if tree.truncated:
+            logger.info(f"Git tree for {repo.name} is truncated, listing subtrees individually")
+            entries = []
+            self._walk_truncated_tree(repo, tree.sha, "", entries)
+        else:
+            entries = [(element.path, element.type, element.sha, element.size, element.mode) for element in tree.tree]
+
+        return self._filter_tree_entries(repo, entries, stats)
+
+    def _walk_truncated_tree(self, repo: Repository, tree_sha: str, prefix: str, entries: List) -> None:
+        """Page through a truncated tree one level at a time, fetching whole subtrees where possible"""
+        for element in repo.get_git_tree(tree_sha).tree:
+            path = f"{prefix}{element.path}"
+            entries.append((path, element.type, element.sha, element.size, element.mode))
+
+            if element.type != "tree":
+                continue
+
+            # Don't spend requests on directories that would be skipped anyway
+            if self.github_analyzer.is_excluded_path(path):
+                continue
+
+            subtree = repo.get_git_tree(element.sha, recursive=True)
+            if subtree.truncated:
+                self._walk_truncated_tree(repo, element.sha, f"{path}/", entries)
+            else:
+                entries.extend((f"{path}/{sub.path}", sub.type, sub.sha, sub.size, sub.mode) for sub in subtree.tree)
+
+    def _filter_tree_entries(self, repo: Repository, entries: List, stats: Dict[str, Any]) -> List:
+        """Apply directory and file exclusions to a flat tree listing"""
+        files_to_process = []
+        pruned_dirs: Dict[str, bool] = {}
+
+        if self.record_manifest:
+            # Directories are implied by file paths, so only blobs and submodules are kept
+            self._manifest_entries = [entry for entry in entries if entry[1] != "tree"]
+
+        def is_pruned(dir_path: str) -> bool:
+            """Check whether a directory or any of its parents is excluded"""
+            if not dir_path:
+                return False
+            if dir_path not in pruned_dirs:
+                parent = dir_path.rpartition('/')[0]
+                pruned_dirs[dir_path] = is_pruned(parent) or self.github_analyzer.is_excluded_path(dir_path)
+            return pruned_dirs[dir_path]
+
+        for path, entry_type, sha, size, mode in entries:
+            parent = path.rpartition('/')[0]
+
+            if entry_type == "tree":
+                if is_pruned(parent):
+                    continue
+                if is_pruned(path):
+                    stats['skipped_directories'].add(path)
+                    logger.debug(f"Skipping excluded directory: {path}")
+                elif not parent:  # Top-level directory
+                    stats['project_structure'][path] += 1
+                continue
+
+            # Submodules ("commit" entries) have no content to analyze
+            if entry_type != "blob" or is_pruned(parent):
+                continue
+
+            file_content = self._create_file(repo, path, sha, size, mode)
+            if self._should_process_file(file_content, stats):
+                files_to_process.append(file_content)
+
+        return files_to_process
+
+    @staticmethod
+    def _create_file(repo: Repository, path: str, sha: str, size: Optional[int], mode: str):
+        """Create the file entry for a blob in the tree listing"""
+        return TreeFile(repo, path, sha, size)
+
+    def _collect_from_contents(self, repo: Repository, stats: Dict[str, Any]) -> List:
+        """Collect files by walking the repository one directory at a time"""
         try:
             contents = repo.get_contents("")
             files_to_process = []
@@ -1149,24 +1626,31 @@ class AnalyzerRepoFiles:
 
     def _should_process_file(self, file_content, stats: Dict[str, Any]) -> bool:
         """Determine if a file should be processed for analysis"""
+        info = self._get_path_info(file_content)
         if self.github_analyzer.is_excluded_path(file_content.path):
             stats['excluded_file_count'] += 1
             logger.debug(f"Skipping file in excluded path: {file_content.path}")
-            self._track_media_if_applicable(file_content, stats)
+            self._track_media_if_applicable(file_content, info, stats)
             return False
 
-        if is_excluded_file(file_content.path):
+        if is_excluded_file(info):
             stats['excluded_file_count'] += 1
             logger.debug(f"Skipping excluded file: {file_content.path}")
-            self._track_media_if_applicable(file_content, stats)
+            self._track_media_if_applicable(file_content, info, stats)
             return False
 
         return True
 
     @staticmethod
-    def _track_media_if_applicable(file_content, stats: Dict[str, Any]) -> None:
+    def _get_path_info(file_content) -> PathInfo:
+        """Name parts of a file's path, split when the file was listed"""
+        info = getattr(file_content, 'path_info', None)
+        return info if info is not None else PathInfo(file_content.path)
+
+    @staticmethod
+    def _track_media_if_applicable(file_content, info: PathInfo, stats: Dict[str, Any]) -> None:
         """Track media files even if they're excluded from code analysis"""
-        media_type = get_media_type(file_content.path)
+        media_type = get_media_type(file_content.path, info.extension)
         if media_type:
             size_kb = file_content.size // 1024 if file_content.size else 0
             stats['media_metrics'][f'{media_type}_count'] += 1
@@ -1178,27 +1662,199 @@ class AnalyzerRepoFiles:
         """Process all files for analysis"""
         all_file_extensions = set()
 
-        for file_content in tqdm(files_to_process,
-                                 desc=f"Analyzing {repo.name} files",
-                                 leave=False,
-                                 colour='cyan'):
-            try:
-                self._process_single_file(repo, file_content, stats, all_file_extensions)
-            except Exception as e:
-                logger.warning(f"Error processing file {file_content.path}: {e}")
-                continue
+        if self._processes_in_shards(files_to_process):
+            self._process_shards(repo, files_to_process, stats, all_file_extensions)
+        else:
+            for file_content in tqdm(files_to_process,
+                                     desc=f"Analyzing {repo.name} files",
+                                     leave=False,
+                                     colour='cyan'):
+                self._process_file_safely(repo, file_content, stats, all_file_extensions)
+        self._finish_loc_batch()
 
         # Log debugging information
         self._log_file_analysis_debug(repo, stats, all_file_extensions)
 
+    def _file_workers(self) -> int:
+        """Threads fetching and counting the files of one repository"""
+        return self.config.get("FILE_WORKERS", 1) if self.config else 1
+
+    def _processes_in_shards(self, files_to_process: List) -> bool:
+        """Whether the files are worth splitting into shards, processed concurrently and resumable between them"""
+        return self._loc_batch is None and len(files_to_process) > self.SHARD_SIZE
+
+    def _process_shards(self, repo: Repository, files_to_process: List, stats: Dict[str, Any],
+                        all_file_extensions: set) -> None:
+        """
+        Process runs of consecutive files concurrently, each into partial totals of its own.
+
+        Shards go to the scheduler of a parallel run, or else to a pool of
+        FILE_WORKERS threads for this repository, with one shard per thread in
+        flight ahead of the one being merged. Partial totals are merged in
+        file order, so the result is the same as processing the files in turn.
+
+        When the rate limit runs low between shards, the files processed so
+        far and their totals are saved with the checkpoint and AnalysisPaused
+        is raised; the next analysis of the repository continues from there.
+        """
+        processed, done = self._resume_progress(repo, files_to_process, all_file_extensions)
+        remaining_files = [file_content for file_content in files_to_process if file_content.path not in done]
+        shards = [remaining_files[start:start + self.SHARD_SIZE]
+                  for start in range(0, len(remaining_files), self.SHARD_SIZE)]
+
+        with contextlib.ExitStack() as stack:
+            pool = self.github_analyzer.scheduler
+            if pool is None and self._file_workers() > 1:
+                # The analysis thread takes shards too
+                pool = stack.enter_context(RepoScheduler(self._file_workers() - 1))
+            pbar = stack.enter_context(tqdm(total=len(files_to_process), initial=len(done),
+                                            desc=f"Analyzing {repo.name} files", leave=False, colour='cyan'))
+
+            # Shards run on other threads, which have to be served by the token routed to this repository
+            process = functools.partial(self._process_shard, repo, self.github_analyzer.current_token)
+            partials = pool.spread(process, shards) if pool is not None else map(process, shards)
+            for index, (shard_files, shard_stats, shard_extensions) in enumerate(partials):
+                self._merge_shard(shard_files, shard_stats, processed)
+                all_file_extensions.update(shard_extensions)
+                done.update((file_content.path, getattr(file_content, 'sha', None)) for file_content in shards[index])
+                pbar.update(len(shards[index]))
+
+                if index + 1 < len(shards) and self._should_pause():
+                    self._save_progress(repo, processed, done, all_file_extensions)
+                    raise AnalysisPaused(f"Paused {repo.name} after {len(done)} of {len(files_to_process)} files")
+
+        self._merge_stats(stats, processed)
+        self._clear_progress(repo)
+
+    def _should_pause(self) -> bool:
+        """Whether to save this repository's progress and stop for the rate limit"""
+        return (self.PAUSES_FOR_RATE_LIMIT and self.github_analyzer.checkpoint is not None and
+                bool(self.config and self.config.get("ENABLE_CHECKPOINTING")) and
+                self.github_analyzer.rate_limit_low())
+
+    def _resume_progress(self, repo: Repository, files_to_process: List,
+                         all_file_extensions: set) -> Tuple[Dict[str, Any], Dict[str, Optional[str]]]:
+        """
+        Totals and blob SHAs (by path) of the files a paused analysis of this repository already processed.
+
+        Progress is used only while every processed file is still in the listing with the same blob.
+        """
+        checkpoint = self.github_analyzer.checkpoint
+        progress = checkpoint.load_progress(repo.full_name) if checkpoint is not None else None
+        if progress is None:
+            return self._initialize_stats(), {}
+
+        listing = {file_content.path: getattr(file_content, 'sha', None) for file_content in files_to_process}
+        if any(listing.get(path, '') != sha for path, sha in progress['files'].items()):
+            logger.info(f"{repo.name} changed since its analysis was paused, starting over")
+            checkpoint.clear_progress(repo.full_name)
+            return self._initialize_stats(), {}
+
+        processed = self._initialize_stats()
+        for key, value in progress['stats'].items():
+            if isinstance(processed[key], set):
+                value = set(value)
+            elif isinstance(processed[key], defaultdict):
+                value = defaultdict(int, value)
+            processed[key] = value
+        self._directories = DirectoryAggregator.from_record(progress['directories'])
+        self._manifest_locs = dict(progress['manifest_locs'])
+        self._manifest_languages = dict(progress.get('manifest_languages', {}))
+        all_file_extensions.update(progress['extensions'])
+
+        logger.info(f"Resuming {repo.name} after {len(progress['files'])} of {len(files_to_process)} files")
+        return processed, dict(progress['files'])
+
+    def _save_progress(self, repo: Repository, processed: Dict[str, Any], done: Dict[str, Optional[str]],
+                       all_file_extensions: set) -> None:
+        """Save the totals and blob SHAs of the files processed so far"""
+        self.github_analyzer.checkpoint.save_progress(repo.full_name, {
+            'files': done,
+            'stats': {key: sorted(value) if isinstance(value, set) else value for key, value in processed.items()},
+            'directories': self._directories.to_record(),
+            'manifest_locs': self._manifest_locs,
+            'manifest_languages': self._manifest_languages,
+            'extensions': sorted(all_file_extensions)
+        })
+
+    def _clear_progress(self, repo: Repository) -> None:
+        """Forget saved progress once every file of the repository is processed"""
+        checkpoint = self.github_analyzer.checkpoint
+        if checkpoint is not None:
+            checkpoint.clear_progress(repo.full_name)
+
+    def _process_shard(self, repo: Repository, pooled_token,
+                       shard: List) -> Tuple['AnalyzerRepoFiles', Dict[str, Any], set]:
+        """
+        Process a shard of files into partial totals, served by the repository's pooled token (if any).
+
+        Returns:
+            A copy of this analyzer holding the shard's directory and manifest
+            totals, the shard's stats, and the extensions seen
+        """
+        shard_files = copy.copy(self)
+        shard_files._directories = DirectoryAggregator()
+        shard_files._manifest_locs = {}
+        shard_files._manifest_languages = {}
+        shard_stats = self._initialize_stats()
+        shard_extensions = set()
+        with self.github_analyzer.serving_token(pooled_token):
+            for file_content in shard:
+                shard_files._process_file_safely(repo, file_content, shard_stats, shard_extensions)
+        return shard_files, shard_stats, shard_extensions
+
+    def _merge_shard(self, shard_files: 'AnalyzerRepoFiles', shard_stats: Dict[str, Any],
+                     stats: Dict[str, Any]) -> None:
+        """Add the partial totals of the next shard to the repository's"""
+        self._directories.merge(shard_files._directories)
+        self._manifest_locs.update(shard_files._manifest_locs)
+        self._manifest_languages.update(shard_files._manifest_languages)
+        self._merge_stats(stats, shard_stats)
+
+    @classmethod
+    def _merge_stats(cls, stats: Dict[str, Any], shard_stats: Dict[str, Any]) -> None:
+        """Add the stats of later files to stats"""
+        # As when processing in turn, the last README found is the one kept
+        if shard_stats['readme_file'] is not None:
+            stats['readme_file'] = shard_stats['readme_file']
+        if shard_stats['readme_content'] is not None:
+            stats['readme_content'] = shard_stats['readme_content']
+            stats['readme_line_count'] = shard_stats['readme_line_count']
+        cls._merge_totals(stats, {key: value for key, value in shard_stats.items() if not key.startswith('readme_')})
+
+    @classmethod
+    def _merge_totals(cls, totals: Dict[str, Any], partial: Dict[str, Any]) -> None:
+        """Add counts, flags and file lists of partial stats to totals"""
+        for key, value in partial.items():
+            if isinstance(value, bool):
+                totals[key] = totals[key] or value
+            elif isinstance(value, (int, float)):
+                totals[key] += value
+            elif isinstance(value, dict):
+                cls._merge_totals(totals[key], value)
+            elif isinstance(value, list):
+                totals[key].extend(value)
+            elif isinstance(value, set):
+                totals[key].update(value)
+
+    def _process_file_safely(self, repo: Repository, file_content, stats: Dict[str, Any],
+                             all_file_extensions: set) -> None:
+        """Process a single file, logging instead of raising on failure"""
+        try:
+            self._process_single_file(repo, file_content, stats, all_file_extensions)
+        except Exception as e:
+            logger.warning(f"Error processing file {file_content.path}: {e}")
+
     def _process_single_file(self, repo: Repository, file_content, stats: Dict[str, Any],
                              all_file_extensions: set) -> None:
         """Process a single file for all types of analysis"""
         file_path = file_content.path
+        info = self._get_path_info(file_content)
         stats['total_files'] += 1
+        self._directories.add_file(file_path)
 
         # Track file extensions
-        ext = Path(file_path).suffix.lower()
+        ext = info.extension
         if ext:
             all_file_extensions.add(ext)
 
@@ -1207,14 +1863,19 @@ class AnalyzerRepoFiles:
             logger.info(f"Found audio file in DrumVerse: {file_path}")
 
         # Process different aspects of the file
-        self._track_media_file(file_content, stats)
-        self._analyze_file_type_and_purpose(file_content, stats)
-        self._count_lines_of_code(file_content, stats)
+        self._track_media_file(file_content, info, stats)
+        if self._loc_batch is not None:
+            self._queue_for_loc_pool(file_content, info, stats)
+            return
+
+        flags = self._get_path_flags(file_path)
+        self._analyze_file_type_and_purpose(file_content, info, flags, stats)
+        self._count_lines_of_code(file_content, info, flags, stats)
 
     @staticmethod
-    def _track_media_file(file_content, stats: Dict[str, Any]) -> None:
+    def _track_media_file(file_content, info: PathInfo, stats: Dict[str, Any]) -> None:
         """Track media files and their sizes"""
-        media_type = get_media_type(file_content.path)
+        media_type = get_media_type(file_content.path, info.extension)
         if media_type:
             size_kb = file_content.size // 1024 if file_content.size else 0
             stats['media_metrics'][f'{media_type}_count'] += 1
@@ -1222,49 +1883,65 @@ class AnalyzerRepoFiles:
             stats['media_metrics'][f'{media_type}_size_kb'] += size_kb
             logger.debug(f"Detected {media_type} file: {file_content.path} ({size_kb} KB)")
 
-    def _analyze_file_type_and_purpose(self, file_content, stats: Dict[str, Any]) -> None:
+    def _classify_files(self, files_to_process: List) -> None:
+        """Classify the whole listing in one pass (worker processes classify their own batches)"""
+        if self._loc_batch is None:
+            paths = [file_content.path for file_content in files_to_process]
+            self._path_flags = dict(zip(paths, path_classifier.classify_many(paths)))
+
+    def _get_path_flags(self, file_path: str) -> int:
+        """FILE_* flags of a path, from the listing's classification when available"""
+        flags = self._path_flags.get(file_path)
+        return flags if flags is not None else path_classifier.classify(file_path)
+
+    def _analyze_file_type_and_purpose(self, file_content, info: PathInfo, flags: int,
+                                       stats: Dict[str, Any]) -> None:
         """Analyze file type and determine its purpose (docs, tests, CI/CD, etc.)"""
-        file_path = file_content.path
+        if flags & FILE_DOCS and 'readme' in info.lower_path:
+            self._process_readme_file(file_content, stats)
+
+        self._record_file_purpose(file_content.path, flags, stats)
 
+    @staticmethod
+    def _record_file_purpose(file_path: str, flags: int, stats: Dict[str, Any]) -> None:
+        """Record what a file is used for from its classification flags"""
         # Documentation analysis
-        if self._is_documentation_file(file_path):
+        if flags & FILE_DOCS:
             stats['has_docs'] = True
             stats['docs_files'].append(file_path)
 
-            if 'readme' in file_path.lower():
-                self._process_readme_file(file_content, stats)
-
         # Other file type checks
-        if is_test_file(file_path):
+        if flags & FILE_TEST:
             stats['has_tests'] = True
             stats['test_files_count'] += 1
 
-        if is_cicd_file(file_path):
+        if flags & FILE_CICD:
             stats['has_cicd'] = True
             stats['cicd_files'].append(file_path)
 
-        if is_config_file(file_path):
+        if flags & FILE_CONFIG:
             stats['dependency_files'].append(file_path)
 
-        if is_package_file(file_path):
+        if flags & FILE_PACKAGE:
             stats['has_packages'] = True
             stats['package_files'].append(file_path)
 
-        if is_deployment_file(file_path):
+        if flags & FILE_DEPLOYMENT:
             stats['has_deployments'] = True
             stats['deployment_files'].append(file_path)
 
-        if is_release_file(file_path):
+        if flags & FILE_RELEASE:
             stats['has_releases'] = True
             stats['release_files'].append(file_path)
 
     @staticmethod
-    def _is_documentation_file(file_path: str) -> bool:
+    def _is_documentation_file(file_path: Union[str, PathInfo]) -> bool:
         """Check if a file is a documentation file"""
-        return ('readme' in file_path.lower() or
-                file_path.lower().startswith('docs/') or
-                '/docs/' in file_path.lower() or
-                file_path.lower().endswith('.md'))
+        lower_path = as_path_info(file_path).lower_path
+        return ('readme' in lower_path or
+                lower_path.startswith('docs/') or
+                '/docs/' in lower_path or
+                lower_path.endswith('.md'))
 
     @staticmethod
     def _process_readme_file(file_content, stats: Dict[str, Any]) -> None:
@@ -1280,41 +1957,268 @@ class AnalyzerRepoFiles:
         except Exception as e:
             logger.debug(f"Could not decode README {file_content.path}: {e}")
 
-    def _count_lines_of_code(self, file_content, stats: Dict[str, Any]) -> None:
+    def _is_loc_counted(self, file_content, info: PathInfo) -> bool:
+        """Whether a file's lines are counted (not binary, a meta file or larger than MAX_LOC_FILE_SIZE_MB)"""
+        return not (is_binary_file(info) or
+                    info.extension == '.meta' or info.name == '.gitkeep' or
+                    file_content.size >= self.max_loc_file_size)
+
+    def _count_lines_of_code(self, file_content, info: PathInfo, flags: int, stats: Dict[str, Any]) -> None:
         """Count lines of code for non-binary files"""
         file_path = file_content.path
 
         # Handle binary files
-        if is_binary_file(file_path):
-            stats['file_types']['Binary'] += 1
-            self._track_media_file(file_content, stats)  # Track media even if binary
+        if flags & FILE_BINARY:
+            self._record_binary_file(file_content, stats)
             return
 
-        # Determine language and file type
-        language = self.github_analyzer.get_file_language(file_path)
-        self._categorize_file_type(file_path, stats)
+        # Determine file type
+        self._categorize_file_type(info, stats)
 
-        # Skip meta files for LOC counting
-        path_obj = Path(file_path)
-        if path_obj.suffix.lower() == '.meta' or path_obj.name == '.gitkeep':
+        # Skip meta files and oversized files for LOC counting
+        if not self._is_loc_counted(file_content, info):
             return
 
         # Count lines of code
-        if file_content.size < 1024 * 1024:  # Skip files larger than 1MB
-            try:
-                content = file_content.decoded_content.decode('utf-8', errors='ignore')
-                loc = count_lines_of_code(content, file_path)
-                stats['total_loc'] += loc
-                stats['languages'][language] += loc
-            except Exception as e:
-                logger.debug(f"Could not decode {file_path}: {e}")
+        try:
+            counted = self._get_file_loc(file_content, info)
+            if counted is not None:
+                loc, language = counted
+                self._record_loc(file_path, language, loc, stats)
+        except Exception as e:
+            logger.debug(f"Could not decode {file_path}: {e}")
+
+    def _record_binary_file(self, file_content, stats: Dict[str, Any]) -> None:
+        """Count a binary file, which has no lines of code"""
+        stats['file_types']['Binary'] += 1
+        self._track_media_file(file_content, self._get_path_info(file_content), stats)  # Track media even if binary
+
+    def _record_loc(self, file_path: str, language: str, loc: int, stats: Dict[str, Any]) -> None:
+        """Add a file's LOC to the repository totals"""
+        stats['total_loc'] += loc
+        stats['languages'][language] += loc
+        self._directories.add_loc(file_path, language, loc)
+        if self.record_manifest:
+            self._manifest_locs[file_path] = loc
+            if language_engine.resolve(file_path).needs_content:
+                self._manifest_languages[file_path] = language
+
+    def _get_file_language(self, file_content, info: PathInfo, known_language: Optional[str] = None) -> str:
+        """
+        Language of a file as reports show it.
+
+        Files without an extension or a known name are sniffed from the start
+        of their content, read only for files below STREAM_THRESHOLD, unless
+        the blob cache or the previous run (known_language) already did.
+        """
+        match = language_engine.resolve(info)
+        if not match.needs_content:
+            return match.language
+        if known_language is not None:
+            return known_language
+        if file_content.size >= self.STREAM_THRESHOLD:
+            return match.language
+
+        try:
+            return language_engine.detect(info, file_content.decoded_content).language
+        except Exception as e:
+            logger.debug(f"Could not read {file_content.path} to detect its language: {e}")
+            return match.language
+
+    def _get_file_loc(self, file_content, info: PathInfo) -> Optional[Tuple[int, str]]:
+        """
+        Count a file's LOC and tell its language, reusing the blob cache when the same content was counted before.
+
+        Returns None for content that turns out to be binary, generated or vendored.
+        """
+        if self._skips_unread(file_content):
+            return None
+
+        known = self._get_known_loc(file_content)
+        if known is not None:
+            known_loc, known_language = known
+            return known_loc, self._get_file_language(file_content, info, known_language)
+
+        loc = self._count_file(file_content)
+        if loc is None:
+            return None
+        language = self._get_file_language(file_content, info)
+        self._store_loc(file_content, loc, language)
+        return loc, language
+
+    def _count_file(self, file_content) -> Optional[int]:
+        """Read and count a file's LOC (None when its content turns out to be binary)"""
+        # Large files are counted as they stream in, never held whole
+        if file_content.size >= self.STREAM_THRESHOLD:
+            chunks = self._probe_chunks(file_content, self._iter_file_chunks(file_content))
+            return count_lines_of_code_stream(chunks, self._get_path_info(file_content)) if chunks is not None else None
+
+        data = self._read_accepted(file_content)
+        if data is None:
+            return None
+        return count_lines_of_code(data.decode('utf-8', errors='ignore'), self._get_path_info(file_content))
+
+    def _read_accepted(self, file_content) -> Optional[bytes]:
+        """
+        Read a file below STREAM_THRESHOLD whole, unless the content filter rejects it first.
+
+        Blobs are streamed so that only about PROBE_SIZE bytes are downloaded
+        before the filter judges them; the rest follows once they're accepted,
+        on the same request, and is kept for the language sniff.
+        """
+        if self.github_analyzer.content_filter is None:
+            return file_content.decoded_content
+
+        if isinstance(file_content, TreeFile):
+            chunks = file_content.iter_chunks(ContentFilter.PROBE_SIZE, self.github_analyzer.current_session)
+        else:
+            chunks = iter([file_content.decoded_content])
+        chunks = self._probe_chunks(file_content, chunks)
+        if chunks is None:
+            return None
+
+        data = b''.join(chunks)
+        if isinstance(file_content, TreeFile):
+            file_content.preload(data)
+        return data
+
+    def _skips_unread(self, file_content) -> bool:
+        """Whether the content filter rejects a file from the tree listing alone"""
+        content_filter = self.github_analyzer.content_filter
+        return content_filter is not None and content_filter.skip_unread(file_content)
+
+    def _accepts_prefix(self, file_content, prefix: bytes, bytes_read: int) -> bool:
+        """Whether the content filter lets a file be counted, judging the start of its content"""
+        content_filter = self.github_analyzer.content_filter
+        return content_filter is None or content_filter.accept_prefix(file_content, prefix, bytes_read)
+
+    def _probe_chunks(self, file_content, chunks: Iterator[bytes]) -> Optional[Iterator[bytes]]:
+        """
+        Judge a stream by its first chunks before the rest is downloaded.
+
+        Returns the whole stream again, or None after closing it when the
+        file is rejected, so its remaining bytes are never transferred.
+        """
+        if self.github_analyzer.content_filter is None:
+            return chunks
+
+        head, bytes_read = [], 0
+        for chunk in chunks:
+            head.append(chunk)
+            bytes_read += len(chunk)
+            if bytes_read >= ContentFilter.PROBE_SIZE:
+                break
+
+        prefix = b''.join(head)
+        if not self._accepts_prefix(file_content, prefix, bytes_read):
+            if hasattr(chunks, 'close'):
+                chunks.close()
+            return None
+        return itertools.chain([prefix], chunks)
+
+    def _iter_file_chunks(self, file_content) -> Iterator[bytes]:
+        """A file's content in chunks, streamed from its source when it supports it"""
+        if isinstance(file_content, TreeFile):
+            return file_content.iter_chunks(self.STREAM_CHUNK_SIZE, self.github_analyzer.current_session)
+        if isinstance(file_content, LocalRepoFile):
+            return file_content.iter_chunks(self.STREAM_CHUNK_SIZE)
+        return iter([file_content.decoded_content])
+
+    def _get_known_loc(self, file_content) -> Optional[Tuple[int, Optional[str]]]:
+        """
+        LOC known without reading the content: from the previous run or the blob cache.
+
+        Returns:
+            Tuple of (loc, language detected when it was counted, if recorded), or None
+        """
+        known_loc = getattr(file_content, 'known_loc', None)
+        if known_loc is not None:
+            return known_loc, getattr(file_content, 'known_language', None)
+
+        blob_cache = self.github_analyzer.blob_cache
+        blob_sha = getattr(file_content, 'sha', None)
+        if blob_cache is not None and blob_sha:
+            comment_style = code_analyzer.get_language_from_file(self._get_path_info(file_content))
+            cached = blob_cache.get_loc(blob_sha, comment_style)
+            if cached is not None:
+                return cached
+
+        return None
+
+    def _store_loc(self, file_content, loc: int, language: str) -> None:
+        """Remember a counted LOC in the blob cache"""
+        blob_cache = self.github_analyzer.blob_cache
+        blob_sha = getattr(file_content, 'sha', None)
+        if blob_cache is not None and blob_sha:
+            blob_cache.store_loc(blob_sha, code_analyzer.get_language_from_file(self._get_path_info(file_content)),
+                                 loc, language)
+
+    def _start_loc_batch(self, stats: Dict[str, Any]) -> None:
+        """Send this repository's LOC counting to the process pool, if one is configured"""
+        loc_pool = self.github_analyzer.loc_pool
+        if loc_pool is not None:
+            self._loc_batch = loc_pool.batch(
+                lambda item, language, loc, flags: self._apply_pooled_result(item, language, loc, flags, stats))
+
+    def _finish_loc_batch(self) -> None:
+        """Wait for and apply every file still being counted by the process pool"""
+        if self._loc_batch is not None:
+            loc_batch, self._loc_batch = self._loc_batch, None
+            loc_batch.drain()
+
+    def _queue_for_loc_pool(self, file_content, info: PathInfo, stats: Dict[str, Any]) -> None:
+        """Read a file's content here (network or disk) and queue it for counting in a worker process"""
+        file_path = file_content.path
+        if self._is_documentation_file(info) and 'readme' in info.lower_path:
+            self._process_readme_file(file_content, stats)
+
+        # Content is only sent when its LOC isn't already known; large files are streamed here instead
+        known, content = None, None
+        if self._is_loc_counted(file_content, info) and not self._skips_unread(file_content):
+            known = self._get_known_loc(file_content)
+            try:
+                if known is None and file_content.size >= self.STREAM_THRESHOLD:
+                    loc = self._count_file(file_content)
+                    if loc is not None:
+                        known = loc, self._get_file_language(file_content, info)
+                        self._store_loc(file_content, *known)
+                elif known is None:
+                    content = self._read_accepted(file_content)
+            except Exception as e:
+                logger.debug(f"Could not decode {file_path}: {e}")
+
+        self._loc_batch.add((file_content, known), file_path, content)
+
+    def _apply_pooled_result(self, item: Tuple, language: str, loc: Optional[int], flags: int,
+                             stats: Dict[str, Any]) -> None:
+        """Record the classification and LOC a worker process returned for a file"""
+        file_content, known = item
+        file_path = file_content.path
+        try:
+            self._record_file_purpose(file_path, flags, stats)
+
+            if flags & FILE_BINARY:
+                self._record_binary_file(file_content, stats)
+                return
+
+            info = self._get_path_info(file_content)
+            self._categorize_file_type(info, stats)
+            if known is not None:
+                # The worker had no content to sniff an extensionless file's language from
+                known_loc, known_language = known
+                self._record_loc(file_path, self._get_file_language(file_content, info, known_language),
+                                 known_loc, stats)
+            elif loc is not None:
+                self._store_loc(file_content, loc, language)
+                self._record_loc(file_path, language, loc, stats)
+        except Exception as e:
+            logger.warning(f"Error processing file {file_path}: {e}")
 
     @staticmethod
-    def _categorize_file_type(file_path: str, stats: Dict[str, Any]) -> None:
+    def _categorize_file_type(info: PathInfo, stats: Dict[str, Any]) -> None:
         """Categorize file type based on extension or filename"""
-        path_obj = Path(file_path)
-        filename = path_obj.name
-        ext = path_obj.suffix.lower()
+        filename = info.name
+        ext = info.extension
 
         if ext:
             stats['file_types'][ext] += 1
@@ -1331,14 +2235,14 @@ class AnalyzerRepoFiles:
         self._categorize_documentation(stats)
         self._detect_game_repository(stats)
 
-    @staticmethod
-    def _check_github_releases(repo: Repository, stats: Dict[str, Any]) -> None:
+    def _check_github_releases(self, repo: Repository, stats: Dict[str, Any]) -> None:
         """Check for GitHub releases"""
         try:
-            releases = list(repo.get_releases())
-            if releases:
+            metadata = self.github_analyzer.get_repo_metadata(repo)
+            release_count = metadata['release_count'] if metadata else len(list(repo.get_releases()))
+            if release_count:
                 stats['has_releases'] = True
-                stats['release_count'] = len(releases)
+                stats['release_count'] = release_count
         except Exception as e:
             logger.debug(f"Could not get releases for {repo.name}: {e}")
 
@@ -1373,7 +2277,11 @@ class AnalyzerRepoFiles:
     def _detect_game_repository(stats: Dict[str, Any]) -> None:
         """Detect if repository is a game repository"""
         try:
-            game_repo_info = is_game_repo(stats['file_types'], stats['project_structure'])
+            # Directories inside the project root, even when the project is wrapped in a folder
+            directory_tree = stats.get('directory_tree')
+            project_structure = (directory_tree.project_structure() if directory_tree is not None
+                                 else stats['project_structure'])
+            game_repo_info = is_game_repo(stats['file_types'], project_structure)
             stats['is_game_repo'] = game_repo_info['is_game_repo']
             stats['game_engine'] = game_repo_info['engine_type']
             stats['game_confidence'] = game_repo_info['confidence']
@@ -1473,6 +2381,10 @@ class AnalyzerRepoFiles:
         """Handle analysis errors appropriately"""
         if isinstance(error, RateLimitExceededException):
             logger.error(f"GitHub API rate limit exceeded while analyzing repository {repo.name}")
+            budget = self.github_analyzer.rate_budget
+            delay = budget.retry_delay(error.status, error.headers or {})
+            if delay is not None:
+                budget.note_retry_after(delay)
             self.github_analyzer.check_rate_limit()
         elif isinstance(error, GithubException):
             if error.status == 404 and "This repository is empty" in str(error):
@@ -1488,6 +2400,307 @@ class AnalyzerRepoFiles:
         return dict(stats)
 
 
+class AnalyzerCloneFiles(AnalyzerRepoFiles):
+    """Class responsible for analyzing files of a repository from a local clone or mirror"""
+
+    def __init__(self, github_analyzer, cloner: RepoCloner):
+        """Initialize with reference to parent GithubAnalyzer and the cloner managing CLONE_DIR"""
+        super().__init__(github_analyzer)
+        self.cloner = cloner
+        self.local_root: Optional[Path] = None
+        self.reader: Optional[GitObjectReader] = None
+
+    def analyze(self, repo: Repository) -> Dict[str, Any]:
+        """Analyze files from disk, releasing the object reader afterwards"""
+        try:
+            return super().analyze(repo)
+        finally:
+            if self.reader is not None:
+                self.reader.close()
+                self.reader = None
+
+    def _collect_repository_files(self, repo: Repository, stats: Dict[str, Any]) -> List:
+        """Collect files from the local copy, falling back to the API if it can't be prepared"""
+        try:
+            self.local_root, is_mirror = self.cloner.prepare(repo)
+            entries = self.cloner.list_entries(self.local_root, is_mirror)
+        except GitError as e:
+            logger.warning(f"Could not use a local clone of {repo.name}, using the API instead: {e}")
+            return super()._collect_repository_files(repo, stats)
+
+        if is_mirror:
+            self.reader = GitObjectReader(self.local_root)
+
+        return self._filter_tree_entries(repo, entries, stats)
+
+    # Reading files costs no requests, so there's nothing to save by stopping
+    PAUSES_FOR_RATE_LIMIT = False
+
+    def _file_workers(self) -> int:
+        """Files are read from disk, and mirror reads share one git process, so they're processed in turn"""
+        return 1
+
+    def _create_file(self, repo: Repository, path: str, sha: str, size: Optional[int], mode: str):
+        """Create a file entry that reads its content from the local copy"""
+        return LocalRepoFile(self.local_root, path, sha, size, mode, self.reader)
+
+    def _count_file(self, file_content) -> Optional[int]:
+        """Count working tree files on a memory map instead of reading them into Python objects"""
+        if not file_content.is_mappable:
+            return super()._count_file(file_content)
+
+        with file_content.open_buffer() as buffer:
+            if not self._accepts_prefix(file_content, buffer[:ContentFilter.PROBE_SIZE], file_content.size):
+                return None
+            return code_analyzer.count_lines_of_code_buffer(buffer, file_content.path)
+
+
+class AnalyzerArchiveFiles(AnalyzerRepoFiles):
+    """Class responsible for analyzing files of a repository from a single streamed tarball"""
+
+    ARCHIVE_CHUNK_TIMEOUT = 60
+
+    def _process_files(self, repo: Repository, files_to_process: List, stats: Dict[str, Any]) -> None:
+        """Process files as their archive members stream past, fetching any leftovers individually"""
+        pending = {file_content.path: file_content for file_content in files_to_process}
+        all_file_extensions = set()
+
+        with tqdm(total=len(pending), desc=f"Analyzing {repo.name} archive", leave=False, colour='cyan') as pbar:
+            try:
+                for path, content in self._iter_archive_members(repo, pending):
+                    file_content = pending[path]
+                    if not isinstance(content, bytes):
+                        content = ArchiveMemberStream(content, functools.partial(self._iter_blob_chunks,
+                                                                                 file_content))
+                    file_content.preload(content)
+                    # Only a preloaded file is left to this loop; anything else falls back to blob requests
+                    del pending[path]
+                    self._process_file_safely(repo, file_content, stats, all_file_extensions)
+                    file_content.release()
+                    pbar.update(1)
+
+                    if isinstance(content, ArchiveMemberStream) and content.error is not None:
+                        raise content.error
+            except Exception as e:
+                logger.warning(f"Archive download for {repo.name} failed, fetching remaining files: {e}")
+
+            # Files missing from the archive (export-ignore, pushes during the run) use blob requests
+            for file_content in pending.values():
+                self._process_file_safely(repo, file_content, stats, all_file_extensions)
+                pbar.update(1)
+
+        self._finish_loc_batch()
+        self._log_file_analysis_debug(repo, stats, all_file_extensions)
+
+    def _iter_blob_chunks(self, file_content: TreeFile) -> Iterator[bytes]:
+        """Stream a file from the blob API, for a member the archive broke off in"""
+        return file_content.iter_blob_chunks(self.STREAM_CHUNK_SIZE, self.github_analyzer.current_session)
+
+    def _iter_archive_members(self, repo: Repository, wanted: Dict[str, Any]):
+        """
+        Stream the default branch tarball and yield (path, content) for wanted regular files.
+
+        Members are read one at a time from the HTTP stream; nothing is written to disk.
+        Content is bytes, or the unread member file for members of at least
+        STREAM_THRESHOLD bytes, which must be consumed before the next member.
+        """
+        archive_url = repo.get_archive_link("tarball", ref=repo.default_branch)
+        session = self.github_analyzer.session or requests.Session()
+
+        with session.get(archive_url, stream=True, timeout=self.ARCHIVE_CHUNK_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+
+                    # Members are prefixed with "<owner>-<repo>-<sha>/"
+                    path = member.name.partition('/')[2]
+                    if path not in wanted:
+                        continue
+
+                    # Oversized files are never counted, so let the stream skip their bytes
+                    if member.size >= self.max_loc_file_size:
+                        yield path, b""
+                        continue
+
+                    # Large members are handed over unread and counted as they stream past
+                    member_file = archive.extractfile(member)
+                    yield path, member_file if member.size >= self.STREAM_THRESHOLD else member_file.read()
+
+
+class AnalyzerIncrementalFiles(AnalyzerRepoFiles):
+    """Class responsible for re-analyzing a changed repository from its previous manifest and a commit diff"""
+
+    # The compare API lists at most this many changed files
+    MAX_COMPARE_FILES = 300
+
+    def __init__(self, github_analyzer, previous: IncrementalEntry, head_sha: str):
+        """Initialize with the repository's last analyzed state and its current HEAD commit"""
+        super().__init__(github_analyzer)
+        self.previous = previous
+        self.head_sha = head_sha
+        self.record_manifest = True
+        self._previous_blobs = {entry[0]: entry for entry in previous.manifest['blob_entries']}
+        self._fetched: Dict[str, bytes] = {}
+
+    def _collect_repository_files(self, repo: Repository, stats: Dict[str, Any]) -> List:
+        """Rebuild the file listing from the previous manifest, falling back to a full listing"""
+        try:
+            entries = self._apply_diff(repo)
+        except Exception as e:
+            logger.info(f"Incremental diff unavailable for {repo.name}, listing the full tree: {e}")
+            self._fetched.clear()
+            return super()._collect_repository_files(repo, stats)
+
+        return self._filter_tree_entries(repo, entries, stats)
+
+    def _apply_diff(self, repo: Repository) -> List:
+        """Apply the files changed since the previous HEAD to the previous blob listing"""
+        comparison = repo.compare(self.previous.head_sha, self.head_sha)
+        if comparison.status not in ("ahead", "identical"):
+            raise ValueError(f"HEAD has {comparison.status} from the last analyzed commit")
+
+        changed_files = comparison.files
+        if len(changed_files) >= self.MAX_COMPARE_FILES:
+            raise ValueError(f"{len(changed_files)} changed files exceed what the compare API lists")
+
+        blobs = dict(self._previous_blobs)
+        known_sizes = {sha: size for _, _, sha, size, _ in blobs.values()}
+
+        for changed in changed_files:
+            if changed.status == "removed":
+                blobs.pop(changed.filename, None)
+                continue
+            if changed.status == "renamed":
+                blobs.pop(changed.previous_filename, None)
+
+            previous_entry = blobs.get(changed.filename)
+            mode = previous_entry[4] if previous_entry else "100644"
+
+            # Submodule pointers have no blob to fetch
+            if previous_entry and previous_entry[1] == "commit":
+                blobs[changed.filename] = (changed.filename, "commit", changed.sha, None, mode)
+                continue
+
+            # The diff carries no sizes, so new content is fetched once here and handed to the file entry
+            size = known_sizes.get(changed.sha)
+            if size is None:
+                blob = repo.get_git_blob(changed.sha)
+                size = blob.size
+                if size < self.STREAM_THRESHOLD:
+                    self._fetched[changed.filename] = (base64.b64decode(blob.content) if blob.encoding == "base64"
+                                                       else blob.content.encode())
+
+            blobs[changed.filename] = (changed.filename, "blob", changed.sha, size, mode)
+
+        logger.debug(f"Applied {len(changed_files)} changed files to the previous listing of {repo.name}")
+
+        # Directories are implied by the remaining file paths
+        directories = set()
+        for path in blobs:
+            parent = path.rpartition('/')[0]
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = parent.rpartition('/')[0]
+
+        entries = list(blobs.values())
+        entries.extend((directory, "tree", None, None, "040000") for directory in directories)
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def _create_file(self, repo: Repository, path: str, sha: str, size: Optional[int], mode: str):
+        """Create a file entry, carrying over the LOC of blobs unchanged since the previous run"""
+        file_content = TreeFile(repo, path, sha, size)
+
+        previous_entry = self._previous_blobs.get(path)
+        if previous_entry is not None and previous_entry[2] == sha:
+            file_content.known_loc = self.previous.manifest['file_locs'].get(path)
+            file_content.known_language = self.previous.manifest.get('file_languages', {}).get(path)
+
+        if path in self._fetched:
+            file_content.preload(self._fetched.pop(path))
+
+        return file_content
+
+
+class AnalyzerPrefetchedFiles(AnalyzerRepoFiles):
+    """Class responsible for analyzing files from a tree listing and contents fetched ahead of time"""
+
+    def __init__(self, github_analyzer, entries: Optional[List], is_empty: bool = False):
+        """
+        Initialize with a prefetched tree listing.
+
+        Args:
+            github_analyzer: Parent GithubAnalyzer
+            entries: (path, type, sha, size, mode) tree entries, or None to list the tree here
+            is_empty: Whether the listing found the repository empty
+        """
+        super().__init__(github_analyzer)
+        self.entries = entries
+        self.is_empty = is_empty
+        self.contents: Dict[str, bytes] = {}
+
+    def files_needing_content(self, repo: Repository) -> List:
+        """List the files whose content the analysis will read, so it can be fetched beforehand"""
+        if not self.entries:
+            return []
+
+        files = self._filter_tree_entries(repo, self.entries, self._initialize_stats())
+        return [file_content for file_content in files if self._needs_content(file_content)]
+
+    # Contents are fetched by the async engine, which checks the rate limit between repositories
+    PAUSES_FOR_RATE_LIMIT = False
+
+    def _file_workers(self) -> int:
+        """Contents are fetched beforehand, so processing them in turn leaves no requests to overlap"""
+        return 1
+
+    def _needs_content(self, file_content) -> bool:
+        """Mirror the README and LOC checks that decide whether a file's content is read"""
+        file_path = file_content.path
+        info = self._get_path_info(file_content)
+        # Large files are streamed during the analysis instead
+        if file_content.size >= self.STREAM_THRESHOLD:
+            return False
+
+        if self._is_documentation_file(info) and 'readme' in info.lower_path:
+            return True
+
+        if is_binary_file(info) or info.extension == '.meta' or info.name == '.gitkeep':
+            return False
+
+        # Files the content filter rejects from the listing are never fetched
+        content_filter = self.github_analyzer.content_filter
+        if content_filter is not None and content_filter.unread_verdict(file_path, file_content.sha):
+            return False
+
+        blob_cache = self.github_analyzer.blob_cache
+        return blob_cache is None or not blob_cache.contains(file_content.sha,
+                                                             code_analyzer.get_language_from_file(info))
+
+    def _collect_repository_files(self, repo: Repository, stats: Dict[str, Any]) -> List:
+        """Use the prefetched listing, or list the tree here if it couldn't be prefetched"""
+        if self.is_empty:
+            logger.info(f"Repository {repo.name} is empty")
+            stats['is_empty'] = True
+            return []
+
+        if self.entries is None:
+            return super()._collect_repository_files(repo, stats)
+
+        return self._filter_tree_entries(repo, self.entries, stats)
+
+    def _create_file(self, repo: Repository, path: str, sha: str, size: Optional[int], mode: str):
+        """Create a file entry holding its prefetched content, if any"""
+        file_content = TreeFile(repo, path, sha, size)
+        if path in self.contents:
+            file_content.preload(self.contents[path])
+        return file_content
+
+
 class ScoreCalculator:
     """Class responsible for calculating various quality scores for repositories"""
 
@@ -1942,6 +3155,224 @@ class AnomalyDetctor:
                 repo_stats.add_anomaly("Old repository without updates in over a year")
 
 
+class IncrementalAnalyzer:
+    """Class responsible for skipping unchanged repositories and diffing changed ones against their last run"""
+
+    def __init__(self, github_analyzer, store: IncrementalStore):
+        """Initialize with reference to parent GithubAnalyzer and the store of previous results"""
+        self.github_analyzer = github_analyzer
+        self.config = github_analyzer.config
+        self.store = store
+        self.counts = {'reused': 0, 'incremental': 0, 'full': 0}
+        self._lock = threading.Lock()
+
+    def is_unchanged(self, repo: Repository) -> bool:
+        """Check whether nothing was pushed to a repository since its last analysis"""
+        previous = self.store.get(repo.full_name)
+        return previous is not None and previous.pushed_at == ensure_utc(repo.pushed_at)
+
+    def analyze(self, repo: Repository) -> RepoStats:
+        """Reuse, incrementally update, or fully analyze a repository depending on what changed"""
+        previous = self.store.get(repo.full_name)
+        pushed_at = ensure_utc(repo.pushed_at)
+
+        # Nothing was pushed since the last run, so no request is needed at all
+        if previous is not None and previous.pushed_at == pushed_at:
+            return self._reuse(repo, previous)
+
+        head_sha = self.get_head_sha(repo)
+
+        # Pushes to other branches move pushed_at without changing what is analyzed
+        if previous is not None and head_sha is not None and previous.head_sha == head_sha:
+            previous.pushed_at = pushed_at
+            self.store.put(repo.full_name, previous)
+            return self._reuse(repo, previous)
+
+        if previous is not None and previous.head_sha and previous.manifest and head_sha:
+            logger.info(f"Re-analyzing files of {repo.name} changed since {previous.head_sha[:7]}")
+            file_stats = AnalyzerIncrementalFiles(self.github_analyzer, previous, head_sha).analyze(repo)
+            self.count('incremental')
+        else:
+            file_stats = self.github_analyzer.analyze_repository_files(repo)
+            self.count('full')
+
+        single_analyzer = SingleRepoAnalyzer(self.github_analyzer)
+        repo_stats = single_analyzer.analyze(repo, file_stats)
+        self.remember(repo, head_sha, repo_stats, file_stats, single_analyzer.failed)
+
+        return repo_stats
+
+    def remember(self, repo: Repository, head_sha: Optional[str], repo_stats: RepoStats,
+                 file_stats: Dict[str, Any], failed: bool = False) -> None:
+        """Keep a repository's results as the baseline for the next run"""
+        # Only complete results become a baseline
+        if head_sha is not None and not failed and 'manifest' in file_stats:
+            self.store.put(repo.full_name, IncrementalEntry(head_sha, ensure_utc(repo.pushed_at), repo_stats,
+                                                            file_stats['manifest']))
+
+    def get_head_sha(self, repo: Repository) -> Optional[str]:
+        """Get the commit the default branch currently points to"""
+        metadata = self.github_analyzer.get_repo_metadata(repo)
+        if metadata and metadata['head_sha']:
+            return metadata['head_sha']
+
+        try:
+            return repo.get_branch(repo.default_branch).commit.sha
+        except GithubException as e:
+            logger.debug(f"Could not resolve HEAD of {repo.name}: {e}")
+            return None
+
+    def _reuse(self, repo: Repository, previous: IncrementalEntry) -> RepoStats:
+        """Return the previous stats, refreshing fields the repository listing already provides"""
+        repo_stats = previous.repo_stats
+        repo_stats.base_info = SingleRepoAnalyzer._create_base_info(repo)
+
+        community = repo_stats.community
+        community.stars = repo.stargazers_count
+        community.forks = repo.forks_count
+        community.watchers = repo.watchers_count
+        community.open_issues = repo.open_issues_count
+        community.topics = repo.topics
+
+        # Activity is relative to today, so re-derive it from the stored last commit date
+        inactive_threshold = datetime.now().replace(tzinfo=timezone.utc) - timedelta(
+            days=self.config["INACTIVE_THRESHOLD_DAYS"])
+        last_commit_date = repo_stats.activity.last_commit_date
+        repo_stats.activity.is_active = bool(last_commit_date and last_commit_date > inactive_threshold)
+
+        logger.info(f"Repository {repo.name} unchanged since last run, reusing its stats")
+        self.count('reused')
+        return repo_stats
+
+    def count(self, outcome: str) -> None:
+        """Count how a repository was handled"""
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def log_summary(self) -> None:
+        """Log how many repositories were reused, diffed and fully analyzed"""
+        logger.info(f"Incremental analysis: {self.counts['reused']} reused, "
+                    f"{self.counts['incremental']} diffed, {self.counts['full']} fully analyzed")
+
+
+class AsyncReposAnalyzer:
+    """
+    Class responsible for analyzing repositories concurrently on one asyncio event loop.
+
+    Network requests go through a pooled AsyncGithubClient with separate limits
+    for tree listings, blob downloads and metadata. The fetched data is then
+    fed to the same synchronous builders as the threaded path (in worker
+    threads), so the resulting RepoStats are identical.
+    """
+
+    def __init__(self, github_analyzer):
+        """Initialize with reference to parent GithubAnalyzer"""
+        self.github_analyzer = github_analyzer
+        self.config = github_analyzer.config
+
+    def analyze(self, repositories: List[Repository],
+                on_result: Callable[[Repository, RepoStats], None]) -> List[Repository]:
+        """
+        Analyze repositories, reporting each result as soon as it is ready.
+
+        Args:
+            repositories: Repositories to analyze
+            on_result: Called on the calling thread with each repository and its stats
+
+        Returns:
+            Repositories left unanalyzed because the rate limit ran low
+        """
+        return asyncio.run(self._analyze_all(repositories, on_result))
+
+    async def _analyze_all(self, repositories: List[Repository],
+                           on_result: Callable[[Repository, RepoStats], None]) -> List[Repository]:
+        """Run every repository through the pipeline with bounded concurrency"""
+        incremental = self.github_analyzer.incremental
+        pending = []
+        for repo in repositories:
+            # Unchanged repositories are reused without any request
+            if incremental is not None and incremental.is_unchanged(repo):
+                on_result(repo, incremental.analyze(repo))
+            else:
+                pending.append(repo)
+
+        remaining: List[Repository] = []
+        repo_limit = asyncio.Semaphore(max(1, self.config.get("ASYNC_REPO_CONCURRENCY", 16)))
+
+        async with AsyncGithubClient(self.config.get("GITHUB_TOKEN"),
+                                     tree_limit=self.config.get("ASYNC_TREE_CONCURRENCY", 8),
+                                     blob_limit=self.config.get("ASYNC_BLOB_CONCURRENCY", 64),
+                                     metadata_limit=self.config.get("ASYNC_METADATA_CONCURRENCY", 8),
+                                     budget=self.github_analyzer.rate_budget,
+                                     pool=self.github_analyzer.token_pool) as client:
+            await self._prefetch_metadata(client, pending)
+
+            async def run(repo: Repository) -> None:
+                async with repo_limit:
+                    # Stop starting new repositories once the rate limit runs low
+                    if client.rate_limit_low(self.config["CHECKPOINT_THRESHOLD"]):
+                        remaining.append(repo)
+                        return
+                    try:
+                        repo_stats = await self._analyze_repository(client, repo)
+                    except Exception as e:
+                        logger.error(f"Failed to analyze {repo.name}: {e}")
+                        return
+                on_result(repo, repo_stats)
+
+            await asyncio.gather(*(run(repo) for repo in pending))
+            logger.info(f"Async engine made {client.requests_made} requests")
+
+        if remaining:
+            logger.warning(f"Stopping analysis due to approaching API rate limit, {len(remaining)} repositories left")
+        return remaining
+
+    async def _prefetch_metadata(self, client: AsyncGithubClient, repos: List[Repository]) -> None:
+        """Fetch GraphQL metadata in concurrent batches, plus contributor counts, into the metadata cache"""
+        fetcher = self.github_analyzer.metadata_fetcher
+        if fetcher is None or not repos:
+            return
+
+        batches = [repos[start:start + fetcher.batch_size] for start in range(0, len(repos), fetcher.batch_size)]
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for batch_results in await asyncio.gather(*(client.fetch_metadata(batch) for batch in batches)):
+            results.update(batch_results)
+
+        fetched = [repo for repo in repos if results.get(repo.full_name) is not None]
+        counts = await asyncio.gather(*(client.fetch_contributors_count(repo) for repo in fetched))
+        for repo, contributors_count in zip(fetched, counts):
+            results[repo.full_name]['contributors_count'] = contributors_count
+
+        for repo in repos:
+            fetcher.seed(repo.full_name, results.get(repo.full_name))
+
+    async def _analyze_repository(self, client: AsyncGithubClient, repo: Repository) -> RepoStats:
+        """Fetch a repository's tree and needed blobs concurrently, then build its stats in a worker thread"""
+        entries, is_empty = await client.fetch_tree(repo)
+        file_analyzer = AnalyzerPrefetchedFiles(self.github_analyzer, entries, is_empty)
+
+        wanted = await asyncio.to_thread(file_analyzer.files_needing_content, repo)
+        contents = await asyncio.gather(*(client.fetch_blob(repo, file_content.sha) for file_content in wanted))
+        file_analyzer.contents = {file_content.path: content
+                                  for file_content, content in zip(wanted, contents) if content is not None}
+
+        return await asyncio.to_thread(self._build_repo_stats, repo, file_analyzer)
+
+    def _build_repo_stats(self, repo: Repository, file_analyzer: AnalyzerPrefetchedFiles) -> RepoStats:
+        """Run the synchronous builders over the prefetched data"""
+        file_stats = file_analyzer.analyze(repo)
+        single_analyzer = SingleRepoAnalyzer(self.github_analyzer)
+        repo_stats = single_analyzer.analyze(repo, file_stats)
+
+        incremental = self.github_analyzer.incremental
+        if incremental is not None:
+            incremental.count('full')
+            incremental.remember(repo, incremental.get_head_sha(repo), repo_stats, file_stats,
+                                 single_analyzer.failed)
+
+        return repo_stats
+
+
 class ReposAnalyzer:
     """Class responsible for analyzing multiple repositories with checkpointing and rate limiting"""
 
@@ -1952,6 +3383,11 @@ class ReposAnalyzer:
         self.config = github_analyzer.config
         self.rate_display = github_analyzer.rate_display
 
+    def _display_rate_status(self) -> None:
+        """Display the rate limit as last reported by response headers"""
+        self.github_analyzer.update_rate_display()
+        self.rate_display.display_once()
+
     def analyze(self, repositories: List[Repository]) -> List[RepoStats]:
         """
         Analyze a specific list of repositories.
@@ -1978,6 +3414,9 @@ class ReposAnalyzer:
             # Setup and execute analysis
             self._prepare_for_analysis()
             self._execute_analysis(analysis_state)
+            while self._should_resume_after_reset(analysis_state):
+                self._wait_for_reset(analysis_state)
+                self._execute_analysis(analysis_state)
             self._finalize_analysis(analysis_state)
 
             logger.info(f"Successfully analyzed {len(analysis_state.all_stats)} repositories")
@@ -1997,7 +3436,7 @@ class ReposAnalyzer:
 
         if checkpoint_data:
             all_stats = checkpoint_data.get('all_stats', [])
-            analyzed_repo_names = checkpoint_data.get('analyzed_repos', [])
+            analyzed_repo_names = checkpoint_data.get('analyzed_repo_names', [])
             repos_to_analyze = [repo for repo in repositories if repo.name not in analyzed_repo_names]
 
             logger.info(f"Resuming analysis from checkpoint with {len(all_stats)} already analyzed repositories")
@@ -2034,7 +3473,7 @@ class ReposAnalyzer:
 
         # Display initial rate limit usage
         rprint("\n[bold]--- Initial API Rate Status ---[/bold]")
-        self.rate_display.display_once()
+        self._display_rate_status()
         rprint("[bold]-------------------------------[/bold]")
 
     def _execute_analysis(self, state: 'AnalysisState') -> None:
@@ -2044,7 +3483,23 @@ class ReposAnalyzer:
                 len(state.repos_to_analyze) > 1
         )
 
-        if should_use_parallel:
+        if self.config.get("USE_ASYNC_ENGINE", False) and not ASYNC_AVAILABLE:
+            logger.warning("USE_ASYNC_ENGINE is set but aiohttp is not installed, using threads instead")
+        use_async = self.config.get("USE_ASYNC_ENGINE", False) and ASYNC_AVAILABLE
+
+        # Batch per-repository metadata into a few GraphQL queries up front (the async engine does its own)
+        if not use_async:
+            self.github_analyzer.prefetch_metadata(state.repos_to_analyze)
+
+        if use_async:
+            state.all_stats = self._analyze_async(
+                state.repos_to_analyze,
+                state.all_stats,
+                state.analyzed_repo_names,
+                state.newly_analyzed_repos,
+                state.total_repos
+            )
+        elif should_use_parallel:
             state.all_stats = self._analyze_parallel(
                 state.repos_to_analyze,
                 state.all_stats,
@@ -2061,30 +3516,64 @@ class ReposAnalyzer:
                 state.total_repos
             )
 
+    def _should_resume_after_reset(self, state: 'AnalysisState') -> bool:
+        """Whether the analysis stopped for the rate limit and should carry on once it resets"""
+        if not self.config.get("RESUME_AFTER_RESET", False):
+            return False
+        analyzed = set(state.analyzed_repo_names)
+        if all(repo.name in analyzed for repo in state.repos_to_analyze):
+            return False
+        return self.github_analyzer.rate_limit_spent()
+
+    def _wait_for_reset(self, state: 'AnalysisState') -> None:
+        """Sleep until the rate limit resets, leaving only the repositories not analyzed yet"""
+        # Persist what a killed process would otherwise lose while it sleeps
+        if self.github_analyzer.blob_cache is not None:
+            self.github_analyzer.blob_cache.flush()
+
+        analyzed = set(state.analyzed_repo_names)
+        state.repos_to_analyze = [repo for repo in state.repos_to_analyze if repo.name not in analyzed]
+        logger.info(f"{len(state.repos_to_analyze)} repositories left, resuming after the rate limit resets")
+        self.github_analyzer.sleep_until_reset()
+
     def _finalize_analysis(self, state: 'AnalysisState') -> None:
         """Finalize analysis (cleanup, final displays)"""
         # Final rate limit status display
         rprint("\n[bold]--- Final API Rate Status ---[/bold]")
-        self.rate_display.display_once()
+        self._display_rate_status()
         rprint("[bold]----------------------------[/bold]")
 
+        # Persist cached LOC results and report how much content was reused
+        if self.github_analyzer.blob_cache is not None:
+            self.github_analyzer.blob_cache.flush()
+            self.github_analyzer.blob_cache.log_summary()
+
+        # Report the binary, generated and vendored files that weren't downloaded or counted
+        if self.github_analyzer.content_filter is not None:
+            self.github_analyzer.content_filter.log_summary()
+
+        # Persist per-repository state for the next incremental run
+        if self.github_analyzer.incremental is not None:
+            self.github_analyzer.incremental.store.save()
+            self.github_analyzer.incremental.log_summary()
+
         # Clean up checkpoint if all repositories were analyzed
         if self._should_cleanup_checkpoint(state):
             self._cleanup_checkpoint()
 
     def _should_cleanup_checkpoint(self, state: 'AnalysisState') -> bool:
         """Determine if checkpoint should be cleaned up"""
+        analyzed = set(state.analyzed_repo_names)
         return (
                 self.config.get("ENABLE_CHECKPOINTING", False) and
-                not state.repos_to_analyze
+                all(repo.name in analyzed for repo in state.repos_to_analyze)
         )
 
     def _cleanup_checkpoint(self) -> None:
         """Clean up checkpoint file"""
         with contextlib.suppress(Exception):
-            checkpoint_file = self.config.get("CHECKPOINT_FILE")
-            if checkpoint_file:
-                Path(checkpoint_file).unlink(missing_ok=True)
+            if self.github_analyzer.checkpoint is not None:
+                self.github_analyzer.checkpoint.clear()
 
     def _handle_analysis_error(self, error: Exception, state: 'AnalysisState' = None) -> List[RepoStats]:
         """Handle analysis errors with appropriate logging and checkpointing"""
@@ -2103,13 +3592,17 @@ class ReposAnalyzer:
                 state.repos_to_analyze
             )
 
+        if self.github_analyzer.incremental is not None:
+            self.github_analyzer.incremental.store.save()
+
         return state.all_stats if state else []
 
     def _analyze_parallel(self, repos_to_analyze: List[Repository], all_stats: List[RepoStats],
                           analyzed_repo_names: List[str], newly_analyzed_repos: List[Repository],
                           total_repos: int) -> List[RepoStats]:
-        """Analyze repositories using parallel processing"""
+        """Analyze repositories on a long-lived worker pool, largest first, checking the rate limit on a timer"""
         logger.info(f"Using parallel processing with {self.github_analyzer.max_workers} workers")
+        check_interval = self.config.get("CHECKPOINT_INTERVAL", 30)
 
         with tqdm(total=total_repos, initial=len(all_stats),
                   desc="Analyzing repositories", leave=True, colour='green') as pbar:
@@ -2118,51 +3611,136 @@ class ReposAnalyzer:
             if all_stats:
                 pbar.set_description("Analyzing repositories (resumed from checkpoint)")
 
-            # Process repos in smaller batches to allow for checkpointing
-            remaining_repos = repos_to_analyze.copy()
-            batch_size = min(20, len(remaining_repos))  # Process in batches of 20 or fewer
-            repo_counter = 0  # Counter to track repository processing
+            rprint("\n[bold]--- Current API Rate Status ---[/bold]")
+            self._display_rate_status()
+            rprint("[bold]-------------------------------[/bold]")
+            if self.github_analyzer.check_ratelimit_and_checkpoint(all_stats, analyzed_repo_names,
+                                                                   repos_to_analyze):
+                logger.info("Stopping analysis due to approaching API rate limit")
+                return all_stats
+
+            with RepoScheduler(self.github_analyzer.max_workers) as scheduler:
+                # File analyses of big repositories spread their blob fetches over the same workers
+                self.github_analyzer.scheduler = scheduler
+                try:
+                    future_to_repo = {
+                        scheduler.submit(self.github_analyzer.analyze_single_repository, repo,
+                                         priority=getattr(repo, 'size', 0) or 0): repo
+                        for repo in repos_to_analyze
+                    }
+                    remaining_repos = self._run_scheduled(future_to_repo, all_stats, analyzed_repo_names,
+                                                          newly_analyzed_repos, pbar, check_interval)
+                finally:
+                    self.github_analyzer.scheduler = None
+
+            # Final checkpoint once every started repository is done
+            if self.config["ENABLE_CHECKPOINTING"] and newly_analyzed_repos:
+                self.github_analyzer.save_checkpoint(all_stats, analyzed_repo_names, remaining_repos)
 
-            while remaining_repos:
-                repo_counter += 1
-                # Take the next batch
-                batch = remaining_repos[:batch_size]
-                remaining_repos = remaining_repos[batch_size:]
+        return all_stats
 
-                # Periodically show rate limit status
-                if repo_counter % 5 == 0 or repo_counter == 1 or len(batch) == batch_size:
-                    rprint("\n[bold]--- Current API Rate Status ---[/bold]")
-                    self.rate_display.display_once()
-                    rprint("[bold]-------------------------------[/bold]")
+    def _run_scheduled(self, future_to_repo: Dict[concurrent.futures.Future, Repository],
+                       all_stats: List[RepoStats], analyzed_repo_names: List[str],
+                       newly_analyzed_repos: List[Repository], pbar: tqdm, check_interval: float) -> List[Repository]:
+        """
+        Collect scheduled repositories as they finish, checking the rate limit every check_interval seconds.
+
+        Returns:
+            The repositories left unstarted, or paused, because the rate limit ran low
+        """
+        pending = set(future_to_repo)
+        saved_count = len(newly_analyzed_repos)
+        next_check = time.monotonic() + check_interval
+
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=max(0.0, next_check - time.monotonic()),
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            paused = self._collect_scheduled(done, future_to_repo, all_stats, analyzed_repo_names,
+                                             newly_analyzed_repos, pbar)
+            if paused:
+                logger.info("Stopping analysis due to approaching API rate limit")
+                return paused + self._stop_scheduled(pending, future_to_repo, all_stats, analyzed_repo_names,
+                                                     newly_analyzed_repos, pbar)
+
+            if time.monotonic() < next_check or not pending:
+                continue
+            next_check = time.monotonic() + check_interval
 
-                # Check if we need to checkpoint before processing this batch
-                names_new_analyzed_repos = [r.name for r in newly_analyzed_repos]
-                _all_analyzed_repo_names = analyzed_repo_names + names_new_analyzed_repos
-                _remaining_batch_repos = remaining_repos + batch
+            rprint("\n[bold]--- Current API Rate Status ---[/bold]")
+            self._display_rate_status()
+            rprint("[bold]-------------------------------[/bold]")
 
-                if self.github_analyzer.check_ratelimit_and_checkpoint(all_stats, _all_analyzed_repo_names, _remaining_batch_repos):
-                    logger.info("Stopping analysis due to approaching API rate limit")
-                    return all_stats
+            remaining_repos = [future_to_repo[future] for future in pending]
+            if self.github_analyzer.check_ratelimit_and_checkpoint(all_stats, analyzed_repo_names, remaining_repos):
+                logger.info("Stopping analysis due to approaching API rate limit")
+                return self._stop_scheduled(pending, future_to_repo, all_stats, analyzed_repo_names,
+                                            newly_analyzed_repos, pbar)
 
-                with concurrent.futures.ThreadPoolExecutor(max_workers=self.github_analyzer.max_workers) as executor:
-                    # Submit all tasks for this batch
-                    future_to_repo = {executor.submit(self.github_analyzer.analyze_single_repository, repo): repo for
-                                      repo in
-                                      batch}
-
-                    # Process results as they complete
-                    for future in concurrent.futures.as_completed(future_to_repo):
-                        repo = future_to_repo[future]
-                        try:
-                            repo_stats = future.result()
-                            all_stats.append(repo_stats)
-                            newly_analyzed_repos.append(repo)
-                            analyzed_repo_names.append(repo.name)
-                            pbar.update(1)
-                        except Exception as e:
-                            logger.error(f"Failed to analyze {repo.name}: {e}")
-
-            # Final checkpoint after all batches complete
+            # Checkpoint the repositories finished since the last save
+            if self.config["ENABLE_CHECKPOINTING"] and len(newly_analyzed_repos) > saved_count:
+                saved_count = len(newly_analyzed_repos)
+                self.github_analyzer.save_checkpoint(all_stats, analyzed_repo_names, remaining_repos)
+
+        return []
+
+    def _stop_scheduled(self, pending: set, future_to_repo: Dict[concurrent.futures.Future, Repository],
+                        all_stats: List[RepoStats], analyzed_repo_names: List[str],
+                        newly_analyzed_repos: List[Repository], pbar: tqdm) -> List[Repository]:
+        """Cancel repositories not started yet and let the running ones finish or pause"""
+        stopped = [future_to_repo[future] for future in pending if future.cancel()]
+        done, _ = concurrent.futures.wait([future for future in pending if not future.cancelled()])
+        stopped += self._collect_scheduled(done, future_to_repo, all_stats, analyzed_repo_names,
+                                           newly_analyzed_repos, pbar)
+        return stopped
+
+    @staticmethod
+    def _collect_scheduled(done, future_to_repo: Dict[concurrent.futures.Future, Repository],
+                           all_stats: List[RepoStats], analyzed_repo_names: List[str],
+                           newly_analyzed_repos: List[Repository], pbar: tqdm) -> List[Repository]:
+        """
+        Record the results of finished repository tasks.
+
+        Returns:
+            The repositories that paused for the rate limit with their progress saved
+        """
+        paused = []
+        for future in done:
+            repo = future_to_repo[future]
+            try:
+                repo_stats = future.result()
+                all_stats.append(repo_stats)
+                newly_analyzed_repos.append(repo)
+                analyzed_repo_names.append(repo.name)
+                pbar.update(1)
+            except AnalysisPaused as e:
+                logger.info(str(e))
+                paused.append(repo)
+            except Exception as e:
+                logger.error(f"Failed to analyze {repo.name}: {e}")
+        return paused
+
+    def _analyze_async(self, repos_to_analyze: List[Repository], all_stats: List[RepoStats],
+                       analyzed_repo_names: List[str], newly_analyzed_repos: List[Repository],
+                       total_repos: int) -> List[RepoStats]:
+        """Analyze repositories using the asyncio engine"""
+        logger.info("Using the async analysis engine")
+
+        with tqdm(total=total_repos, initial=len(all_stats),
+                  desc="Analyzing repositories", leave=True, colour='green') as pbar:
+
+            # Update progress bar for already analyzed repos from checkpoint
+            if all_stats:
+                pbar.set_description("Analyzing repositories (resumed from checkpoint)")
+
+            def on_result(repo: Repository, repo_stats: RepoStats) -> None:
+                all_stats.append(repo_stats)
+                newly_analyzed_repos.append(repo)
+                analyzed_repo_names.append(repo.name)
+                pbar.update(1)
+
+            remaining_repos = AsyncReposAnalyzer(self.github_analyzer).analyze(repos_to_analyze, on_result)
+
+            # Checkpoint whatever was analyzed, including repositories left for a later run
             if self.config["ENABLE_CHECKPOINTING"] and newly_analyzed_repos:
                 self.github_analyzer.save_checkpoint(all_stats, analyzed_repo_names, remaining_repos)
 
@@ -2183,7 +3761,7 @@ class ReposAnalyzer:
                 # Periodically check and display rate limit status
                 if len(newly_analyzed_repos) % 5 == 0 or len(newly_analyzed_repos) == 0:
                     rprint("\n[bold]--- Current API Rate Status ---[/bold]")
-                    self.rate_display.display_once()
+                    self._display_rate_status()
                     rprint("[bold]-------------------------------[/bold]")
 
                 # Check if we need to checkpoint
@@ -2198,6 +3776,11 @@ class ReposAnalyzer:
                     newly_analyzed_repos.append(repo)
                     analyzed_repo_names.append(repo.name)
                     pbar.update(1)
+                except AnalysisPaused as e:
+                    logger.info(f"Stopping analysis due to approaching API rate limit: {e}")
+                    if self.config["ENABLE_CHECKPOINTING"]:
+                        self.github_analyzer.save_checkpoint(all_stats, analyzed_repo_names, stop_repo)
+                    return all_stats
                 except Exception as e:
                     logger.error(f"Failed to analyze {repo.name}: {e}")
 
@@ -2211,6 +3794,9 @@ class ReposAnalyzer:
 class GithubAnalyzer:
     """Class responsible for analyzing GitHub repositories"""
 
+    # Seconds to wait for a rate limit whose reset time is unknown or already passed
+    RESET_RETRY_WAIT = 60
+
     def __init__(self, github, username: str, config: Optional[Configuration] = None):
         """Initialize the analyzer with GitHub client, username and configuration"""
         self.github = github
@@ -2218,27 +3804,90 @@ class GithubAnalyzer:
         self.config = config
         self.rate_display = rate_display
         self.session = None
+        self.metadata_fetcher = None
+        self.token_pool = None
         self.user = None
         self.checkpoint = None
         self.max_workers = self.config.get("MAX_WORKERS", 1) if self.config else 1
+        self.cloner = (RepoCloner(self.config["CLONE_DIR"], self.config.get("GITHUB_TOKEN"))
+                       if self.config and self.config.get("ANALYZE_CLONES") else None)
+        self.blob_cache = (BlobCache(self.config.get("BLOB_CACHE_FILE") or
+                                     str(Path(self.config.get("CHECKPOINT_DIR", "checkpoints")) / "blob_cache.sqlite"),
+                                     self.config.get("BLOB_CACHE_MAX_ENTRIES", 1_000_000))
+                           if self.config and self.config.get("ENABLE_BLOB_CACHE") else None)
+        self.incremental = (IncrementalAnalyzer(self, IncrementalStore(self.config, username))
+                            if self.config and self.config.get("INCREMENTAL_ANALYSIS") else None)
+        self.content_filter = (ContentFilter(self.blob_cache)
+                               if self.config and self.config.get("DETECT_GENERATED_FILES") else None)
+        self.loc_pool = (LocProcessPool(self.config["LOC_PROCESS_WORKERS"], analyze_file_batch)
+                         if self.config and self.config.get("LOC_PROCESS_WORKERS") else None)
+        # Worker pool of a parallel run, which big repositories spread their blob fetches over
+        self.scheduler: Optional[RepoScheduler] = None
+        self._rate_budget = RateBudget(reserve=self.config.get("CHECKPOINT_THRESHOLD", 0) if self.config else 0,
+                                       pacing=self.config.get("RATE_LIMIT_PACING", True) if self.config else True)
+        # Token serving the repository analyzed on each worker thread when a token pool is used
+        self._local = threading.local()
+
+    @property
+    def current_token(self):
+        """Pooled token serving the current thread, if any"""
+        if self.token_pool is None:
+            return None
+        return getattr(self._local, 'token', None) or self.token_pool.primary
+
+    @contextlib.contextmanager
+    def serving_token(self, pooled) -> Iterator[None]:
+        """Let a pooled token serve the current thread, e.g. a worker taking a shard of another repository"""
+        previous = getattr(self._local, 'token', None)
+        self._local.token = pooled
+        try:
+            yield
+        finally:
+            self._local.token = previous
+
+    @property
+    def rate_budget(self) -> RateBudget:
+        """Rate budget of the token serving the current thread"""
+        pooled = self.current_token
+        return pooled.budget if pooled is not None else self._rate_budget
+
+    @property
+    def current_session(self) -> requests.Session:
+        """requests session authorized as the token serving the current thread, feeding its rate budget"""
+        pooled = self.current_token
+        if pooled is not None:
+            return pooled.session
+        if self.session is None:
+            self.session = create_token_session(self.config.get("GITHUB_TOKEN") if self.config else None,
+                                                self._rate_budget)
+        return self.session
+
+    @property
+    def current_github(self):
+        """PyGithub client of the token serving the current thread"""
+        pooled = self.current_token
+        return pooled.github if pooled is not None else self.github
 
     def check_rate_limit(self) -> None:
-        """Check GitHub API rate limit and wait if necessary"""
+        """Pace requests against the rate budget and wait if necessary"""
         try:
-            # Get rate data from API
-            rate_limit = self.github.get_rate_limit()
-            remaining = rate_limit.core.remaining
-            reset_time = rate_limit.core.reset
-
-            if remaining < 100:  # Low on remaining requests
-                # Check if we need to wait
-                wait_time = (reset_time - datetime.now().replace(tzinfo=timezone.utc)).total_seconds()
-                if wait_time > 0:
-                    logger.warning(
-                        f"GitHub API rate limit low ({remaining} left). Waiting {wait_time:.1f}s until reset.")
-                    self._visualize_wait(wait_time, "Rate limit cooldown")
+            # PyGithub keeps the rate limit headers of its last response, so this costs no request
+            spent = self.rate_budget.update_from_github(self.current_github)
         except Exception as e:
             logger.warning(f"Could not check rate limit: {e}")
+            return
+
+        wait_time = self.rate_budget.pace(spent)
+        if wait_time >= 60 and self.token_pool is not None and \
+                self.token_pool.has_alternative([self.current_token]):
+            # Finish this repository on the reserve; the next one goes to another token
+            return
+        if wait_time >= 60:
+            remaining = self.rate_budget.snapshot()["remaining"]
+            logger.warning(f"GitHub API rate limit low ({remaining} left). Waiting {wait_time:.1f}s.")
+            self._visualize_wait(wait_time, "Rate limit cooldown")
+        elif wait_time > 0:
+            time.sleep(wait_time)
 
     @staticmethod
     def _visualize_wait(wait_time: float, desc: str):
@@ -2256,6 +3905,64 @@ class GithubAnalyzer:
         for _ in tqdm(range(wait_seconds), desc=desc, colour="yellow", leave=True):
             time.sleep(1)
 
+    def rate_limit_spent(self) -> bool:
+        """
+        Whether the run is down to CHECKPOINT_THRESHOLD, on every token of a pool.
+
+        Reads the headers of the latest responses, so it costs no request.
+        """
+        if self.token_pool is not None:
+            self.token_pool.refresh()
+            return not self.token_pool.any_available()
+
+        self.rate_budget.update_from_github(self.github)
+        return self.rate_budget.snapshot()["remaining"] <= self.config["CHECKPOINT_THRESHOLD"]
+
+    def sleep_until_reset(self) -> None:
+        """
+        Sleep until the rate limit resets (the first token to reset, with a pool), then read the new limit.
+
+        One sleep covers the whole wait, instead of a progress bar ticking every second.
+        """
+        if self.token_pool is not None:
+            clients = [(pooled.budget, pooled.github) for pooled in self.token_pool.tokens]
+        else:
+            clients = [(self._rate_budget, self.github)]
+        reset = min(max(budget.retry_until, budget.snapshot()["reset"]) for budget, _ in clients)
+
+        # The reset time has whole seconds; an unknown or passed one is retried after a while
+        wait_time = reset + 1 - time.time()
+        if wait_time <= 0:
+            wait_time = self.RESET_RETRY_WAIT
+        resume_at = datetime.now() + timedelta(seconds=wait_time)
+        logger.info(f"Rate limit spent, sleeping {wait_time:.0f}s until {resume_at:%H:%M:%S}")
+        rprint(f"[yellow]⏳ Rate limit spent, resuming at {resume_at:%H:%M:%S} "
+               f"({wait_time / 60:.1f} minutes)[/yellow]")
+        time.sleep(wait_time)
+
+        # The rate limit endpoint costs nothing and its headers show the new window
+        for budget, github in clients:
+            try:
+                github.get_rate_limit()
+                budget.update_from_github(github)
+            except Exception as e:
+                logger.warning(f"Could not refresh rate limit after reset: {e}")
+
+    def rate_limit_low(self) -> bool:
+        """
+        Whether the token serving this thread is down to CHECKPOINT_THRESHOLD.
+
+        Reads the headers of the latest responses, so it costs no request.
+        """
+        pooled = self.current_token
+        if pooled is not None:
+            pooled.budget.update_from_github(pooled.github)
+            return not pooled.available()
+
+        if self.github.requester.rate_limiting[1] < 0:
+            return False  # Nothing observed yet
+        return self.rate_limit_spent()
+
     def check_ratelimit_and_checkpoint(self, all_stats, analyzed_repo_names, remaining_repos):
         """
         Check if the rate limit is approaching threshold and create a checkpoint if needed.
@@ -2269,13 +3976,13 @@ class GithubAnalyzer:
             Boolean: True if should stop processing, False if can continue
         """
         try:
-            # Update rate data from API
-            self.rate_display.update_from_api(self.github)
+            # Check if below checkpoint threshold (on every token of a pool)
+            rate_limit_low = self.rate_limit_spent()
+            self.update_rate_display()
             remaining = self.rate_display.rate_data["remaining"]
             limit = self.rate_display.rate_data["limit"]
 
-            # Check if below checkpoint threshold
-            if remaining <= self.config["CHECKPOINT_THRESHOLD"]:
+            if rate_limit_low:
                 logger.warning(f"Rate limit low: {remaining} of {limit} remaining")
 
                 # Display rate usage
@@ -2295,6 +4002,15 @@ class GithubAnalyzer:
             logger.error(f"Error checking rate limit: {e}")
             return False
 
+    def update_rate_display(self) -> None:
+        """Refresh the rate display from response headers, per token when a pool is used"""
+        if self.token_pool is not None:
+            self.token_pool.refresh()
+            self.rate_display.update_from_pool(self.token_pool)
+            return
+
+        self.rate_display.update_from_budget(self.rate_budget)
+
     def save_checkpoint(self, all_stats: List[RepoStats], analyzed_repo_names: List[str],
                         remaining_repos: List[Repository]) -> None:
         """Save checkpoint data during analysis"""
@@ -2305,31 +4021,36 @@ class GithubAnalyzer:
         return self.checkpoint.load()
 
     @staticmethod
-    def get_file_language(file_path: str) -> str:
-        """Determine language from file extension or special filename"""
-        path_obj = Path(file_path)
-        ext = path_obj.suffix.lower()
+    def get_file_language(file_path: Union[str, PathInfo], head: Optional[bytes] = None) -> str:
+        """Determine language from file extension or special filename, or the start of the content (head)"""
+        return language_engine.detect(file_path, head).language
 
-        # If file has an extension, check language mappings
-        if ext:
-            return LANGUAGE_EXTENSIONS.get(ext, 'Other')
+    def analyze_repository_files(self, repo: Repository) -> Dict[str, Any]:
+        """Analyze files in a repository with improved detection capabilities"""
+        if self.cloner is not None:
+            file_analyzer = AnalyzerCloneFiles(self, self.cloner)
+        elif self.config and self.config.get("DOWNLOAD_ARCHIVES"):
+            file_analyzer = AnalyzerArchiveFiles(self)
+        else:
+            file_analyzer = AnalyzerRepoFiles(self)
+        return file_analyzer.analyze(repo)
 
-        # No extension, check if it's a known special filename
-        filename = path_obj.name
-        if filename in SPECIAL_FILENAMES:
-            return SPECIAL_FILENAMES[filename]
+    def prefetch_metadata(self, repositories: List[Repository]) -> None:
+        """Fetch batched GraphQL metadata for repositories that are about to be analyzed"""
+        if self.metadata_fetcher is None:
+            return
 
-        # Check if it's a special dot file (like .gitignore)
-        if filename.startswith('.') and filename in SPECIAL_FILENAMES:
-            return SPECIAL_FILENAMES[filename]
+        # Unchanged repositories are reused without looking at their metadata
+        if self.incremental is not None:
+            repositories = [repo for repo in repositories if not self.incremental.is_unchanged(repo)]
 
-        # For truly unknown files
-        return 'Other'
+        self.metadata_fetcher.prefetch(repositories)
 
-    def analyze_repository_files(self, repo: Repository) -> Dict[str, Any]:
-        """Analyze files in a repository with improved detection capabilities"""
-        file_analyzer = AnalyzerRepoFiles(self)
-        return file_analyzer.analyze(repo)
+    def get_repo_metadata(self, repo: Repository) -> Optional[Dict[str, Any]]:
+        """Get batched GraphQL metadata for a repository, or None to use the REST API"""
+        if self.metadata_fetcher is None:
+            return None
+        return self.metadata_fetcher.get(repo)
 
     @staticmethod
     def calculate_scores(repo_stats: Dict[str, Any], repo: Repository) -> Dict[str, float]:
@@ -2339,6 +4060,34 @@ class GithubAnalyzer:
 
     def analyze_single_repository(self, repo: Repository) -> RepoStats:
         """Analyze a single repository and return detailed statistics"""
+        if self.token_pool is None:
+            return self._analyze_with_current_token(repo)
+
+        # Route the repository to the token with the most budget, moving on if GitHub refuses it
+        tried = []
+        while True:
+            pooled = self.token_pool.acquire(exclude=tried)
+            tried.append(pooled)
+            try:
+                with self.serving_token(pooled):
+                    repo_stats = self._analyze_with_current_token(pooled.bind(repo))
+                pooled.budget.update_from_github(pooled.github)
+            except AnalysisPaused:
+                # The progress saved on the spent token carries over to the next one
+                if not self.token_pool.has_alternative(tried):
+                    raise
+                logger.info(f"{pooled.label} ran low while analyzing {repo.name}, continuing with another token")
+                continue
+
+            if not pooled.refused() or not self.token_pool.has_alternative(tried):
+                return repo_stats
+            logger.warning(f"{pooled.label} was rate limited while analyzing {repo.name}, retrying with another token")
+
+    def _analyze_with_current_token(self, repo: Repository) -> RepoStats:
+        """Analyze a repository with the client it is bound to"""
+        if self.incremental is not None:
+            return self.incremental.analyze(repo)
+
         single_analyzer = SingleRepoAnalyzer(self)
         return single_analyzer.analyze(repo)
 
@@ -0,0 +1,192 @@
+"""
+Async GitHub Client for GitHub Repository RunnerAnalyzer
+
+This module provides the network layer of the asyncio analysis engine. One
+pooled aiohttp session serves every repository, and each kind of request
+(tree listings, blob downloads, metadata) has its own concurrency limit, so
+hundreds of requests can be in flight without a thread per request.
+
+aiohttp is an optional dependency; ``ASYNC_AVAILABLE`` tells whether the
+engine can be used.
+
+Key components:
+- AsyncGithubClient: Fetches trees, blobs and metadata with bounded concurrency
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for the async engine
+    aiohttp = None
+
+from console import logger
+from rate_budget import RateBudget
+from repo_metadata import RepoMetadataFetcher
+from token_pool import TokenPool
+
+ASYNC_AVAILABLE = aiohttp is not None
+
+# Attempts per request when GitHub answers with a secondary rate limit
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Matches the page number of the rel="last" link in a paginated response
+LAST_PAGE_PATTERN = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+class AsyncGithubClient:
+    """
+    Pooled async HTTP client for the GitHub REST and GraphQL APIs.
+
+    Endpoints are derived from each repository's API ``url`` so the client
+    works against GitHub Enterprise or a local mock server unchanged. Every
+    request takes a token from the rate budget first, and every response's
+    rate limit headers are fed back into it. With a token pool, each request
+    is sent with the pooled token that has the most budget left.
+    """
+
+    def __init__(self, token: Optional[str], tree_limit: int = 8, blob_limit: int = 64,
+                 metadata_limit: int = 8, timeout: int = 60, budget: Optional[RateBudget] = None,
+                 pool: Optional[TokenPool] = None):
+        """
+        Args:
+            token: GitHub personal access token
+            tree_limit: Maximum concurrent tree listings
+            blob_limit: Maximum concurrent blob downloads
+            metadata_limit: Maximum concurrent metadata requests
+            timeout: Total timeout per request in seconds
+            budget: Shared rate budget; a private unpaced one is used if omitted
+            pool: Token pool; when given, each request uses the token with the most budget
+        """
+        if aiohttp is None:
+            raise RuntimeError("The async analysis engine requires aiohttp (pip install aiohttp)")
+
+        self.token = token
+        self.limits = {'tree': tree_limit, 'blob': blob_limit, 'metadata': metadata_limit}
+        self.timeout = timeout
+        self.requests_made = 0
+        self.budget = budget if budget is not None else RateBudget(pacing=False)
+        self.pool = pool
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> 'AsyncGithubClient':
+        headers = {'Accept': 'application/vnd.github.v3+json'}
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+
+        self._semaphores = {resource: asyncio.Semaphore(max(1, limit)) for resource, limit in self.limits.items()}
+        self._session = aiohttp.ClientSession(
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=sum(self.limits.values())),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+        self._session = None
+
+    async def _request(self, resource: str, method: str, url: str, **kwargs) -> Tuple[int, Any, bytes]:
+        """
+        Send one request under the resource's concurrency limit and return (status, headers, body).
+
+        Rate limited responses are retried after the wait GitHub asks for.
+        """
+        rate_resource = 'graphql' if method == 'POST' else 'core'
+        request_headers = dict(kwargs.pop('headers', {}))
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            budget = self.budget
+            if self.pool is not None:
+                pooled = self.pool.acquire()
+                budget = pooled.budget
+                request_headers['Authorization'] = f'token {pooled.token}'
+
+            await budget.acquire_async(resource=rate_resource)
+            async with self._semaphores[resource]:
+                async with self._session.request(method, url, headers=request_headers, **kwargs) as response:
+                    body = await response.read()
+                    self.requests_made += 1
+                    budget.update_from_headers(response.headers)
+                    status, headers = response.status, response.headers
+
+            delay = budget.retry_delay(status, headers)
+            if delay is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                return status, headers, body
+
+            budget.note_retry_after(delay)
+            if self.pool is not None and self.pool.any_available():
+                # The limited token is skipped by the next acquire, so the retry goes out at once
+                logger.warning(f"Rate limited by GitHub ({status}), retrying with another token")
+            else:
+                logger.warning(f"Rate limited by GitHub ({status}), retrying in {delay:.0f}s")
+
+    def rate_limit_low(self, threshold: int) -> bool:
+        """Whether the core rate limit (of every pooled token) is down to the threshold"""
+        if self.pool is not None:
+            return not self.pool.any_available()
+
+        snapshot = self.budget.snapshot()
+        return bool(snapshot['limit']) and snapshot['remaining'] <= threshold
+
+    async def fetch_tree(self, repo) -> Tuple[Optional[List], bool]:
+        """
+        List the default branch with one recursive Git Trees request.
+
+        Returns:
+            Tuple of ((path, type, sha, size, mode) entries, is_empty). Entries are
+            None when the tree was truncated or the request failed, so the caller
+            can fall back to the synchronous listing.
+        """
+        status, _, body = await self._request('tree', 'GET', f"{repo.url}/git/trees/{repo.default_branch}",
+                                              params={'recursive': '1'})
+        if status == 409:
+            return [], True
+        if status != 200:
+            logger.debug(f"Async tree listing for {repo.name} returned {status}")
+            return None, False
+
+        tree = json.loads(body)
+        if tree.get('truncated'):
+            return None, False
+
+        return [(e['path'], e['type'], e['sha'], e.get('size'), e['mode']) for e in tree['tree']], False
+
+    async def fetch_blob(self, repo, sha: str) -> Optional[bytes]:
+        """Download the raw content of a blob, or None if it couldn't be fetched"""
+        status, _, body = await self._request('blob', 'GET', f"{repo.url}/git/blobs/{sha}",
+                                              headers={'Accept': 'application/vnd.github.raw'})
+        return body if status == 200 else None
+
+    async def fetch_metadata(self, repos: List) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch the GraphQL metadata of a batch of repositories in one aliased query"""
+        base_url = repos[0].url.split('/repos/')[0]
+        graphql_url = f"{base_url[:-3] if base_url.endswith('/v3') else base_url}/graphql"
+        payload = {'query': RepoMetadataFetcher.build_query(repos), 'variables': RepoMetadataFetcher.query_variables()}
+
+        status, _, body = await self._request('metadata', 'POST', graphql_url, json=payload)
+        data = json.loads(body).get('data') if status == 200 else None
+        if data is None:
+            logger.warning(f"Could not fetch metadata for {len(repos)} repositories via GraphQL ({status})")
+            return {repo.full_name: None for repo in repos}
+
+        results = {}
+        for index, repo in enumerate(repos):
+            node = data.get(f"r{index}")
+            results[repo.full_name] = RepoMetadataFetcher.parse_repository(node) if node is not None else None
+        return results
+
+    async def fetch_contributors_count(self, repo) -> Optional[int]:
+        """Count contributors from the last page number of a one-per-page listing"""
+        status, headers, body = await self._request('metadata', 'GET', f"{repo.url}/contributors",
+                                                    params={'per_page': '1'})
+        if status == 204:  # Empty repository
+            return 0
+        if status != 200:
+            return None
+
+        last_page = LAST_PAGE_PATTERN.search(headers.get('Link', ''))
+        return int(last_page.group(1)) if last_page else len(json.loads(body))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the asyncio analysis engine against the ThreadPoolExecutor path.
+
+Both engines analyze the same synthetic repositories served by a local mock
+GitHub server with artificial latency; the script reports wall time, request
+counts and whether the resulting RepoStats match.
+
+Usage:
+    python benchmarks/bench_async_engine.py [--repos 20] [--files 50] [--latency 0.02] [--workers 8]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from github import Github
+
+from analyzer import GithubAnalyzer
+from config import DEFAULT_CONFIG
+from console import RateLimitDisplay
+from repo_metadata import GraphQLTransport, RepoMetadataFetcher
+from utilities import Checkpoint
+from benchmarks.mock_github import MockGithubServer
+
+
+def build_analyzer(server: MockGithubServer, work_dir: str, use_async: bool, workers: int) -> GithubAnalyzer:
+    """Create a GithubAnalyzer wired to the mock server"""
+    config = DEFAULT_CONFIG.copy()
+    config.update({
+        "GITHUB_TOKEN": "mock-token",
+        "USE_ASYNC_ENGINE": use_async,
+        "MAX_WORKERS": workers,
+        "ENABLE_BLOB_CACHE": False,
+        "ENABLE_CHECKPOINTING": False,
+        "CHECKPOINT_DIR": work_dir,
+    })
+
+    github = Github("mock-token", base_url=server.base_url)
+    analyzer = GithubAnalyzer(github, "bench", config)
+    analyzer.rate_display = RateLimitDisplay()
+    analyzer.checkpoint = Checkpoint(config, "bench")
+    analyzer.session = requests.Session()
+    analyzer.metadata_fetcher = RepoMetadataFetcher(GraphQLTransport(analyzer.session,
+                                                                     url=f"{server.base_url}/graphql"))
+    return analyzer
+
+
+def run_engine(server: MockGithubServer, work_dir: str, use_async: bool, workers: int):
+    """Analyze every mock repository and return (seconds, requests, stats by name)"""
+    analyzer = build_analyzer(server, work_dir, use_async, workers)
+    repos = [analyzer.github.get_repo(full_name) for full_name in server.repos]
+
+    requests_before = server.request_count
+    started = time.perf_counter()
+    all_stats = analyzer.analyze_repositories(repos)
+    elapsed = time.perf_counter() - started
+
+    return elapsed, server.request_count - requests_before, {s.base_info.name: s for s in all_stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=20)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds of latency per mock request")
+    parser.add_argument("--workers", type=int, default=8, help="MAX_WORKERS for the threaded engine")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    os.environ.setdefault("TQDM_DISABLE", "1")
+
+    with tempfile.TemporaryDirectory() as work_dir, \
+            MockGithubServer(args.repos, args.files, latency=args.latency) as server:
+        threaded = run_engine(server, work_dir, use_async=False, workers=args.workers)
+        async_ = run_engine(server, work_dir, use_async=True, workers=args.workers)
+
+    identical = threaded[2] == async_[2]
+
+    print(f"{args.repos} repositories x {args.files + 1} files, {args.latency * 1000:.0f} ms latency per request")
+    print(f"{'engine':<22}{'seconds':>10}{'requests':>10}")
+    print(f"{'threads (' + str(args.workers) + ' workers)':<22}{threaded[0]:>10.2f}{threaded[1]:>10}")
+    print(f"{'asyncio':<22}{async_[0]:>10.2f}{async_[1]:>10}")
+    print(f"speedup: {threaded[0] / async_[0]:.1f}x, identical RepoStats: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled LOC scanner against the line-by-line counting rules.
+
+Generates multi-megabyte Python, C and Markdown sources with realistic comment
+density, counts them with both engines and reports lines per second and
+whether the counts match.
+
+Usage:
+    python benchmarks/bench_loc_counter.py [--mb 4] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import CodeAnalyzer
+
+PYTHON_BLOCK = '''
+class Widget{n}:
+    """
+    Widget number {n}.
+
+    Holds a value and renders it.
+    """
+
+    def __init__(self, value):
+        # Store the value
+        self.value = value  # trailing comment
+
+    def render(self):
+        text = """<div>{{}}</div>""".format(self.value)
+        return text
+
+'''
+
+C_BLOCK = '''
+/*
+ * Function {n}
+ * Computes a value.
+ */
+static int compute_{n}(int a, int b) {{
+    // Add the inputs
+    int total = a + b; /* inline */
+    if (total > {n}) {{
+        return total - {n};
+    }}
+
+    return total;
+}}
+'''
+
+MARKDOWN_BLOCK = '''
+## Section {n}
+
+Some prose describing section {n} in a couple of lines.
+More prose follows here.
+
+- item one
+- item two
+
+'''
+
+SOURCES = {'python': PYTHON_BLOCK, 'c': C_BLOCK, 'markdown': MARKDOWN_BLOCK}
+
+
+def build_source(block: str, megabytes: float) -> str:
+    """Repeat a template block until the source reaches the requested size"""
+    rng = random.Random(42)
+    parts, size = [], 0
+    while size < megabytes * 1024 * 1024:
+        part = block.format(n=rng.randint(0, 10 ** 6))
+        parts.append(part)
+        size += len(part)
+    return ''.join(parts)
+
+
+def best_time(function, repeat: int) -> float:
+    """Best wall time of several runs"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4, help="Size of each generated source in megabytes")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = CodeAnalyzer()
+
+    print(f"{'language':<10}{'lines':>10}{'by lines (l/s)':>18}{'scanner (l/s)':>18}{'speedup':>10}  match")
+    for language, block in SOURCES.items():
+        source = build_source(block, args.mb)
+        lines = source.count('\n')
+
+        by_lines = best_time(lambda: analyzer._count_standard_file_loc_by_lines(source, language), args.repeat)
+        scanner = best_time(lambda: analyzer._count_standard_file_loc(source, language), args.repeat)
+        match = (analyzer._count_standard_file_loc_by_lines(source, language) ==
+                 analyzer._count_standard_file_loc(source, language))
+
+        print(f"{language:<10}{lines:>10}{lines / by_lines:>18,.0f}{lines / scanner:>18,.0f}"
+              f"{by_lines / scanner:>9.1f}x  {match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-file path parsing: pathlib versus one shared PathInfo record.
+
+Generates a synthetic tree listing and times, per file:
+- the name parsing the pipeline used to do, one ``pathlib.Path`` per check
+- a single PathInfo, split once
+- the pipeline's per-file helpers given the path string (each splits it again)
+- the same helpers given one shared PathInfo
+
+Usage:
+    python benchmarks/bench_path_info.py [--paths 500000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import AnalyzerRepoFiles, GithubAnalyzer, code_analyzer, is_binary_file, is_excluded_file
+from config import LANGUAGE_EXTENSIONS, SPECIAL_FILENAMES, get_media_type
+from path_classifier import PathInfo
+
+DIRECTORIES = ['src', 'lib', 'app', 'core', 'utils', 'tests', 'docs', 'assets', 'images', 'components',
+               'internal', 'pkg', 'cmd', 'api', 'models', 'views', 'scripts', '.github', 'workflows']
+EXTENSIONS = list(LANGUAGE_EXTENSIONS) + ['.png', '.jpg', '.md', '.json', '.yml', '.txt', '.meta']
+
+
+def build_paths(count: int):
+    """Random repository paths with realistic depth and extensions"""
+    rng = random.Random(42)
+    specials = list(SPECIAL_FILENAMES)
+    paths = []
+    for index in range(count):
+        directories = [rng.choice(DIRECTORIES) for _ in range(rng.randint(0, 6))]
+        name = rng.choice(specials) if rng.random() < 0.05 else f"file_{index}{rng.choice(EXTENSIONS)}"
+        paths.append('/'.join(directories + [name]))
+    return paths
+
+
+def pathlib_parsing(paths) -> None:
+    """The Path constructions the pipeline made per file before PathInfo"""
+    for path in paths:
+        Path(path).name.lower()  # is_excluded_file
+        Path(path).suffix.lower()  # is_binary_file
+        Path(path).suffix.lower()  # extension tracking
+        Path(path).suffix.lower()  # get_media_type
+        path_obj = Path(path)  # get_file_language
+        path_obj.suffix.lower(), path_obj.name
+        path_obj = Path(path)  # _categorize_file_type
+        path_obj.name, path_obj.suffix.lower()
+        path_obj = Path(path)  # _is_loc_counted
+        path_obj.suffix.lower(), path_obj.name
+        Path(path).suffix.lower()  # is_binary_file
+        Path(path).suffix.lower()  # blob cache comment style
+        Path(path).suffix.lower()  # is_binary_file while counting
+        Path(path).name.lower()  # meta and .gitkeep check while counting
+        Path(path).suffix.lower()  # comment style while counting
+
+
+def path_info_parsing(paths) -> None:
+    """One PathInfo per file"""
+    for path in paths:
+        PathInfo(path)
+
+
+def run_helpers(items) -> None:
+    """The per-file name checks of the analysis pipeline, on strings or PathInfo records"""
+    stats = {'file_types': defaultdict(int)}
+    for item in items:
+        path = item.path if isinstance(item, PathInfo) else item
+        is_excluded_file(item)
+        get_media_type(path, item.extension if isinstance(item, PathInfo) else None)
+        GithubAnalyzer.get_file_language(item)
+        AnalyzerRepoFiles._categorize_file_type(item if isinstance(item, PathInfo) else PathInfo(item), stats)
+        is_binary_file(item)
+        code_analyzer.get_language_from_file(item)
+        code_analyzer._get_counted_language(item)
+
+
+def best_time(function, repeat: int) -> float:
+    """Best wall time of several runs"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=500_000, help="Number of paths in the synthetic tree")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = build_paths(args.paths)
+
+    results = [
+        ("pathlib, one Path per check", best_time(lambda: pathlib_parsing(paths), args.repeat)),
+        ("PathInfo, split once", best_time(lambda: path_info_parsing(paths), args.repeat)),
+        ("helpers on path strings", best_time(lambda: run_helpers(paths), args.repeat)),
+        ("helpers on a shared PathInfo", best_time(lambda: run_helpers([PathInfo(path) for path in paths]),
+                                                    args.repeat)),
+    ]
+
+    print(f"{args.paths:,} paths")
+    print(f"{'':<32}{'seconds':>10}{'us/file':>10}")
+    for label, seconds in results:
+        print(f"{label:<32}{seconds:>10.2f}{seconds / args.paths * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Local mock of the GitHub REST and GraphQL endpoints used by the analyzer.
+
+Serves a synthetic set of repositories with a configurable per-request
+latency, so the threaded and async analysis engines can be compared (and
+checked for identical output) without network access or rate limits.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import re
+import tarfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+OWNER = "octo"
+
+CREATED_AT = "2022-01-01T00:00:00Z"
+PUSHED_AT = "2024-06-01T00:00:00Z"
+
+
+def _python_file(index: int, lines: int) -> bytes:
+    body = [f"# module {index}", "import os", ""]
+    body += [f"value_{i} = os.getenv('V{i}', {i})" for i in range(lines)]
+    return ("\n".join(body) + "\n").encode()
+
+
+class MockRepository:
+    """Synthetic repository with a flat tree of Python files and a README"""
+
+    def __init__(self, name: str, file_count: int, lines_per_file: int):
+        self.name = name
+        self.full_name = f"{OWNER}/{name}"
+        self.files = {f"src/module_{i}.py": _python_file(i, lines_per_file) for i in range(file_count)}
+        self.files["README.md"] = f"# {name}\n\nSynthetic repository.\n".encode()
+        self.blobs = {hashlib.sha1(content).hexdigest(): content for content in self.files.values()}
+        self.closed_issues = 0
+        self.closed_pulls = 0
+
+    def add_file(self, path: str, content: bytes) -> None:
+        """Add a file (or replace its content), serving its blob too"""
+        self.files[path] = content
+        self.blobs[hashlib.sha1(content).hexdigest()] = content
+
+    def tree(self, base_url: str) -> dict:
+        entries = [{"path": "src", "mode": "040000", "type": "tree", "sha": "0" * 40}]
+        entries += [{"path": path, "mode": "100644", "type": "blob", "size": len(content),
+                     "sha": hashlib.sha1(content).hexdigest()} for path, content in self.files.items()]
+        return {"sha": "1" * 40, "url": f"{base_url}/repos/{self.full_name}/git/trees/main",
+                "tree": entries, "truncated": False}
+
+    def tarball(self, commit_sha: str, missing=(), truncate_at: Optional[int] = None) -> bytes:
+        """Gzipped tarball of the files, leaving out ``missing`` paths and cut to ``truncate_at`` bytes"""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path, content in self.files.items():
+                if path in missing:
+                    continue
+                member = tarfile.TarInfo(f"{OWNER}-{self.name}-{commit_sha[:7]}/{path}")
+                member.size = len(content)
+                archive.addfile(member, io.BytesIO(content))
+        return buffer.getvalue()[:truncate_at]
+
+    def info(self, base_url: str) -> dict:
+        return {
+            "id": abs(hash(self.name)) % 10 ** 8, "name": self.name, "full_name": self.full_name,
+            "url": f"{base_url}/repos/{self.full_name}", "private": False, "fork": False, "archived": False,
+            "is_template": False, "default_branch": "main", "created_at": CREATED_AT, "pushed_at": PUSHED_AT,
+            "description": "Synthetic repository", "homepage": None, "license": None, "topics": [],
+            "open_issues_count": 0, "stargazers_count": 3, "forks_count": 1, "watchers_count": 3, "size": 64,
+            "owner": {"login": OWNER, "type": "User"},
+            "clone_url": f"https://github.com/{self.full_name}.git"
+        }
+
+
+class MockGithubServer:
+    """
+    Threaded HTTP server implementing the subset of the GitHub API the analyzer uses.
+
+    Use as a context manager; ``base_url`` is the REST root to give PyGithub.
+    """
+
+    COMMIT_SHA = "c" * 40
+
+    def __init__(self, repo_count: int = 10, file_count: int = 20, lines_per_file: int = 40,
+                 latency: float = 0.02, token_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            token_limits: Optional rate limit per token; a token that runs out gets 403 responses
+        """
+        self.latency = latency
+        self.token_limits = dict(token_limits or {})
+        self.token_requests: Dict[str, int] = {}
+        self.reset_time = int(time.time()) + 3600
+        self.commit_date = (datetime.now(timezone.utc) - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.repos = {repo.full_name: repo for repo in
+                      (MockRepository(f"repo{i}", file_count, lines_per_file) for i in range(repo_count))}
+        self.request_count = 0
+        # Path of every request, in order, and the token it was made with
+        self.requested_paths = []
+        self.requested_tokens = []
+        # Paths the tarball leaves out, and the byte it is cut off at (None for the whole archive)
+        self.archive_missing = set()
+        self.archive_truncate_at: Optional[int] = None
+        self._count_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'MockGithubServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+        return Handler
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        token = handler.headers.get("Authorization", "").split(" ")[-1]
+        with self._count_lock:
+            self.request_count += 1
+            used = self.token_requests[token] = self.token_requests.get(token, 0) + 1
+        time.sleep(self.latency)
+
+        url = urlparse(handler.path)
+        with self._count_lock:
+            self.requested_paths.append(url.path)
+            self.requested_tokens.append(token)
+        query = parse_qs(url.query)
+        body = None
+        if method == "POST":
+            body = json.loads(handler.rfile.read(int(handler.headers.get("Content-Length", 0))))
+
+        limit = self.token_limits.get(token, 5000)
+        remaining = limit - used if token in self.token_limits else 4999
+        if remaining < 0:
+            status, payload, headers = 403, {"message": "API rate limit exceeded for user."}, {}
+        else:
+            status, payload, headers = self._route(method, url.path, query, body, handler.headers)
+        raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(raw)))
+        handler.send_header("X-RateLimit-Limit", str(limit))
+        handler.send_header("X-RateLimit-Remaining", str(max(0, remaining)))
+        handler.send_header("X-RateLimit-Reset", str(self.reset_time))
+        handler.send_header("X-RateLimit-Resource", "graphql" if url.path == "/graphql" else "core")
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(raw)
+
+    def _route(self, method, path, query, body, request_headers):
+        if path == "/graphql" and method == "POST":
+            return 200, self._graphql(body), {}
+        if path == "/rate_limit":
+            core = {"limit": 5000, "remaining": 4999, "reset": self.reset_time, "used": 1}
+            return 200, {"resources": {"core": core, "search": core, "graphql": core}, "rate": core}, {}
+
+        archive = re.match(r"^/archives/([^/]+/[^/]+)\.tar\.gz$", path)
+        if archive and archive.group(1) in self.repos:
+            return 200, self.repos[archive.group(1)].tarball(self.COMMIT_SHA, self.archive_missing,
+                                                             self.archive_truncate_at), {}
+
+        match = re.match(r"^/repos/([^/]+/[^/]+)(/.*)?$", path)
+        if not match or match.group(1) not in self.repos:
+            return 404, {"message": "Not Found"}, {}
+
+        repo = self.repos[match.group(1)]
+        rest = match.group(2) or ""
+
+        if rest == "":
+            return 200, repo.info(self.base_url), {}
+        if rest.startswith("/git/trees/"):
+            return 200, repo.tree(self.base_url), {}
+        if rest.startswith("/git/blobs/"):
+            content = repo.blobs[rest.rsplit("/", 1)[1]]
+            if "raw" in request_headers.get("Accept", ""):
+                return 200, content, {}
+            return 200, {"sha": rest.rsplit("/", 1)[1], "size": len(content), "encoding": "base64",
+                         "content": base64.b64encode(content).decode()}, {}
+        if rest == "/contributors":
+            link = f'<{self.base_url}/repos/{repo.full_name}/contributors?per_page=1&page=4>; rel="last"'
+            return 200, [{"login": "dev", "id": 1}], {"Link": link}
+        if rest == "/commits":
+            return 200, [self._commit()], {}
+        if rest == "/stats/commit_activity":
+            return 200, self._commit_activity(), {}
+        if rest == "/languages":
+            return 200, {"Python": sum(len(c) for c in repo.files.values())}, {}
+        if rest == "/issues" and query.get("state") == ["closed"]:
+            # The REST issues endpoint lists pull requests as issues
+            closed = repo.closed_issues + repo.closed_pulls
+            if not closed:
+                return 200, [], {}
+            link = (f'<{self.base_url}/repos/{repo.full_name}/issues?state=closed&per_page=1&page={closed}>; '
+                    'rel="last"')
+            return 200, [{"number": 1, "state": "closed"}], {"Link": link}
+        if rest in ("/releases", "/pulls", "/issues"):
+            return 200, [], {}
+        if rest.startswith("/tarball/"):
+            return 302, {}, {"Location": f"{self.base_url}/archives/{repo.full_name}.tar.gz"}
+        if rest.startswith("/branches/"):
+            return 200, {"name": "main", "commit": {"sha": self.COMMIT_SHA}}, {}
+
+        return 404, {"message": "Not Found"}, {}
+
+    def _commit(self) -> dict:
+        date = self.commit_date
+        return {"sha": self.COMMIT_SHA, "commit": {"author": {"name": "dev", "date": date},
+                                                   "committer": {"name": "dev", "date": date}, "message": "x"}}
+
+    @staticmethod
+    def _commit_activity() -> list:
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return [{"week": int((today - timedelta(days=7 * (51 - i))).timestamp()), "total": 2,
+                 "days": [1, 1, 0, 0, 0, 0, 0]} for i in range(52)]
+
+    def _graphql(self, body: dict) -> dict:
+        data = {}
+        for alias, owner, name in re.findall(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)',
+                                             body["query"]):
+            repo = self.repos.get(f"{owner}/{name}")
+            if repo is None:
+                data[alias] = None
+                continue
+            data[alias] = {
+                "pullRequests": {"totalCount": 0},
+                "issues": {"totalCount": repo.closed_issues},
+                "closedPullRequests": {"totalCount": repo.closed_pulls},
+                "releases": {"totalCount": 0},
+                "languages": {"edges": [{"size": sum(len(c) for c in repo.files.values()),
+                                         "node": {"name": "Python"}}]},
+                "defaultBranchRef": {"target": {
+                    "oid": self.COMMIT_SHA,
+                    "authoredDate": self.commit_date,
+                    "lastMonth": {"totalCount": 10},
+                    "lastYear": {"totalCount": 104}
+                }}
+            }
+        return {"data": data}
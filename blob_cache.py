@@ -0,0 +1,257 @@
+"""
+Content-Addressed Blob Cache for GitHub Repository RunnerAnalyzer
+
+This module provides a persistent cache of per-blob analysis results keyed by
+git blob SHA. Because a blob SHA identifies file content exactly, results can
+be reused across runs and repositories without downloading the file again.
+Blobs left out of LOC counts (binary, generated or vendored content) keep
+their verdict, so they aren't fetched again just to be rejected. The database
+is opened on first use; entries carry the version of the rules that produced
+them, so changing those rules invalidates them.
+
+Key components:
+- BlobCache: SQLite-backed cache with LRU eviction and hit/miss counters
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Optional, Tuple, Dict
+
+from console import logger
+
+
+# Caches still open at interpreter exit; one atexit hook closes them all
+_open_caches: "weakref.WeakSet[BlobCache]" = weakref.WeakSet()
+
+
+def _close_open_caches() -> None:
+    """Flush and close the blob caches that are still open at exit"""
+    for cache in list(_open_caches):
+        cache.close()
+
+
+atexit.register(_close_open_caches)
+
+
+class BlobCache:
+    """
+    Persistent cache mapping ``(blob_sha, language)`` to lines of code, and
+    ``(blob_sha, extension)`` to the verdict of blobs left out of LOC counts.
+
+    Entries carry a last-used timestamp; when a table grows past
+    ``max_entries`` rows its least recently used entries are evicted. The
+    limit counts rows of each table separately, not bytes on disk.
+    """
+
+    # Commit pending writes after this many changes
+    COMMIT_INTERVAL = 500
+    # Layout of the database (PRAGMA user_version); a database of another layout is rebuilt
+    SCHEMA_VERSION = 2
+    # Version of the LOC counting rules; counts made under another version are misses
+    LOC_VERSION = 1
+
+    def __init__(self, cache_file: str, max_entries: int = 1_000_000) -> None:
+        """
+        Set up the cache; the database is opened (or created) on first use.
+
+        Args:
+            cache_file: Path to the SQLite database file
+            max_entries: Maximum number of rows kept in each table (LOC counts
+                and verdicts) before evicting; the file size isn't capped
+        """
+        self.cache_file = Path(cache_file)
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._pending_writes = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._closed = False
+
+        _open_caches.add(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (lock held), replacing one that is corrupt"""
+        if self._connection is None:
+            if self._closed:
+                raise RuntimeError("Blob cache is closed")
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                self._connection = self._open()
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Blob cache {self.cache_file} is unreadable, starting a new one: {e}")
+                for suffix in ("", "-wal", "-shm"):
+                    Path(f"{self.cache_file}{suffix}").unlink(missing_ok=True)
+                self._connection = self._open()
+        return self._connection
+
+    def _open(self) -> sqlite3.Connection:
+        """Connect and create the tables, rebuilding a database of another schema version"""
+        connection = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS loc_cache")
+                connection.execute("DROP TABLE IF EXISTS blob_verdicts")
+                connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS loc_cache ("
+                " blob_sha TEXT NOT NULL,"
+                " language TEXT NOT NULL,"
+                " loc INTEGER NOT NULL,"
+                " detected_language TEXT,"
+                " version INTEGER NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (blob_sha, language))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS loc_cache_last_used ON loc_cache (last_used)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS blob_verdicts ("
+                " blob_sha TEXT NOT NULL,"
+                " extension TEXT NOT NULL,"
+                " verdict TEXT NOT NULL,"
+                " version INTEGER NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (blob_sha, extension))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS blob_verdicts_last_used ON blob_verdicts (last_used)")
+            connection.commit()
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def get_loc(self, blob_sha: str, language: str) -> Optional[Tuple[int, str]]:
+        """
+        Look up the LOC count of a blob.
+
+        Args:
+            blob_sha: Git blob SHA of the file content
+            language: Language the content was counted as (comment style)
+
+        Returns:
+            Tuple of (loc, detected language), or None on a cache miss
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT loc, detected_language FROM loc_cache WHERE blob_sha = ? AND language = ? AND version = ?",
+                (blob_sha, language, self.LOC_VERSION)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            connection.execute(
+                "UPDATE loc_cache SET last_used = ? WHERE blob_sha = ? AND language = ?",
+                (time.time(), blob_sha, language)
+            )
+            self._note_write()
+            return row[0], row[1]
+
+    def contains(self, blob_sha: str, language: str) -> bool:
+        """Check whether a LOC count is cached, without touching counters or last-used times"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM loc_cache WHERE blob_sha = ? AND language = ? AND version = ?",
+                (blob_sha, language, self.LOC_VERSION)
+            ).fetchone()
+            return row is not None
+
+    def store_loc(self, blob_sha: str, language: str, loc: int, detected_language: str) -> None:
+        """Record the LOC count of a blob"""
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO loc_cache (blob_sha, language, loc, detected_language, version, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (blob_sha, language, loc, detected_language, self.LOC_VERSION, time.time())
+            )
+            self.stores += 1
+            self._note_write()
+
+    def get_verdict(self, blob_sha: str, extension: str, version: int) -> Optional[str]:
+        """Verdict of a blob left out of LOC counts before, under ``extension``, by rules of ``version``, or None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT verdict FROM blob_verdicts WHERE blob_sha = ? AND extension = ? AND version = ?",
+                (blob_sha, extension, version)
+            ).fetchone()
+            return row[0] if row is not None else None
+
+    def store_verdict(self, blob_sha: str, extension: str, verdict: str, version: int) -> None:
+        """Record why a blob under ``extension`` is left out of LOC counts, and the version of the rules that decided it"""
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO blob_verdicts (blob_sha, extension, verdict, version, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (blob_sha, extension, verdict, version, time.time())
+            )
+            self._note_write()
+
+    def _note_write(self) -> None:
+        """Count a pending write and commit/evict once enough have accumulated (lock held)"""
+        self._pending_writes += 1
+        if self._pending_writes >= self.COMMIT_INTERVAL:
+            self._commit()
+
+    def _commit(self) -> None:
+        """Evict least recently used entries if over capacity, then commit (lock held)"""
+        for table in ("loc_cache", "blob_verdicts"):
+            count = self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if count > self.max_entries:
+                # Evict down to 90% so eviction doesn't run on every commit
+                excess = count - int(self.max_entries * 0.9)
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE rowid IN "
+                    f"(SELECT rowid FROM {table} ORDER BY last_used ASC LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+
+        self._connection.commit()
+        self._pending_writes = 0
+
+    def flush(self) -> None:
+        """Write pending changes to disk"""
+        with self._lock:
+            if self._connection is not None:
+                self._commit()
+
+    def close(self) -> None:
+        """Flush and close the database"""
+        with self._lock:
+            self._closed = True
+            if self._connection is None:
+                return
+            self._commit()
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache counters for this run"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions
+        }
+
+    def log_summary(self) -> None:
+        """Log hit/miss counters for this run"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        logger.info(f"Blob cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+                    f"{self.stores} stored, {self.evictions} evicted")
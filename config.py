@@ -16,7 +16,7 @@ import os
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, TypedDict, Dict, Set, Literal, Any, Optional
+from typing import List, TypedDict, Dict, Set, Literal, Any, Optional, Tuple
 import json
 from console import console, logger
 
@@ -28,10 +28,12 @@ class Configuration(TypedDict):
     Provides strong typing for configuration settings throughout the application.
     """
     GITHUB_TOKEN: str
+    GITHUB_EXTRA_TOKENS: List[str]  # More tokens (PATs or App installation tokens) to pool rate limits with
     USERNAME: str
     REPORTS_DIR: str
     CLONE_DIR: str
     MAX_WORKERS: int
+    FILE_WORKERS: int  # Threads fetching and counting the files of one repository (1 processes them in turn)
     INACTIVE_THRESHOLD_DAYS: int
     LARGE_REPO_LOC_THRESHOLD: int
     SKIP_FORKS: bool
@@ -39,10 +41,29 @@ class Configuration(TypedDict):
     INCLUDE_PRIVATE: bool  # Legacy option, maintained for backwards compatibility
     VISIBILITY: Literal["all", "public", "private"]  # New option that supersedes INCLUDE_PRIVATE
     ANALYZE_CLONES: bool
+    USE_GIT_TREES: bool  # List repository files with one recursive Git Trees call
+    DOWNLOAD_ARCHIVES: bool  # Read file contents from one streamed tarball per repository
+    ENABLE_BLOB_CACHE: bool  # Reuse LOC counts of unchanged files across runs
+    BLOB_CACHE_FILE: str
+    BLOB_CACHE_MAX_ENTRIES: int
+    USE_GRAPHQL: bool  # Fetch community and activity counts in batched GraphQL queries
+    GRAPHQL_BATCH_SIZE: int
+    USE_ASYNC_ENGINE: bool  # Analyze repositories on one asyncio event loop (requires aiohttp)
+    ASYNC_REPO_CONCURRENCY: int
+    ASYNC_TREE_CONCURRENCY: int
+    ASYNC_BLOB_CONCURRENCY: int
+    ASYNC_METADATA_CONCURRENCY: int
+    LOC_PROCESS_WORKERS: int  # Count lines of code in worker processes (0 counts on the analysis threads)
+    MAX_LOC_FILE_SIZE_MB: int  # Larger files aren't counted; files over 1 MB are counted from a stream
+    DETECT_GENERATED_FILES: bool  # Leave binary, generated and vendored content out of LOC counts
     ENABLE_CHECKPOINTING: bool
     CHECKPOINT_FILE: str
     CHECKPOINT_THRESHOLD: int
+    CHECKPOINT_INTERVAL: int  # Seconds between rate limit checks and checkpoints of a parallel run
+    RESUME_AFTER_RESET: bool  # Sleep until the rate limit resets and carry on instead of exiting
+    RATE_LIMIT_PACING: bool  # Spread requests so the rate limit lasts until it resets
     RESUME_FROM_CHECKPOINT: bool
+    INCREMENTAL_ANALYSIS: bool  # Reuse stats of unchanged repositories and diff changed ones
     INCLUDE_ORGS: List[str]  # List of organization names to include in analysis
     IFRAME_EMBEDDING: Literal["disabled", "partial", "full"]  # Option for iframe embedding
     VERCEL_TOKEN: str  # Vercel API token for deployment
@@ -52,10 +73,12 @@ class Configuration(TypedDict):
 # Configuration - these will be replaced by command line args or config file
 DEFAULT_CONFIG: Configuration = {
     "GITHUB_TOKEN": "your_github_token_here",
+    "GITHUB_EXTRA_TOKENS": [],  # Empty list means analyze with GITHUB_TOKEN alone
     "USERNAME": "your_username_here",
     "REPORTS_DIR": "reports",
     "CLONE_DIR": "temp_repos",
     "MAX_WORKERS": 4,
+    "FILE_WORKERS": 1,  # Threads per repository for file content fetches and LOC counting
     "INACTIVE_THRESHOLD_DAYS": 180,  # 6 months
     "LARGE_REPO_LOC_THRESHOLD": 1000,
     "SKIP_FORKS": False,
@@ -63,10 +86,29 @@ DEFAULT_CONFIG: Configuration = {
     "INCLUDE_PRIVATE": True,  # Legacy option, maintained for backwards compatibility
     "VISIBILITY": "all",  # New option: "all", "public", or "private"
     "ANALYZE_CLONES": False,  # Whether to clone repos for deeper analysis
+    "USE_GIT_TREES": True,  # Whether to list files via the recursive Git Trees API
+    "DOWNLOAD_ARCHIVES": False,  # Whether to stream a tarball instead of fetching files one by one
+    "ENABLE_BLOB_CACHE": True,  # Whether to cache LOC counts by git blob SHA
+    "BLOB_CACHE_FILE": "",  # SQLite database for the blob cache; empty means blob_cache.sqlite in CHECKPOINT_DIR
+    "BLOB_CACHE_MAX_ENTRIES": 1000000,  # Rows kept per cache table (LOC counts, verdicts); LRU rows are evicted
+    "USE_GRAPHQL": True,  # Whether to batch per-repository metadata into GraphQL queries
+    "GRAPHQL_BATCH_SIZE": 20,  # Repositories requested per GraphQL query
+    "USE_ASYNC_ENGINE": False,  # Whether to use the asyncio engine instead of worker threads
+    "ASYNC_REPO_CONCURRENCY": 16,  # Repositories analyzed at once by the async engine
+    "ASYNC_TREE_CONCURRENCY": 8,  # Concurrent tree listings
+    "ASYNC_BLOB_CONCURRENCY": 64,  # Concurrent blob downloads
+    "ASYNC_METADATA_CONCURRENCY": 8,  # Concurrent metadata requests
+    "LOC_PROCESS_WORKERS": 0,  # Worker processes for LOC counting and file classification (0 disables)
+    "MAX_LOC_FILE_SIZE_MB": 20,  # Files of this size or larger are left out of LOC counts
+    "DETECT_GENERATED_FILES": False,  # Check names and the first bytes of content before counting a file
     "ENABLE_CHECKPOINTING": True,  # Whether to enable checkpoint feature
     "CHECKPOINT_FILE": "github_analyzer_checkpoint.pkl",  # Checkpoint file location
     "CHECKPOINT_THRESHOLD": 100,  # Create checkpoint when remaining API requests falls below this
+    "CHECKPOINT_INTERVAL": 30,  # How often a parallel run checks the rate limit and saves a checkpoint
+    "RESUME_AFTER_RESET": False,  # Whether a run stopped by the rate limit waits for the reset and continues
+    "RATE_LIMIT_PACING": True,  # Whether to slow down instead of exhausting the rate limit before reset
     "RESUME_FROM_CHECKPOINT": True,  # Whether to resume from checkpoint if it exists
+    "INCREMENTAL_ANALYSIS": False,  # Whether to only re-analyze repositories pushed since the last run
     "INCLUDE_ORGS": [],  # Empty list means don't include any organization repositories
     "IFRAME_EMBEDDING": "disabled",  # Default: No iframe embedding
     "VERCEL_TOKEN": "",  # Empty by default, must be provided for deployment
@@ -147,7 +189,7 @@ LANGUAGE_EXTENSIONS: Dict[str, str] = {
     '.bicep': 'Bicep', '.cdk': 'CDK',
 
     # Documentation
-    '.md': 'Markdown', '.mdx': 'MDX', '.rst': 'reStructuredText',
+    '.md': 'Markdown', '.markdown': 'Markdown', '.mdx': 'MDX', '.rst': 'reStructuredText', '.txt': 'Text',
     '.tex': 'LaTeX', '.ltx': 'LaTeX', '.latex': 'LaTeX', '.adoc': 'AsciiDoc', '.wiki': 'Wiki',
 
     # Other
@@ -156,6 +198,98 @@ LANGUAGE_EXTENSIONS: Dict[str, str] = {
     '.wasm': 'WebAssembly', '.wat': 'WebAssembly Text'
 }
 
+# Comment style LOC counting uses per extension (keys of CodeAnalyzer's patterns)
+COMMENT_STYLE_EXTENSIONS: Dict[str, str] = {
+    # Python
+    '.py': 'python', '.pyx': 'python', '.pyd': 'python', '.pyi': 'python',
+    '.ipynb': 'jupyter',  # Special handling for Jupyter notebooks
+
+    # JavaScript/TypeScript
+    '.js': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript',
+    '.ts': 'typescript', '.tsx': 'typescript', '.jsx': 'javascript',
+
+    # Web
+    '.html': 'html', '.htm': 'html', '.xhtml': 'html',
+    '.css': 'css', '.scss': 'scss', '.sass': 'scss', '.less': 'less',
+    '.svg': 'svg', '.xml': 'xml',
+
+    # JVM languages
+    '.java': 'java', '.kt': 'kotlin', '.kts': 'kotlin',
+    '.scala': 'scala', '.sc': 'scala',
+    '.groovy': 'java', '.clj': 'clojure', '.cljs': 'clojure',
+
+    # C-family
+    '.c': 'c', '.h': 'c',
+    '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
+    '.hpp': 'cpp', '.hxx': 'cpp', '.hh': 'cpp',
+    '.cs': 'c#',
+
+    # Other programming languages
+    '.rb': 'ruby', '.erb': 'ruby',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.php': 'php', '.phtml': 'php',
+    '.swift': 'swift',
+    '.m': 'objc', '.mm': 'objc',  # Objective-C
+    '.lua': 'lua',
+    '.hs': 'haskell', '.lhs': 'haskell',
+    '.pl': 'perl', '.pm': 'perl',
+    '.jl': 'julia',
+    '.r': 'r', '.rmd': 'r',
+    '.dart': 'dart',
+
+    # Shell and scripting
+    '.sh': 'shell', '.bash': 'bash', '.zsh': 'zsh', '.fish': 'fish',
+    '.ps1': 'powershell', '.psm1': 'powershell', '.psd1': 'powershell',
+
+    # Configuration and data
+    '.json': 'json', '.yaml': 'yaml', '.yml': 'yaml',
+    '.toml': 'toml', '.ini': 'text',
+    '.sql': 'sql',
+
+    # Documentation
+    '.md': 'markdown', '.markdown': 'markdown',
+    '.tex': 'latex', '.ltx': 'latex', '.latex': 'latex',
+    '.txt': 'text',
+}
+
+# Comment styles of languages no extension above gives one (special filenames)
+LANGUAGE_COMMENT_STYLES: Dict[str, str] = {
+    'Makefile': 'makefile',
+    'Docker': 'shell',
+}
+
+# Other names of the same language, mapped to the name reports use
+LANGUAGE_ALIASES: Dict[str, str] = {
+    'TeX': 'LaTeX',  # Treat TeX as LaTeX
+    'React': 'JavaScript',  # For backward compatibility, treat React as JavaScript
+    'ReactJS': 'JavaScript',
+}
+
+# Languages that only decide a repository's primary language when it has no programming language
+NON_PROGRAMMING_LANGUAGES: Set[str] = {'Other', 'Text', 'Markdown', 'JSON', 'YAML', 'TOML', 'INI'}
+
+# Directories whose subdirectories are separate projects of a monorepo
+MONOREPO_CONTAINER_DIRECTORIES: Set[str] = {'packages', 'apps', 'services', 'libs', 'crates', 'projects'}
+
+# Shebang interpreters (version suffix removed) of extensionless scripts
+SHEBANG_INTERPRETERS: Dict[str, str] = {
+    'python': 'Python', 'pypy': 'Python',
+    'node': 'JavaScript', 'nodejs': 'JavaScript', 'deno': 'TypeScript', 'ts-node': 'TypeScript',
+    'sh': 'Shell', 'dash': 'Shell', 'ash': 'Shell', 'ksh': 'Shell',
+    'bash': 'Bash', 'zsh': 'Zsh', 'fish': 'Fish', 'pwsh': 'PowerShell',
+    'ruby': 'Ruby', 'perl': 'Perl', 'php': 'PHP', 'lua': 'Lua',
+    'Rscript': 'R', 'julia': 'Julia', 'elixir': 'Elixir', 'escript': 'Erlang',
+    'awk': 'AWK', 'gawk': 'AWK', 'sed': 'Sed', 'make': 'Makefile',
+}
+
+# Start-of-content signatures (after leading whitespace) of extensionless files without a shebang
+CONTENT_SIGNATURES: List[Tuple[str, str]] = [
+    (r'<\?php', 'PHP'),
+    (r'<\?xml', 'XML'),
+    (r'(?i)<!doctype html|<html', 'HTML'),
+]
+
 BINARY_EXTENSIONS: Set[str] = {
     # Images
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.ico', '.webp', '.tiff', '.tif',
@@ -505,6 +639,59 @@ RELEASE_FILES: Set[str] = {
     'semver.txt', 'semantic-release.config.js'
 }
 
+# Path fragments that mark a test file
+TEST_PATH_PATTERNS: List[str] = [
+    '/test/', '/tests/', '/spec/', '/specs/',
+    'test_', '_test.', '.test.', '.spec.',
+    'test.', 'spec.', 'tests.', 'specs.'
+]
+
+# Path fragments that mark a release file, besides RELEASE_FILES
+RELEASE_PATH_PATTERNS: List[str] = [
+    'changelog', 'changes', 'releases', 'version', 'semver',
+    'semantic-release', '.github/releases'
+]
+
+# Path fragments and file names that mark a CI/CD file
+CICD_PATH_PATTERNS: List[str] = ['.github/workflows', '.circleci', '.travis', 'jenkins', 'gitlab-ci']
+CICD_FILENAMES: Set[str] = {'dockerfile', 'jenkinsfile', 'vagrantfile', 'procfile'}
+
+# SPECIAL_FILENAMES types (matched as substrings) that put a file in a category
+CICD_FILE_TYPES: List[str] = ['Docker', 'Jenkinsfile', 'YAML', 'CI', 'CD']
+CONFIG_FILE_TYPES: List[str] = ['JSON', 'YAML', 'TOML', 'INI', 'XML', 'Config']
+PACKAGE_FILE_TYPES: List[str] = ['TOML', 'JSON', 'Package', 'Requirements', 'Gemfile', 'Cargo']
+DEPLOYMENT_FILE_TYPES: List[str] = ['Docker', 'Kubernetes', 'Deploy', 'Terraform']
+
+# Files written by tools rather than people, left out of LOC counts
+GENERATED_FILENAMES: Set[str] = {
+    # Lockfiles
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+    'composer.lock', 'Gemfile.lock', 'Cargo.lock', 'poetry.lock', 'Pipfile.lock', 'pdm.lock',
+    'go.sum', 'mix.lock', 'pubspec.lock', 'Podfile.lock', 'flake.lock', 'packages.lock.json'
+}
+GENERATED_FILE_SUFFIXES: List[str] = [
+    # Minified bundles and source maps
+    '.min.js', '.min.css', '.js.map', '.css.map',
+    # Protocol buffers, gRPC and other code generators
+    '_pb2.py', '_pb2_grpc.py', '.pb.go', '.pb.cc', '.pb.h', '.pb.swift', '_grpc.pb.go',
+    '.g.dart', '.freezed.dart', '.designer.cs', '.g.cs', '.generated.cs'
+]
+
+# Header lines of generated files start with one of these (after an optional comment leader)
+GENERATED_CONTENT_MARKERS: List[str] = [
+    '@generated', 'Code generated by', 'Generated by the protocol buffer compiler',
+    'This file is automatically generated', 'This file was automatically generated', 'Autogenerated by'
+]
+
+# Extensions whose files are minified when their lines run long
+MINIFIABLE_EXTENSIONS: Set[str] = {'.js', '.mjs', '.cjs', '.css'}
+
+# Directories holding third-party code copied into a repository, besides EXCLUDED_DIRECTORIES
+VENDORED_DIRECTORIES: Set[str] = {
+    'third_party', 'third-party', 'thirdparty', '3rdparty', 'ThirdParty',
+    'vendored', 'Pods', 'Carthage'
+}
+
 # Media file extensions for specific media types
 IMAGE_FILE_EXTENSIONS: Set[str] = {
     # Common image formats
@@ -907,6 +1094,8 @@ class ConfigLoader:
         if "github" in cp:
             if "token" in cp["github"]:
                 config["GITHUB_TOKEN"] = cp["github"]["token"]
+            if "extra_tokens" in cp["github"]:
+                config["GITHUB_EXTRA_TOKENS"] = parse_token_list(cp["github"]["extra_tokens"])
             if "username" in cp["github"]:
                 config["USERNAME"] = cp["github"]["username"]
 
@@ -920,10 +1109,42 @@ class ConfigLoader:
                 config["CLONE_DIR"] = cp["analysis"]["clone_dir"]
             if "max_workers" in cp["analysis"]:
                 config["MAX_WORKERS"] = cp["analysis"].getint("max_workers")
+            if "file_workers" in cp["analysis"]:
+                config["FILE_WORKERS"] = cp["analysis"].getint("file_workers")
             if "inactive_threshold_days" in cp["analysis"]:
                 config["INACTIVE_THRESHOLD_DAYS"] = cp["analysis"].getint("inactive_threshold_days")
             if "large_repo_loc_threshold" in cp["analysis"]:
                 config["LARGE_REPO_LOC_THRESHOLD"] = cp["analysis"].getint("large_repo_loc_threshold")
+            if "use_git_trees" in cp["analysis"]:
+                config["USE_GIT_TREES"] = cp["analysis"].getboolean("use_git_trees")
+            if "download_archives" in cp["analysis"]:
+                config["DOWNLOAD_ARCHIVES"] = cp["analysis"].getboolean("download_archives")
+            if "enable_blob_cache" in cp["analysis"]:
+                config["ENABLE_BLOB_CACHE"] = cp["analysis"].getboolean("enable_blob_cache")
+            if "blob_cache_file" in cp["analysis"]:
+                config["BLOB_CACHE_FILE"] = cp["analysis"]["blob_cache_file"]
+            if "blob_cache_max_entries" in cp["analysis"]:
+                config["BLOB_CACHE_MAX_ENTRIES"] = cp["analysis"].getint("blob_cache_max_entries")
+            if "use_graphql" in cp["analysis"]:
+                config["USE_GRAPHQL"] = cp["analysis"].getboolean("use_graphql")
+            if "graphql_batch_size" in cp["analysis"]:
+                config["GRAPHQL_BATCH_SIZE"] = cp["analysis"].getint("graphql_batch_size")
+            if "use_async_engine" in cp["analysis"]:
+                config["USE_ASYNC_ENGINE"] = cp["analysis"].getboolean("use_async_engine")
+            if "async_repo_concurrency" in cp["analysis"]:
+                config["ASYNC_REPO_CONCURRENCY"] = cp["analysis"].getint("async_repo_concurrency")
+            if "async_tree_concurrency" in cp["analysis"]:
+                config["ASYNC_TREE_CONCURRENCY"] = cp["analysis"].getint("async_tree_concurrency")
+            if "async_blob_concurrency" in cp["analysis"]:
+                config["ASYNC_BLOB_CONCURRENCY"] = cp["analysis"].getint("async_blob_concurrency")
+            if "async_metadata_concurrency" in cp["analysis"]:
+                config["ASYNC_METADATA_CONCURRENCY"] = cp["analysis"].getint("async_metadata_concurrency")
+            if "loc_process_workers" in cp["analysis"]:
+                config["LOC_PROCESS_WORKERS"] = cp["analysis"].getint("loc_process_workers")
+            if "max_loc_file_size_mb" in cp["analysis"]:
+                config["MAX_LOC_FILE_SIZE_MB"] = cp["analysis"].getint("max_loc_file_size_mb")
+            if "detect_generated_files" in cp["analysis"]:
+                config["DETECT_GENERATED_FILES"] = cp["analysis"].getboolean("detect_generated_files")
 
     def _process_filter_settings(self, cp: configparser.ConfigParser, config: Configuration) -> None:
         """Process filter related settings from config parser"""
@@ -967,8 +1188,16 @@ class ConfigLoader:
                 config["CHECKPOINT_FILE"] = cp["checkpointing"]["checkpoint_file"]
             if "checkpoint_threshold" in cp["checkpointing"]:
                 config["CHECKPOINT_THRESHOLD"] = cp["checkpointing"].getint("checkpoint_threshold")
+            if "checkpoint_interval" in cp["checkpointing"]:
+                config["CHECKPOINT_INTERVAL"] = cp["checkpointing"].getint("checkpoint_interval")
+            if "resume_after_reset" in cp["checkpointing"]:
+                config["RESUME_AFTER_RESET"] = cp["checkpointing"].getboolean("resume_after_reset")
+            if "rate_limit_pacing" in cp["checkpointing"]:
+                config["RATE_LIMIT_PACING"] = cp["checkpointing"].getboolean("rate_limit_pacing")
             if "resume_from_checkpoint" in cp["checkpointing"]:
                 config["RESUME_FROM_CHECKPOINT"] = cp["checkpointing"].getboolean("resume_from_checkpoint")
+            if "incremental_analysis" in cp["checkpointing"]:
+                config["INCREMENTAL_ANALYSIS"] = cp["checkpointing"].getboolean("incremental_analysis")
 
     def _process_iframe_settings(self, cp: configparser.ConfigParser, config: Configuration) -> None:
         """Process iframe embedding related settings from config parser"""
@@ -1025,6 +1254,16 @@ class ConfigLoader:
         return DEFAULT_CONFIG.copy()
 
 
+def parse_token_list(value: str) -> List[str]:
+    """Split a comma-separated list of tokens, dropping blanks"""
+    return [token.strip() for token in value.split(",") if token.strip()]
+
+
+def extra_tokens_from_env() -> List[str]:
+    """Tokens listed in the GITHUB_EXTRA_TOKENS environment variable"""
+    return parse_token_list(os.environ.get("GITHUB_EXTRA_TOKENS", ""))
+
+
 def load_config_from_file(config_file: str) -> Configuration:
     """
     Load configuration from a file and return as Configuration dict.
@@ -1058,15 +1297,32 @@ def create_sample_config() -> None:
     config = configparser.ConfigParser()
     config['github'] = {
         'token': 'your_github_token_here',
-        'username': 'your_username_here'
+        'username': 'your_username_here',
+        'extra_tokens': ''
     }
 
     config['analysis'] = {
         'reports_dir': 'reports',
         'clone_dir': 'temp_repos',
         'max_workers': '4',
+        'file_workers': '1',
         'inactive_threshold_days': '180',
-        'large_repo_loc_threshold': '1000'
+        'large_repo_loc_threshold': '1000',
+        'use_git_trees': 'true',
+        'download_archives': 'false',
+        'enable_blob_cache': 'true',
+        'blob_cache_file': '',
+        'blob_cache_max_entries': '1000000',
+        'use_graphql': 'true',
+        'graphql_batch_size': '20',
+        'use_async_engine': 'false',
+        'async_repo_concurrency': '16',
+        'async_tree_concurrency': '8',
+        'async_blob_concurrency': '64',
+        'async_metadata_concurrency': '8',
+        'loc_process_workers': '0',
+        'max_loc_file_size_mb': '20',
+        'detect_generated_files': 'false'
     }
 
     config['filters'] = {
@@ -1082,7 +1338,11 @@ def create_sample_config() -> None:
         'enable_checkpointing': 'true',
         'checkpoint_file': 'github_analyzer_checkpoint.pkl',
         'checkpoint_threshold': '100',
-        'resume_from_checkpoint': 'true'
+        'checkpoint_interval': '30',
+        'resume_after_reset': 'false',
+        'rate_limit_pacing': 'true',
+        'resume_from_checkpoint': 'true',
+        'incremental_analysis': 'false'
     }
 
     # Add iframe configuration section
@@ -1165,6 +1425,8 @@ def create_sample_env() -> None:
     env_content = """# GitHub Authentication
 GITHUB_TOKEN=your_github_token_here
 GITHUB_USERNAME=your_github_username_here
+# Optional: more tokens (comma-separated) to spread the rate limit over
+GITHUB_EXTRA_TOKENS=
 
 # Repository Analysis Settings
 GITHUB_VISIBILITY=all  # all, public, or private
@@ -1393,17 +1655,18 @@ def shutdown_logging() -> None:
     pass
 
 
-def get_media_type(file_path: str) -> Optional[str]:
+def get_media_type(file_path: str, extension: Optional[str] = None) -> Optional[str]:
     """
     Determine the type of media file based on its extension.
     
     Args:
         file_path: Path to the file
+        extension: The file's lowercased extension, when already known
         
     Returns:
         Media type as string ('image', 'audio', 'video', 'model_3d') or None if not a media file
     """
-    ext = Path(file_path).suffix.lower()
+    ext = extension if extension is not None else Path(file_path).suffix.lower()
 
     if ext in IMAGE_FILE_EXTENSIONS:
         return 'image'
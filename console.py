@@ -236,6 +236,7 @@ class RateLimitDisplay:
             "reset_time": None,
             "used": 0
         }
+        self.token_data = []
 
     def update_from_api(self, github_client: Any) -> None:
         """Update rate limit data from GitHub client"""
@@ -248,10 +249,38 @@ class RateLimitDisplay:
         except Exception as e:
             logger.warning(f"Could not update rate limit data: {e}")
 
-    def _get_status_style(self) -> str:
+    def update_from_budget(self, budget: Any) -> None:
+        """Update rate limit data from a header-fed RateBudget without an API request"""
+        snapshot = budget.snapshot()
+        self.rate_data["limit"] = snapshot["limit"]
+        self.rate_data["remaining"] = snapshot["remaining"]
+        self.rate_data["reset_time"] = datetime.fromtimestamp(snapshot["reset"]) if snapshot["reset"] else None
+        self.rate_data["used"] = snapshot["used"]
+
+    def update_from_pool(self, pool: Any) -> None:
+        """Update per-token and combined rate limit data from a TokenPool"""
+        self.token_data = []
+        for snapshot in pool.snapshots():
+            self.token_data.append({
+                "label": snapshot["label"],
+                "limit": snapshot["limit"],
+                "remaining": snapshot["remaining"],
+                "reset_time": datetime.fromtimestamp(snapshot["reset"]) if snapshot["reset"] else None,
+                "used": snapshot["used"]
+            })
+
+        observed = [data for data in self.token_data if data["limit"]]
+        self.rate_data["limit"] = sum(data["limit"] for data in observed)
+        self.rate_data["remaining"] = sum(data["remaining"] for data in observed)
+        self.rate_data["reset_time"] = min((data["reset_time"] for data in observed if data["reset_time"]),
+                                           default=None)
+        self.rate_data["used"] = sum(data["used"] for data in observed)
+
+    def _get_status_style(self, rate_data: Optional[dict] = None) -> str:
         """Get color style based on remaining requests"""
-        remaining = self.rate_data["remaining"]
-        limit = self.rate_data["limit"]
+        rate_data = rate_data or self.rate_data
+        remaining = rate_data["remaining"]
+        limit = rate_data["limit"]
 
         if remaining == 0:
             return "rate_limit.low"
@@ -278,6 +307,18 @@ class RateLimitDisplay:
             f"(resets at {reset_str})[/{style}]"
         )
 
+        # Per-token budgets when analyzing with a token pool
+        for data in self.token_data:
+            if not data["limit"]:
+                self.console.print(f"[dim]  {data['label']}: not used yet[/dim]")
+                continue
+            token_style = self._get_status_style(data)
+            self.console.print(
+                f"[{token_style}]  {data['label']}: "
+                f"{data['remaining']}/{data['limit']} remaining "
+                f"(resets at {data['reset_time'] or 'Unknown'})[/{token_style}]"
+            )
+
 
 # Export main interfaces
 __all__ = [
@@ -0,0 +1,161 @@
+"""
+Content Filter for GitHub Repository RunnerAnalyzer
+
+This module decides whether a file's content is worth counting before all of
+it is fetched. File names and directories catch lockfiles, minified bundles,
+generated sources and vendored code from the tree listing alone; the first
+bytes of the content catch binary data (NUL bytes), generator headers and
+minified code. Rejected blobs keep their verdict in the blob cache, so later
+runs skip them without a request, and the bytes left undownloaded are counted.
+
+Key components:
+- ContentFilter: Path and content-prefix checks with per-run counters
+"""
+
+import re
+import threading
+from collections import Counter
+from pathlib import PurePosixPath
+from typing import Optional
+
+from blob_cache import BlobCache
+from config import GENERATED_FILENAMES, GENERATED_FILE_SUFFIXES, GENERATED_CONTENT_MARKERS, \
+    MINIFIABLE_EXTENSIONS, VENDORED_DIRECTORIES
+from console import logger
+
+# Verdicts of files left out of LOC counts
+VERDICT_BINARY = 'binary'
+VERDICT_GENERATED = 'generated'
+VERDICT_VENDORED = 'vendored'
+
+
+class ContentFilter:
+    """
+    Reject binary, generated and vendored files before their content is counted.
+
+    ``unread_verdict`` needs only the tree listing (path and blob SHA);
+    ``prefix_verdict`` needs the first PROBE_SIZE bytes of content.
+    """
+
+    # Bytes of content probed, matching the NUL check git itself uses
+    PROBE_SIZE = 8000
+    # Generator markers are looked for in the header of a file only
+    MARKER_WINDOW = 2048
+    # Lines of .js/.css content this long only come out of a minifier (or hold inlined data)
+    MINIFIED_LINE_LENGTH = 500
+    # Share of the probed bytes on such lines above which the content counts as minified
+    MINIFIED_SHARE = 0.5
+    # Version of the rules below; cached verdicts of other versions are decided again
+    RULES_VERSION = 2
+
+    def __init__(self, blob_cache: Optional[BlobCache] = None):
+        """
+        Args:
+            blob_cache: Cache remembering verdicts across runs, if enabled
+        """
+        self.blob_cache = blob_cache
+        self.skipped: Counter = Counter()
+        self.bytes_avoided = 0
+
+        self._lock = threading.Lock()
+        # A marker opens a line, after nothing but indentation and a comment leader
+        markers = b'|'.join(re.escape(marker.encode()) for marker in GENERATED_CONTENT_MARKERS)
+        self._marker_pattern = re.compile(rb'^[ \t]*(?:(?://+|#+|/\*+|\*+|--|;+|%+|<!--|\(\*)[ \t]*)?(?:'
+                                          + markers + rb')', re.MULTILINE)
+
+    @staticmethod
+    def path_verdict(file_path: str) -> Optional[str]:
+        """Verdict decided by the file name and directories alone"""
+        *directories, name = file_path.split('/')
+        if any(directory in VENDORED_DIRECTORIES for directory in directories):
+            return VERDICT_VENDORED
+
+        lower_name = name.lower()
+        if name in GENERATED_FILENAMES or any(lower_name.endswith(suffix) for suffix in GENERATED_FILE_SUFFIXES):
+            return VERDICT_GENERATED
+        return None
+
+    def unread_verdict(self, file_path: str, blob_sha: Optional[str]) -> Optional[str]:
+        """Verdict known without reading any content: from the path or an earlier run"""
+        verdict = self.path_verdict(file_path)
+        if verdict is None and self.blob_cache is not None and blob_sha:
+            verdict = self.blob_cache.get_verdict(blob_sha, self._extension(file_path), self.RULES_VERSION)
+        return verdict
+
+    @staticmethod
+    def _extension(file_path: str) -> str:
+        """Extension verdicts are cached under, since the same content is judged by it (minified .js/.css)"""
+        return PurePosixPath(file_path).suffix.lower()
+
+    def prefix_verdict(self, file_path: str, prefix: bytes) -> Optional[str]:
+        """
+        Verdict decided by the first bytes of a file's content.
+
+        Args:
+            file_path: Path of the file in the repository
+            prefix: Up to PROBE_SIZE bytes from the start of the content
+
+        Returns:
+            VERDICT_BINARY or VERDICT_GENERATED, or None for content to count
+        """
+        prefix = prefix[:self.PROBE_SIZE]
+        if b'\0' in prefix:
+            return VERDICT_BINARY
+        if self._marker_pattern.search(prefix, 0, self.MARKER_WINDOW):
+            return VERDICT_GENERATED
+
+        if prefix and self._extension(file_path) in MINIFIABLE_EXTENSIONS:
+            long_line_bytes = sum(len(line) for line in prefix.split(b'\n') if len(line) > self.MINIFIED_LINE_LENGTH)
+            if long_line_bytes > len(prefix) * self.MINIFIED_SHARE:
+                return VERDICT_GENERATED
+
+        return None
+
+    def skip_unread(self, file_content) -> bool:
+        """
+        Check a file before any of its content is read.
+
+        A rejected file is counted as skipped, with its whole size avoided.
+        """
+        verdict = self.unread_verdict(file_content.path, getattr(file_content, 'sha', None))
+        if verdict is None:
+            return False
+
+        self._note_skipped(verdict, file_content.size or 0)
+        return True
+
+    def accept_prefix(self, file_content, prefix: bytes, bytes_read: int) -> bool:
+        """
+        Check a file from the start of its content.
+
+        Args:
+            file_content: File being analyzed
+            prefix: The first bytes of its content
+            bytes_read: Bytes already fetched; the rest of the file is avoided when it's rejected
+
+        Returns:
+            Whether the file's lines should be counted
+        """
+        verdict = self.prefix_verdict(file_content.path, prefix)
+        if verdict is None:
+            return True
+
+        blob_sha = getattr(file_content, 'sha', None)
+        if self.blob_cache is not None and blob_sha:
+            self.blob_cache.store_verdict(blob_sha, self._extension(file_content.path), verdict, self.RULES_VERSION)
+        self._note_skipped(verdict, max((file_content.size or 0) - bytes_read, 0))
+        return False
+
+    def _note_skipped(self, verdict: str, bytes_avoided: int) -> None:
+        with self._lock:
+            self.skipped[verdict] += 1
+            self.bytes_avoided += bytes_avoided
+
+    def log_summary(self) -> None:
+        """Log the files left out of LOC counts and the bytes not downloaded for them"""
+        if not self.skipped:
+            return
+
+        counts = ", ".join(f"{count} {verdict}" for verdict, count in sorted(self.skipped.items()))
+        logger.info(f"Content filter: skipped {counts} files; "
+                    f"{self.bytes_avoided / (1024 * 1024):.1f} MB not downloaded")
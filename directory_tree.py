@@ -0,0 +1,104 @@
+"""
+Directory Tree for GitHub Repository RunnerAnalyzer
+
+This module rolls the flat file list of a repository up into per-directory
+totals. While files are processed, only the directory each file sits in is
+updated; once the listing is done, one pass from the deepest directories up
+adds every directory into its parent. The result is a DirectoryStats prefix
+tree stored on CodeStats, which monorepo detection, game detection and the
+project structure report read without another listing.
+
+Key components:
+- DirectoryAggregator: Collects per-file totals and builds the DirectoryStats tree
+"""
+
+from typing import Any, Dict
+
+from models import DirectoryStats, from_record, to_record
+
+
+class DirectoryAggregator:
+    """
+    Per-directory totals of one repository's files.
+
+    ``add_file`` and ``add_loc`` touch one directory per file; ``build``
+    rolls the totals up in one pass over the directories.
+    """
+
+    def __init__(self):
+        # Totals of the files directly in each directory, keyed by path ('' is the root)
+        self._directories: Dict[str, DirectoryStats] = {}
+
+    def add_file(self, file_path: str) -> None:
+        """Count a file in its directory"""
+        self._directory(file_path).files += 1
+
+    def add_loc(self, file_path: str, language: str, loc: int) -> None:
+        """Add a file's lines of code to its directory"""
+        node = self._directory(file_path)
+        node.loc += loc
+        node.languages[language] = node.languages.get(language, 0) + loc
+
+    def merge(self, other: 'DirectoryAggregator') -> None:
+        """Add the totals of another aggregator, e.g. one that collected a shard of the same files"""
+        for path, other_node in other._directories.items():
+            node = self._node(path)
+            node.files += other_node.files
+            node.loc += other_node.loc
+            for language, loc in other_node.languages.items():
+                node.languages[language] = node.languages.get(language, 0) + loc
+
+    def to_record(self) -> Dict[str, Any]:
+        """JSON-safe form of the per-directory totals collected so far, e.g. to resume a paused analysis"""
+        return {path: to_record(node) for path, node in self._directories.items()}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'DirectoryAggregator':
+        """Aggregator holding the totals of a ``to_record`` form"""
+        aggregator = cls()
+        aggregator._directories = {path: from_record(DirectoryStats, node) for path, node in record.items()}
+        return aggregator
+
+    def _directory(self, file_path: str) -> DirectoryStats:
+        return self._node(file_path.rpartition('/')[0])
+
+    def _node(self, path: str) -> DirectoryStats:
+        node = self._directories.get(path)
+        if node is None:
+            depth = path.count('/') + 1 if path else 0
+            node = self._directories[path] = DirectoryStats(depth=depth, max_depth=depth)
+        return node
+
+    def build(self) -> DirectoryStats:
+        """
+        Roll the directory totals up into a tree.
+
+        Returns:
+            The repository root, whose totals cover every file added
+        """
+        nodes = dict(self._directories)
+        nodes.setdefault('', DirectoryStats())
+
+        # Directories holding only subdirectories have no files of their own yet
+        for path in list(nodes):
+            while path:
+                path = path.rpartition('/')[0]
+                if path in nodes:
+                    break
+                depth = path.count('/') + 1 if path else 0
+                nodes[path] = DirectoryStats(depth=depth, max_depth=depth)
+
+        # Deepest first, so each directory is complete before it's added to its parent
+        for path in sorted(nodes, key=lambda p: nodes[p].depth, reverse=True):
+            if not path:
+                continue
+            parent_path, _, name = path.rpartition('/')
+            node, parent = nodes[path], nodes[parent_path]
+            parent.children[name] = node
+            parent.files += node.files
+            parent.loc += node.loc
+            for language, loc in node.languages.items():
+                parent.languages[language] = parent.languages.get(language, 0) + loc
+            parent.max_depth = max(parent.max_depth, node.max_depth)
+
+        return nodes['']
@@ -0,0 +1,161 @@
+"""
+Language Engine for GitHub Repository RunnerAnalyzer
+
+This module resolves a file's language once for the whole tool. The language
+reports show (``LANGUAGE_EXTENSIONS``, ``SPECIAL_FILENAMES``) and the comment
+style LOC counting uses (``COMMENT_STYLE_EXTENSIONS``) are merged into one
+table at start-up, and every lookup is memoized per extension, or per name
+for files without one. Files whose name says nothing are told apart by the
+start of their content: a shebang line first, then the signatures of a few
+formats that are often left without an extension.
+
+Key components:
+- LanguageMatch: Display language and comment style of a file
+- LanguageEngine: Memoized resolver with shebang and content sniffing
+- language_engine: Shared instance built from the configured tables
+"""
+
+import re
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from config import COMMENT_STYLE_EXTENSIONS, CONTENT_SIGNATURES, LANGUAGE_ALIASES, LANGUAGE_COMMENT_STYLES, \
+    LANGUAGE_EXTENSIONS, NON_PROGRAMMING_LANGUAGES, SHEBANG_INTERPRETERS, SPECIAL_FILENAMES
+from path_classifier import PathInfo, as_path_info
+
+# Language of files nothing identifies
+UNKNOWN_LANGUAGE = 'Other'
+# Comment style of content counted without comment rules
+PLAIN_STYLE = 'text'
+# Comment style of files whose content decides their language: counted as
+# plain text until sniffed, with blob cache entries apart from plain text ones
+SNIFFED_STYLE = 'sniffed'
+
+
+class LanguageMatch(NamedTuple):
+    """Language of a file as reports show it, and the comment style its lines are counted with"""
+    language: str
+    comment_style: str
+    needs_content: bool = False  # Only the start of the content can tell
+
+
+class LanguageEngine:
+    """
+    Resolve file languages from one precompiled table.
+
+    ``resolve`` needs the path alone; ``detect`` also takes the start of the
+    content, used for files without an extension or a known name.
+    """
+
+    # Bytes of content looked at when sniffing
+    SNIFF_SIZE = 512
+
+    def __init__(self):
+        # Comment style of each language, for names and sniffed content that have no extension to go by
+        style_by_language: Dict[str, str] = {}
+        for extension, style in COMMENT_STYLE_EXTENSIONS.items():
+            if extension in LANGUAGE_EXTENSIONS:
+                style_by_language.setdefault(self.standardize(LANGUAGE_EXTENSIONS[extension]), style)
+        style_by_language.update(LANGUAGE_COMMENT_STYLES)
+        self._style_by_language = style_by_language
+
+        # Memo keyed by (extension, '') or, without an extension, ('', name); extensions are all known up front
+        self._matches: Dict[Tuple[str, str], LanguageMatch] = {}
+        for extension in LANGUAGE_EXTENSIONS.keys() | COMMENT_STYLE_EXTENSIONS.keys():
+            language = self.standardize(LANGUAGE_EXTENSIONS.get(extension, UNKNOWN_LANGUAGE))
+            style = COMMENT_STYLE_EXTENSIONS.get(extension) or style_by_language.get(language, PLAIN_STYLE)
+            self._matches[(extension, '')] = LanguageMatch(language, style)
+        self._names = {name: self._match_language(language) for name, language in SPECIAL_FILENAMES.items()}
+
+        self._unknown = LanguageMatch(UNKNOWN_LANGUAGE, PLAIN_STYLE)
+        self._unresolved = LanguageMatch(UNKNOWN_LANGUAGE, SNIFFED_STYLE, needs_content=True)
+        self._version_suffix = re.compile(r'[0-9.]+$')
+        self._signatures = [(re.compile(pattern.encode()), self._match_language(language))
+                            for pattern, language in CONTENT_SIGNATURES]
+
+    @staticmethod
+    def standardize(language: str) -> str:
+        """The name reports use for a language, resolving aliases such as TeX"""
+        return LANGUAGE_ALIASES.get(language, language)
+
+    @staticmethod
+    def is_programming_language(language: str) -> bool:
+        """Whether a language is code rather than prose, data or configuration"""
+        return language not in NON_PROGRAMMING_LANGUAGES
+
+    def resolve(self, file_path: Union[str, PathInfo]) -> LanguageMatch:
+        """
+        Language of a file from its path alone.
+
+        Args:
+            file_path: Path to the file, or its PathInfo
+
+        Returns:
+            The match; ``needs_content`` is set when only ``detect`` can tell
+        """
+        info = as_path_info(file_path)
+        key = (info.extension, '') if info.extension else ('', info.name)
+        match = self._matches.get(key)
+        if match is None:
+            if info.extension:
+                match = self._unknown
+            else:
+                match = self._names.get(info.name, self._unresolved)
+            self._matches[key] = match
+        return match
+
+    def detect(self, file_path: Union[str, PathInfo], head: Union[bytes, str, None] = None) -> LanguageMatch:
+        """
+        Language of a file from its path and, when the path can't tell, the start of its content.
+
+        Args:
+            file_path: Path to the file, or its PathInfo
+            head: The content, or at least its first SNIFF_SIZE bytes; None when not at hand
+
+        Returns:
+            The match, which still needs content only when no head was given
+        """
+        match = self.resolve(file_path)
+        if match.needs_content and head is not None:
+            return self.sniff(head)
+        return match
+
+    def sniff(self, head: Union[bytes, str]) -> LanguageMatch:
+        """Language told by a shebang line or a content signature, or plain text"""
+        if isinstance(head, str):
+            head = head[:self.SNIFF_SIZE].encode('utf-8', errors='ignore')
+        head = bytes(head[:self.SNIFF_SIZE])
+
+        if head.startswith(b'#!'):
+            language = self._shebang_language(head)
+            if language is not None:
+                return self._match_language(language)
+
+        start = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+        for pattern, match in self._signatures:
+            if pattern.match(start):
+                return match
+        return self._unknown
+
+    def _shebang_language(self, head: bytes) -> Optional[str]:
+        """Language of the interpreter a shebang line runs, e.g. '#!/usr/bin/env python3'"""
+        words = head[2:].split(b'\n', 1)[0].decode('ascii', errors='ignore').split()
+        if not words:
+            return None
+
+        program = words[0].rpartition('/')[2]
+        if program == 'env':
+            # Skip env's options and variable assignments
+            arguments = [word for word in words[1:] if not word.startswith('-') and '=' not in word]
+            if not arguments:
+                return None
+            program = arguments[0].rpartition('/')[2]
+
+        return SHEBANG_INTERPRETERS.get(self._version_suffix.sub('', program))
+
+    def _match_language(self, language: str) -> LanguageMatch:
+        """The match of a language known by name only"""
+        language = self.standardize(language)
+        return LanguageMatch(language, self._style_by_language.get(language, PLAIN_STYLE))
+
+
+language_engine = LanguageEngine()
@@ -19,7 +19,9 @@ from analyzer import GithubAnalyzer
 from config import DEFAULT_CONFIG, Configuration, load_theme_config
 from console import logger, RateLimitDisplay, print_info, print_error
 from models import RepoStats
+from repo_metadata import RepoMetadataFetcher, GraphQLTransport
 from reporter import GithubReporter
+from token_pool import TokenPool
 from utilities import Checkpoint
 from visualize import GithubVisualizer
 
@@ -44,6 +46,7 @@ class GithubLens:
         """
         self.orepo: Optional[Dict[str, List[RepoStats]]] = None
         self.github: Optional[Github] = None
+        self.token_pool: Optional[TokenPool] = None
         self.config = DEFAULT_CONFIG.copy()
         if config:
             self.config.update(config)
@@ -81,6 +84,13 @@ class GithubLens:
         # Set rate display for analyzer
         self.analyzer.rate_display = self.rate_display
         self.analyzer.checkpoint = self.checkpoint
+        self.analyzer.session = self.session
+        self.analyzer.token_pool = self.token_pool
+        # Feed archive and GraphQL responses into the same rate budget as PyGithub's
+        self.session.hooks['response'].append(self.analyzer.rate_budget.session_hook)
+        if self.config.get("USE_GRAPHQL", True):
+            self.analyzer.metadata_fetcher = RepoMetadataFetcher(GraphQLTransport(self.session),
+                                                                 self.config.get("GRAPHQL_BATCH_SIZE", 20))
         self.theme = load_theme_config()
         self.visualizer = GithubVisualizer(self.username, self.reports_dir, self.theme)
 
@@ -98,6 +108,15 @@ class GithubLens:
         """
         try:
             self.github = Github(token)
+
+            # Extra tokens spread the analysis over several rate limit buckets
+            extra_tokens = self.config.get("GITHUB_EXTRA_TOKENS", [])
+            if extra_tokens:
+                self.token_pool = TokenPool([token] + list(extra_tokens),
+                                            reserve=self.config["CHECKPOINT_THRESHOLD"],
+                                            pacing=self.config.get("RATE_LIMIT_PACING", True),
+                                            base_url=self.github.requester.base_url)
+                logger.info(f"Using a pool of {len(self.token_pool)} GitHub tokens")
         except Exception as e:
             logger.error(f"Error setting up GitHub client: {e}")
             raise
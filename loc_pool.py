@@ -0,0 +1,117 @@
+"""
+LOC Process Pool for GitHub Repository RunnerAnalyzer
+
+This module moves the CPU-bound part of file analysis (line counting and path
+classification) into worker processes, so it no longer competes for the GIL
+with the threads fetching content from GitHub. File contents are sent to the
+workers in batches and only small (language, loc, flags) tuples come back.
+
+Key components:
+- LocProcessPool: Long-lived process pool shared by every repository analysis
+- LocBatch: Per-repository queue that batches files and applies results in order
+"""
+
+import collections
+import concurrent.futures
+from typing import Any, Callable, List, Optional, Tuple
+
+from console import logger
+
+# (path, content to count or None) sent to a worker, (language, loc or None, flags) returned
+BatchEntry = Tuple[str, Optional[bytes]]
+BatchResult = Tuple[str, Optional[int], int]
+
+
+class LocProcessPool:
+    """
+    Process pool counting lines of code away from the network threads.
+
+    Worker processes are started on the first submitted batch and reused for
+    every repository until ``shutdown``.
+    """
+
+    # A batch is sent once it holds this many files or bytes
+    BATCH_FILES = 256
+    BATCH_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, workers: int, worker_function: Callable[[List[BatchEntry]], List[BatchResult]]):
+        """
+        Args:
+            workers: Number of worker processes
+            worker_function: Module-level function analyzing one batch in a worker
+        """
+        self.workers = workers
+        self.worker_function = worker_function
+        # Batches queued per repository before the oldest result is waited for
+        self.max_in_flight = workers * 2
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def batch(self, apply: Callable[..., None]) -> 'LocBatch':
+        """
+        Start batching the files of one repository.
+
+        Args:
+            apply: Called as ``apply(item, language, loc, flags)`` for every file, in submission order
+        """
+        return LocBatch(self, apply)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class LocBatch:
+    """Files of one repository waiting for, or being analyzed by, the process pool"""
+
+    def __init__(self, pool: LocProcessPool, apply: Callable[..., None]):
+        self.pool = pool
+        self.apply = apply
+        self._items: List[Any] = []
+        self._entries: List[BatchEntry] = []
+        self._bytes = 0
+        self._in_flight = collections.deque()
+
+    def add(self, item: Any, path: str, content: Optional[bytes]) -> None:
+        """Queue a file; ``item`` is handed back to ``apply`` with the file's result"""
+        self._items.append(item)
+        self._entries.append((path, content))
+        self._bytes += len(content) if content else 0
+
+        if len(self._entries) >= self.pool.BATCH_FILES or self._bytes >= self.pool.BATCH_BYTES:
+            self._submit()
+
+    def drain(self) -> None:
+        """Send the last partial batch and apply every outstanding result"""
+        if self._entries:
+            self._submit()
+        while self._in_flight:
+            self._apply_oldest()
+
+    def _submit(self) -> None:
+        """Send the queued files to a worker, waiting on older batches if too many are queued"""
+        future = self.pool.executor.submit(self.pool.worker_function, self._entries)
+        self._in_flight.append((self._items, self._entries, future))
+        self._items, self._entries, self._bytes = [], [], 0
+
+        while len(self._in_flight) > self.pool.max_in_flight:
+            self._apply_oldest()
+
+    def _apply_oldest(self) -> None:
+        """Apply the results of the oldest batch, counting it here if its worker failed"""
+        items, entries, future = self._in_flight.popleft()
+        try:
+            results = future.result()
+        except Exception as e:
+            logger.warning(f"LOC worker process failed, counting {len(entries)} files in-process: {e}")
+            results = self.pool.worker_function(entries)
+
+        for item, result in zip(items, results):
+            self.apply(item, *result)
@@ -0,0 +1,272 @@
+"""
+Local Repository Access for GitHub Repository RunnerAnalyzer
+
+This module provides clone-based access to repository files so analysis can
+read file contents from disk instead of requesting every file from the GitHub
+API. Repositories are shallow-cloned into the configured CLONE_DIR, or read
+directly from an existing bare mirror placed there.
+
+Key components:
+- RepoCloner: Creates/updates local copies of repositories and lists their files
+- LocalRepoFile: File entry whose content is read from the local copy
+- GitObjectReader: Persistent `git cat-file --batch` reader for bare mirrors
+"""
+
+import base64
+import contextlib
+import mmap
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from console import logger
+from path_classifier import PathInfo
+
+
+class GitError(Exception):
+    """Raised when a git command fails"""
+
+
+def run_git(args: List[str], cwd: Optional[Path] = None, extra_config: Optional[List[str]] = None) -> bytes:
+    """
+    Run a git command and return its standard output.
+
+    Args:
+        args: Git arguments (without the leading ``git``)
+        cwd: Working directory for the command
+        extra_config: Additional ``-c key=value`` settings for this invocation only
+
+    Returns:
+        Raw standard output of the command
+
+    Raises:
+        GitError: If git is not installed or the command fails
+    """
+    command = ["git"]
+    for setting in extra_config or []:
+        command.extend(["-c", setting])
+    command.extend(args)
+
+    try:
+        result = subprocess.run(command, cwd=cwd, capture_output=True, check=False)
+    except FileNotFoundError as e:
+        raise GitError("git executable not found") from e
+
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', errors='ignore').strip()
+        raise GitError(f"git {args[0]} failed: {message}")
+
+    return result.stdout
+
+
+class GitObjectReader:
+    """
+    Read blobs from a git repository through one long-lived ``git cat-file --batch`` process.
+
+    Used for bare mirrors, where there is no working tree to read files from.
+    """
+
+    def __init__(self, git_dir: Path):
+        self.git_dir = git_dir
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def read(self, sha: str) -> bytes:
+        """Return the raw content of a blob"""
+        with self._lock:
+            size = self._request(sha)
+            content = self._process.stdout.read(size)
+            self._process.stdout.read(1)  # Trailing newline after each object
+            return content
+
+    def iter_read(self, sha: str, chunk_size: int) -> Iterator[bytes]:
+        """Yield the raw content of a blob in chunks; other reads wait until it is consumed"""
+        with self._lock:
+            remaining = self._request(sha)
+            try:
+                while remaining:
+                    chunk = self._process.stdout.read(min(chunk_size, remaining))
+                    remaining -= len(chunk)
+                    yield chunk
+            finally:
+                # Skip what the caller didn't consume so the next object starts cleanly
+                while remaining:
+                    remaining -= len(self._process.stdout.read(min(chunk_size, remaining)))
+                self._process.stdout.read(1)  # Trailing newline after each object
+
+    def _request(self, sha: str) -> int:
+        """Ask the cat-file process for a blob and return its size (the lock must be held)"""
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "--git-dir", str(self.git_dir), "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+
+        self._process.stdin.write(f"{sha}\n".encode())
+        self._process.stdin.flush()
+
+        header = self._process.stdout.readline().decode().split()
+        if len(header) < 3 or header[1] == "missing":
+            raise GitError(f"Object {sha} not found in {self.git_dir}")
+        return int(header[2])
+
+    def close(self) -> None:
+        """Stop the cat-file process"""
+        with self._lock:
+            if self._process is not None:
+                self._process.stdin.close()
+                self._process.wait()
+                self._process = None
+
+
+class LocalRepoFile:
+    """
+    A file entry from a local clone or mirror.
+
+    Exposes the ``path``, ``size``, ``sha`` and ``decoded_content`` attributes
+    used by the file analysis pipeline, reading content from disk on demand.
+    """
+
+    type = "file"
+
+    def __init__(self, root: Path, path: str, sha: str, size: Optional[int], mode: str = "100644",
+                 reader: Optional[GitObjectReader] = None):
+        self.root = root
+        self.path = path
+        self.path_info = PathInfo(path)
+        self.sha = sha
+        self.size = size or 0
+        self.mode = mode
+        self.reader = reader
+
+    @property
+    def local_path(self) -> Path:
+        """Location of the file in the working tree"""
+        return self.root / self.path
+
+    @property
+    def decoded_content(self) -> bytes:
+        """Read the file content from the working tree or the object database"""
+        if self.reader is not None:
+            return self.reader.read(self.sha)
+
+        # Symlinks are stored in git as a blob holding the link target
+        if self.mode == "120000":
+            return os.readlink(self.local_path).encode()
+
+        return self.local_path.read_bytes()
+
+    @property
+    def is_mappable(self) -> bool:
+        """Whether the content is a regular file in the working tree that can be memory-mapped"""
+        return self.reader is None and self.mode != "120000"
+
+    @contextlib.contextmanager
+    def open_buffer(self) -> Iterator:
+        """
+        Map the working tree file read-only into memory.
+
+        Yields an ``mmap`` supporting ``find`` and slicing like ``bytes``
+        (or ``b''`` for an empty file, which can't be mapped).
+        """
+        with open(self.local_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Yield the file content in chunks without reading all of it"""
+        if self.reader is not None:
+            yield from self.reader.iter_read(self.sha, chunk_size)
+        elif self.mode == "120000":
+            yield self.decoded_content
+        else:
+            with open(self.local_path, 'rb') as file:
+                yield from iter(lambda: file.read(chunk_size), b'')
+
+    def __repr__(self) -> str:
+        return f'LocalRepoFile(path="{self.path}", sha="{self.sha}")'
+
+
+class RepoCloner:
+    """
+    Maintain local copies of repositories under the clone directory.
+
+    A bare mirror at ``<clone_dir>/<owner>/<name>.git`` is read as-is. Otherwise
+    the default branch is shallow-cloned to ``<clone_dir>/<owner>/<name>`` and
+    refreshed with a shallow fetch on later runs.
+    """
+
+    def __init__(self, clone_dir: Path, token: Optional[str] = None):
+        self.clone_dir = Path(clone_dir)
+        self.token = token
+
+    def _auth_config(self, url: str) -> List[str]:
+        """Build a per-command auth header so the token is never written to the clone's config"""
+        if not self.token or not url.startswith("https://"):
+            return []
+        credentials = base64.b64encode(f"x-access-token:{self.token}".encode()).decode()
+        return [f"http.extraHeader=Authorization: Basic {credentials}"]
+
+    def mirror_path(self, repo) -> Path:
+        """Location of an optional bare mirror for the repository"""
+        return self.clone_dir / f"{repo.full_name}.git"
+
+    def worktree_path(self, repo) -> Path:
+        """Location of the shallow working-tree clone for the repository"""
+        return self.clone_dir / repo.full_name
+
+    def prepare(self, repo) -> Tuple[Path, bool]:
+        """
+        Make sure a local copy of the repository's default branch exists.
+
+        Args:
+            repo: Repository object (needs ``full_name``, ``clone_url`` and ``default_branch``)
+
+        Returns:
+            Tuple of (path to the local copy, whether it is a bare mirror)
+        """
+        mirror = self.mirror_path(repo)
+        if mirror.is_dir():
+            logger.debug(f"Using local mirror for {repo.full_name}: {mirror}")
+            return mirror, True
+
+        worktree = self.worktree_path(repo)
+        auth = self._auth_config(repo.clone_url)
+
+        if (worktree / ".git").exists():
+            logger.debug(f"Refreshing clone of {repo.full_name}")
+            run_git(["fetch", "--depth", "1", "origin", repo.default_branch], cwd=worktree, extra_config=auth)
+            run_git(["reset", "--hard", "--quiet", "FETCH_HEAD"], cwd=worktree)
+        else:
+            logger.debug(f"Cloning {repo.full_name} into {worktree}")
+            worktree.parent.mkdir(parents=True, exist_ok=True)
+            run_git(["clone", "--quiet", "--depth", "1", "--single-branch", "--branch", repo.default_branch,
+                     repo.clone_url, str(worktree)], extra_config=auth)
+
+        return worktree, False
+
+    @staticmethod
+    def list_entries(path: Path, is_mirror: bool) -> List[Tuple[str, str, str, Optional[int], str]]:
+        """
+        List every tree and blob at HEAD of a local copy.
+
+        Returns:
+            List of (path, type, sha, size, mode) tuples in git tree order
+        """
+        git_dir_args = ["--git-dir", str(path)] if is_mirror else ["-C", str(path)]
+        output = run_git(git_dir_args + ["ls-tree", "-r", "-t", "-l", "-z", "HEAD"])
+
+        entries = []
+        for record in output.split(b"\0"):
+            if not record:
+                continue
+            meta, _, name = record.partition(b"\t")
+            mode, entry_type, sha, size = meta.decode().split()
+            entries.append((name.decode('utf-8', errors='replace'), entry_type, sha,
+                            int(size) if size.isdigit() else None, mode))
+        return entries
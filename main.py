@@ -28,7 +28,7 @@ from github.GithubException import GithubException, RateLimitExceededException
 from rich.prompt import Prompt, Confirm
 import requests
 
-from config import DEFAULT_CONFIG, create_sample_config, create_sample_env, shutdown_logging
+from config import DEFAULT_CONFIG, create_sample_config, create_sample_env, shutdown_logging, extra_tokens_from_env
 from console import console, logger, print_header, print_info, print_warning, print_error, print_success, \
     configure_logging
 from lens import GithubLens
@@ -145,7 +145,7 @@ class EnvironmentManager:
                 print_info(f"  {key} = {os.environ[key]}")
 
         # Show if sensitive tokens exist but not their values
-        for key in ["GITHUB_TOKEN", "VERCEL_TOKEN"]:
+        for key in ["GITHUB_TOKEN", "GITHUB_EXTRA_TOKENS", "VERCEL_TOKEN"]:
             if key in os.environ:
                 print_info(f"  {key} = [HIDDEN]")
 
@@ -257,6 +257,7 @@ class QuickTestConfig:
         config = DEFAULT_CONFIG.copy()
         config.update({
             "GITHUB_TOKEN": github_token,
+            "GITHUB_EXTRA_TOKENS": extra_tokens_from_env(),
             "USERNAME": github_username,
             "VISIBILITY": visibility,
             "INCLUDE_ORGS": cls.DEFAULT_ORGS,
@@ -8,6 +8,7 @@ type-hinted data model with proper composition for analyzing GitHub repositories
 
 Key components:
 - BaseRepoInfo: Basic repository metadata
+- DirectoryStats: Per-directory rollups of files, LOC and languages as a prefix tree
 - CodeStats: Code statistics and language information
 - QualityIndicators: Code quality metrics
 - ActivityMetrics: Repository activity data
@@ -15,11 +16,17 @@ Key components:
 - AnalysisScores: Calculated scores and anomaly detection
 - RepoStats: Comprehensive repository statistics (composition of above classes)
 - MediaMetrics: Media file metrics for a repository
+- to_record / from_record: JSON-safe form of the data classes, e.g. for checkpoint logs
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin, \
+    get_type_hints
+
+from config import MONOREPO_CONTAINER_DIRECTORIES
+from language_engine import language_engine
 
 
 @dataclass
@@ -42,6 +49,70 @@ class BaseRepoInfo:
     homepage: Optional[str] = None
 
 
+@dataclass
+class DirectoryStats:
+    """
+    Totals of a directory and everything below it.
+
+    Subdirectories are kept in ``children`` by name, so the root of a
+    repository holds its whole directory structure as a prefix tree. Each
+    node's totals include those of its children.
+    """
+    depth: int = 0  # 0 for the repository root
+    files: int = 0
+    loc: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+    max_depth: int = 0  # Depth of the deepest directory below, counted from the repository root
+    children: Dict[str, 'DirectoryStats'] = field(default_factory=dict)
+
+    @property
+    def primary_language(self) -> Optional[str]:
+        """Language with the most lines of code in this directory, or None without counted code"""
+        if not self.languages:
+            return None
+        return max(self.languages.items(), key=lambda x: x[1])[0]
+
+    def find(self, path: str) -> Optional['DirectoryStats']:
+        """The node of a directory below this one, by its '/' separated path"""
+        node = self
+        for name in path.split('/') if path else []:
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def walk(self, path: str = '') -> Iterator[Tuple[str, 'DirectoryStats']]:
+        """Every directory from this one down, as (path, node) pairs, parents before children"""
+        stack = [(path, self)]
+        while stack:
+            path, node = stack.pop()
+            yield path, node
+            stack.extend((f"{path}/{name}" if path else name, child) for name, child in node.children.items())
+
+    def project_root(self) -> Tuple[str, 'DirectoryStats']:
+        """
+        The directory a project really starts in, skipping folders that only wrap it.
+
+        A repository holding nothing but ``MyGame/`` has its project in
+        ``MyGame``; one with files of its own starts at the root.
+        """
+        path, node = '', self
+        while len(node.children) == 1:
+            name, child = next(iter(node.children.items()))
+            if child.files != node.files:
+                break
+            path, node = (f"{path}/{name}" if path else name), child
+        return path, node
+
+    def top_directories(self, limit: int) -> List[Tuple[str, 'DirectoryStats']]:
+        """Direct subdirectories with the most files"""
+        return sorted(self.children.items(), key=lambda x: x[1].files, reverse=True)[:limit]
+
+    def project_structure(self) -> Dict[str, int]:
+        """File counts of the directories directly inside the project root"""
+        return {name: child.files for name, child in self.project_root()[1].children.items()}
+
+
 @dataclass
 class CodeStats:
     """
@@ -59,6 +130,7 @@ class CodeStats:
     excluded_file_count: int = 0
     primary_language: Optional[str] = None
     project_structure: Dict[str, int] = field(default_factory=dict)
+    directory_tree: Optional[DirectoryStats] = None  # Rollups of every directory, from the repository root
     is_monorepo: bool = False
     
     # Game repository information
@@ -83,7 +155,7 @@ class CodeStats:
         # Filter out non-programming languages if there are actual programming languages
         programming_languages = {
             lang: loc for lang, loc in self.languages.items()
-            if lang not in ('Other', 'Text', 'Markdown', 'JSON', 'YAML', 'TOML', 'INI')
+            if language_engine.is_programming_language(lang)
         }
 
         # If we have programming languages, use those for determining primary language
@@ -97,28 +169,49 @@ class CodeStats:
 
     def detect_monorepo(self) -> None:
         """
-        Detect if this is likely a monorepo based on language distribution.
+        Detect if this is likely a monorepo based on language distribution and layout.
         
         Sets is_monorepo to True if the repository has at least 3 languages
-        with each having a significant share (>10%) of the codebase.
+        with each having a significant share (>10%) of the codebase, or at
+        least 2 subprojects with such a share side by side in a container
+        directory like ``packages/`` or ``apps/``.
         """
-        if len(self.languages) >= 3:
-            # Ensure total_loc is calculated correctly
-            total_loc = self.total_loc
-            if total_loc == 0:
-                # Recalculate if needed
-                total_loc = sum(self.languages.values())
-                self.total_loc = total_loc
+        if self._has_major_languages() or self._has_subprojects():
+            self.is_monorepo = True
 
-            if total_loc == 0:
-                return
+    def _has_major_languages(self) -> bool:
+        """Whether at least 3 languages each hold a significant share (>10%) of the code"""
+        if len(self.languages) < 3:
+            return False
 
-            sorted_langs = sorted(self.languages.items(), key=lambda x: x[1], reverse=True)
+        # Ensure total_loc is calculated correctly
+        total_loc = self.total_loc
+        if total_loc == 0:
+            # Recalculate if needed
+            total_loc = sum(self.languages.values())
+            self.total_loc = total_loc
 
-            # If at least 3 languages with significant share (>10%)
-            significant_langs = [lang for lang, loc in sorted_langs if (loc / total_loc) > 0.1]
-            if len(significant_langs) >= 3:
-                self.is_monorepo = True
+        if total_loc == 0:
+            return False
+
+        sorted_langs = sorted(self.languages.items(), key=lambda x: x[1], reverse=True)
+
+        # If at least 3 languages with significant share (>10%)
+        significant_langs = [lang for lang, loc in sorted_langs if (loc / total_loc) > 0.1]
+        return len(significant_langs) >= 3
+
+    def _has_subprojects(self) -> bool:
+        """Whether at least 2 directories of a subproject container hold a significant share (>10%) of the code"""
+        if self.directory_tree is None or self.directory_tree.loc == 0:
+            return False
+
+        threshold = self.directory_tree.loc * 0.1
+        for name, container in self.directory_tree.project_root()[1].children.items():
+            if name.lower() in MONOREPO_CONTAINER_DIRECTORIES:
+                subprojects = [child for child in container.children.values() if child.loc > threshold]
+                if len(subprojects) >= 2:
+                    return True
+        return False
 
 
 @dataclass
@@ -553,6 +646,11 @@ class RepoStats:
         """Dictionary representing the project directory structure."""
         return self.code_stats.project_structure
 
+    @property
+    def directory_tree(self) -> Optional[DirectoryStats]:
+        """Per-directory rollups of the repository, or None when they weren't gathered."""
+        return self.code_stats.directory_tree
+
     @property
     def has_packages(self) -> bool:
         """Whether the repository has package management."""
@@ -664,4 +762,73 @@ class RepoStats:
         """
         self.code_stats.detect_monorepo()
         if self.code_stats.is_monorepo:
-            self.add_anomaly("Possible monorepo detected with multiple major languages")
+            self.add_anomaly("Possible monorepo detected with multiple major languages or subprojects")
+
+
+T = TypeVar('T')
+
+
+def to_record(value: Any) -> Any:
+    """
+    JSON-safe form of a data class: nested data classes become dicts and datetimes ISO strings.
+
+    Args:
+        value: A data class such as RepoStats, or any value one holds
+
+    Returns:
+        Value that ``json.dumps`` accepts and ``from_record`` turns back into the data class
+    """
+    if is_dataclass(value):
+        return {item.name: to_record(getattr(value, item.name)) for item in fields(value)}
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: to_record(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_record(item) for item in value]
+    return value
+
+
+def from_record(cls: Type[T], record: Dict[str, Any]) -> T:
+    """
+    Rebuild a data class from its ``to_record`` form.
+
+    Fields missing from the record, e.g. ones added since it was written, keep their defaults.
+    """
+    return _record_decoder(cls)(record)
+
+
+def _plain(value: Any) -> Any:
+    return value
+
+
+@lru_cache(maxsize=None)
+def _record_decoder(hint: Any) -> Callable[[Any], Any]:
+    """Function rebuilding values of an annotated type from their record form, built once per type"""
+    origin = get_origin(hint)
+    if origin is Union:
+        inner = _record_decoder(next(arg for arg in get_args(hint) if arg is not type(None)))
+        return lambda value: None if value is None else inner(value)
+
+    if is_dataclass(hint):
+        # Resolved on first use, so data classes that nest themselves (DirectoryStats) find their own decoder
+        field_decoders: List[Tuple[str, Callable[[Any], Any]]] = []
+
+        def decode(record: Dict[str, Any]) -> Any:
+            nonlocal field_decoders
+            if not field_decoders:
+                hints = get_type_hints(hint)
+                field_decoders = [(item.name, _record_decoder(hints[item.name])) for item in fields(hint)]
+            return hint(**{name: decode_field(record[name]) for name, decode_field in field_decoders
+                           if name in record})
+        return decode
+
+    if hint is datetime:
+        return lambda value: None if value is None else datetime.fromisoformat(value)
+    if origin is dict:
+        inner = _record_decoder(get_args(hint)[1])
+        return dict if inner is _plain else lambda value: {key: inner(item) for key, item in value.items()}
+    if origin is list:
+        inner = _record_decoder(get_args(hint)[0])
+        return list if inner is _plain else lambda value: [inner(item) for item in value]
+    return _plain
@@ -0,0 +1,315 @@
+"""
+Notebook Scanner for GitHub Repository RunnerAnalyzer
+
+This module counts the code lines of a Jupyter notebook without building its
+JSON object graph. Notebooks in data science repositories are mostly cell
+outputs (base64 images, HTML tables); ``json.loads`` would allocate all of it
+just to read a few code cells. The scanner walks the JSON text instead,
+validating every value the way ``json.loads`` does, but skips outputs and
+metadata with regular expressions and only decodes ``cell_type`` and the
+``source`` of code cells.
+
+The scanner is not an incremental parser: it walks the notebook's whole
+text held as one ``str``, so memory still peaks at the size of that text
+(streamed notebooks are joined before counting). What it saves is the
+object graph ``json.loads`` would build on top of it, several times larger
+for output-heavy notebooks. The ``json.loads`` fallback needs the whole
+text too, and the scanner must agree with it on every notebook.
+
+Key components:
+- NotebookScanner: Counts code lines of well-formed notebooks
+- count_notebook_source: Code line rules for one cell's source
+"""
+
+import json
+import re
+from json.decoder import scanstring
+from typing import List, Optional, Union
+
+# JSON whitespace (json.loads accepts no other)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# A JSON string as json.loads accepts it (strict: no raw control characters)
+_STRING = re.compile(r'"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"')
+# Characters no JSON string may hold unescaped
+_CONTROL = re.compile(r'[\x00-\x1f]')
+_CONTROL_BYTES = bytes(range(0x20))
+# Long strings without escapes are checked for control characters in pieces of this size
+_CHECK_SIZE = 64 * 1024
+# A JSON number; json.loads only takes ASCII digits
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?')
+# Constants json.loads accepts besides numbers
+_LITERALS = ('null', 'true', 'false', 'NaN', 'Infinity', '-Infinity')
+
+# Runs of short scalars are skipped by one match each: whole containers
+# holding nothing else, and the scalar items or members before a nested
+# container. Longer strings and numbers end a run and are skipped one by one.
+_WS = r'[ \t\n\r]*'
+_SHORT_STRING = r'"[^"\\\x00-\x1f]{0,256}(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]{0,256}){0,16}"'
+_SHORT_SCALAR = (rf'(?:{_SHORT_STRING}|-?(?:0|[1-9][0-9]{{0,99}})(?:\.[0-9]{{1,100}})?(?:[eE][-+]?[0-9]{{1,100}})?'
+                 r'|null|true|false|NaN|Infinity|-Infinity)')
+_SHORT_MEMBER = rf'{_SHORT_STRING}{_WS}:{_WS}{_SHORT_SCALAR}'
+_FLAT_CONTAINER = {
+    '[': re.compile(rf'\[{_WS}(?:{_SHORT_SCALAR}(?:{_WS},{_WS}{_SHORT_SCALAR})*{_WS})?\]'),
+    '{': re.compile(rf'\{{{_WS}(?:{_SHORT_MEMBER}(?:{_WS},{_WS}{_SHORT_MEMBER})*{_WS})?\}}'),
+}
+_ITEM_RUN = {
+    ']': re.compile(rf'(?:{_SHORT_SCALAR}{_WS},{_WS})*'),
+    '}': re.compile(rf'(?:{_SHORT_MEMBER}{_WS},{_WS})*'),
+}
+
+# Beyond this nesting json.loads may hit the recursion limit, and beyond this
+# many digits int() refuses a number, so such notebooks take the json.loads path
+_MAX_DEPTH = 500
+_MAX_NUMBER_LENGTH = 4000
+
+
+class _Unsupported(Exception):
+    """Invalid JSON, or a notebook shaped unlike the nbformat schema"""
+
+
+def count_notebook_source(source: Union[str, List[str]]) -> int:
+    """
+    Count non-blank lines not starting with '#' in a cell's source.
+
+    Args:
+        source: A single string, or a list of lines as nbformat stores them
+
+    Returns:
+        Number of code lines
+    """
+    # The 'source' can be a list of strings or a single string
+    if isinstance(source, str):
+        lines = source.splitlines()
+    else:
+        # Flatten and remove trailing newlines
+        lines = [line.rstrip('\n') for line in source]
+
+    actual_loc = 0
+    for line in lines:
+        stripped_line = line.strip()
+        if stripped_line and not stripped_line.startswith('#'):
+            actual_loc += 1
+    return actual_loc
+
+
+class NotebookScanner:
+    """
+    Count the code lines of a notebook from its JSON text.
+
+    ``count`` returns None whenever its result could differ from counting the
+    ``json.loads`` result: invalid JSON, duplicate keys that matter, or cells,
+    sources and the top level not shaped like nbformat's. Callers then fall
+    back to ``json.loads``.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+
+    def count(self, text: str) -> Optional[int]:
+        """
+        Count code lines of a notebook.
+
+        Args:
+            text: The notebook's whole JSON text, already decoded
+
+        Returns:
+            Number of code lines, or None when the notebook needs ``json.loads``
+        """
+        try:
+            pos = self._skip_whitespace(text, 0)
+            if text[pos:pos + 1] != '{':
+                raise _Unsupported()
+
+            totals = {'loc': 0, 'has_cells': False}
+
+            def on_member(key: str, value_pos: int) -> int:
+                if key != 'cells':
+                    return self._skip_value(text, value_pos)
+                if totals['has_cells'] or text[value_pos:value_pos + 1] != '[':
+                    raise _Unsupported()
+                totals['has_cells'] = True
+                return self._walk_array(text, value_pos, lambda cell_pos: self._count_cell(text, cell_pos, totals))
+
+            pos = self._skip_whitespace(text, self._walk_object(text, pos, on_member))
+            if pos != len(text):
+                raise _Unsupported()
+            return totals['loc']
+        except (_Unsupported, ValueError, RecursionError):
+            return None
+
+    def _count_cell(self, text: str, pos: int, totals: dict) -> int:
+        """Add one cell's code lines to the totals, returning the position after the cell"""
+        if text[pos:pos + 1] != '{':
+            raise _Unsupported()
+
+        cell = {}
+
+        def on_member(key: str, value_pos: int) -> int:
+            if key not in ('cell_type', 'source'):
+                return self._skip_value(text, value_pos)
+            if key in cell:
+                raise _Unsupported()
+
+            if key == 'cell_type' and text[value_pos:value_pos + 1] == '"':
+                cell[key], end = scanstring(text, value_pos + 1)
+                return end
+
+            # Sources are decoded only once the cell turns out to be code
+            end = self._skip_value(text, value_pos)
+            cell[key] = value_pos
+            return end
+
+        end = self._walk_object(text, pos, on_member)
+
+        if cell.get('cell_type') == 'code' and 'source' in cell:
+            source = self._decoder.raw_decode(text, cell['source'])[0]
+            if not (isinstance(source, str) or
+                    isinstance(source, list) and all(isinstance(line, str) for line in source)):
+                raise _Unsupported()
+            totals['loc'] += count_notebook_source(source)
+
+        return end
+
+    @staticmethod
+    def _skip_whitespace(text: str, pos: int) -> int:
+        return _WHITESPACE.match(text, pos).end()
+
+    def _walk_object(self, text: str, pos: int, on_member) -> int:
+        """
+        Walk the members of the object starting at ``pos``.
+
+        ``on_member(key, value_pos)`` handles each value and returns the
+        position after it. Returns the position after the closing brace.
+        """
+        pos = self._skip_whitespace(text, pos + 1)
+        if text[pos:pos + 1] == '}':
+            return pos + 1
+
+        while True:
+            if text[pos:pos + 1] != '"':
+                raise _Unsupported()
+            key, pos = scanstring(text, pos + 1)
+            pos = self._skip_whitespace(text, pos)
+            if text[pos:pos + 1] != ':':
+                raise _Unsupported()
+
+            pos = self._skip_whitespace(text, on_member(key, self._skip_whitespace(text, pos + 1)))
+            char = text[pos:pos + 1]
+            if char == '}':
+                return pos + 1
+            if char != ',':
+                raise _Unsupported()
+            pos = self._skip_whitespace(text, pos + 1)
+
+    def _walk_array(self, text: str, pos: int, on_item) -> int:
+        """Walk the items of the array starting at ``pos``, like ``_walk_object``"""
+        pos = self._skip_whitespace(text, pos + 1)
+        if text[pos:pos + 1] == ']':
+            return pos + 1
+
+        while True:
+            pos = self._skip_whitespace(text, on_item(pos))
+            char = text[pos:pos + 1]
+            if char == ']':
+                return pos + 1
+            if char != ',':
+                raise _Unsupported()
+            pos = self._skip_whitespace(text, pos + 1)
+
+    def _skip_value(self, text: str, pos: int) -> int:
+        """
+        Validate the value starting at ``pos`` without building it.
+
+        Nested containers are tracked on an explicit stack, so deep outputs
+        cost no recursion. Returns the position after the value.
+        """
+        closers = []
+        while True:
+            char = text[pos:pos + 1]
+            if char == '"':
+                pos = self._skip_string(text, pos)
+            elif char == '{' or char == '[':
+                match = _FLAT_CONTAINER[char].match(text, pos)
+                if match is not None:
+                    pos = match.end()
+                else:
+                    # Not empty, or the flat pattern would have matched
+                    closers.append('}' if char == '{' else ']')
+                    if len(closers) > _MAX_DEPTH:
+                        raise _Unsupported()
+                    pos = self._next_item(text, self._skip_whitespace(text, pos + 1), closers[-1])
+                    continue
+            else:
+                pos = self._skip_scalar(text, pos)
+
+            # Close finished containers, or move on to the next item
+            while closers:
+                pos = self._skip_whitespace(text, pos)
+                char = text[pos:pos + 1]
+                if char == closers[-1]:
+                    closers.pop()
+                    pos += 1
+                elif char == ',':
+                    pos = self._next_item(text, self._skip_whitespace(text, pos + 1), closers[-1])
+                    break
+                else:
+                    raise _Unsupported()
+            else:
+                return pos
+
+    def _next_item(self, text: str, pos: int, closer: str) -> int:
+        """Skip the run of short items from ``pos`` in a container, returning the position of the next value"""
+        pos = _ITEM_RUN[closer].match(text, pos).end()
+        return self._skip_key(text, pos) if closer == '}' else pos
+
+    def _skip_key(self, text: str, pos: int) -> int:
+        """Skip an object key and its colon, returning the position of the value"""
+        if text[pos:pos + 1] != '"':
+            raise _Unsupported()
+        pos = self._skip_whitespace(text, self._skip_string(text, pos))
+        if text[pos:pos + 1] != ':':
+            raise _Unsupported()
+        return self._skip_whitespace(text, pos + 1)
+
+    @staticmethod
+    def _skip_string(text: str, pos: int) -> int:
+        """
+        Validate the string starting at ``pos``, returning the position after it.
+
+        Outputs are mostly long base64 or text runs without escapes: these end
+        at the next quote, found with ``str.find``, and only need checking for
+        control characters, done on ASCII pieces with ``bytes.translate``.
+        Strings holding escapes are matched against the full grammar.
+        """
+        end = text.find('"', pos + 1)
+        if end == -1:
+            raise _Unsupported()
+        if text.find('\\', pos + 1, end) != -1:
+            match = _STRING.match(text, pos)
+            if match is None:
+                raise _Unsupported()
+            return match.end()
+
+        for start in range(pos + 1, end, _CHECK_SIZE):
+            piece = text[start:min(start + _CHECK_SIZE, end)]
+            if piece.isascii():
+                data = piece.encode('ascii')
+                if len(data.translate(None, _CONTROL_BYTES)) != len(data):
+                    raise _Unsupported()
+            elif _CONTROL.search(piece):
+                raise _Unsupported()
+        return end + 1
+
+    @staticmethod
+    def _skip_scalar(text: str, pos: int) -> int:
+        """Skip a number or literal, returning the position after it"""
+        match = _NUMBER.match(text, pos)
+        if match is not None:
+            if match.end() - pos > _MAX_NUMBER_LENGTH:
+                raise _Unsupported()
+            return match.end()
+
+        for literal in _LITERALS:
+            if text.startswith(literal, pos):
+                return pos + len(literal)
+        raise _Unsupported()
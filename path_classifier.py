@@ -0,0 +1,203 @@
+"""
+Path Classifier for GitHub Repository RunnerAnalyzer
+
+This module classifies file paths (docs, tests, CI/CD, config, packages,
+deployment, releases, binary) in a single pass instead of one ``is_*_file``
+check per category. Every path fragment from the ``config.py`` tables is
+compiled once into one trie-shaped regular expression, and exact file names
+and extensions into dictionaries. A whole tree listing can be classified with
+one scan over the joined paths.
+
+Name parts of a path (lowercased path, name, extension) are split once per
+file into a PathInfo record, which the analysis pipeline passes along instead
+of building a ``pathlib.Path`` in every check.
+
+Key components:
+- PathInfo: Name parts of one repository path
+- PathClassifier: Compiled classifier returning FILE_* bitmasks
+- path_classifier: Shared instance built from the configured tables
+"""
+
+import bisect
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Union
+
+from config import BINARY_EXTENSIONS, CONFIG_FILES, SPECIAL_FILENAMES, PACKAGE_FILES, DEPLOYMENT_FILES, \
+    RELEASE_FILES, MEDIA_FILE_EXTENSIONS, TEST_PATH_PATTERNS, RELEASE_PATH_PATTERNS, CICD_PATH_PATTERNS, \
+    CICD_FILENAMES, CICD_FILE_TYPES, CONFIG_FILE_TYPES, PACKAGE_FILE_TYPES, DEPLOYMENT_FILE_TYPES
+
+# Classification flags of a file path, combined into one integer
+FILE_DOCS = 1 << 0
+FILE_TEST = 1 << 1
+FILE_CICD = 1 << 2
+FILE_CONFIG = 1 << 3
+FILE_PACKAGE = 1 << 4
+FILE_DEPLOYMENT = 1 << 5
+FILE_RELEASE = 1 << 6
+FILE_BINARY = 1 << 7
+
+# Paths are scanned between NUL separators (git paths never contain NUL), so
+# fragments can be anchored at the start or end of a path
+_EDGE = '\0'
+
+
+def _suffix(name: str) -> str:
+    """Extension of a file name, as ``PurePath.suffix`` computes it"""
+    index = name.rfind('.')
+    return name[index:] if 0 < index < len(name) - 1 else ''
+
+
+def _trie_pattern(node: Dict) -> str:
+    """
+    Regular expression matching the longest fragment of a trie at a position.
+
+    Children are keyed by character; the '' key marks the end of a fragment.
+    """
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f"(?:{body})?" if '' in node else body
+
+
+class PathInfo:
+    """
+    Name parts of a repository path, split once per file.
+
+    Matches what ``pathlib.Path`` gives for git paths ('/' separated, no
+    trailing slash): ``name`` is ``Path.name`` and ``extension`` is
+    ``Path.suffix.lower()``.
+    """
+
+    __slots__ = ('path', 'lower_path', 'name', 'lower_name', 'extension')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lower_path = path.lower()
+        self.name = path.rpartition('/')[2]
+        self.lower_name = self.name.lower()
+        self.extension = _suffix(self.lower_name)
+
+    def __repr__(self) -> str:
+        return f'PathInfo(path="{self.path}")'
+
+
+def as_path_info(file_path: Union[str, PathInfo]) -> PathInfo:
+    """The PathInfo of a path, reusing it when one is passed"""
+    return file_path if isinstance(file_path, PathInfo) else PathInfo(file_path)
+
+
+class PathClassifier:
+    """
+    Classify paths into FILE_* flags with the same results as the ``is_*_file`` helpers.
+
+    Fragments are matched as substrings of the lowercased path. At each
+    position the regex takes the longest fragment, whose flags include those
+    of every shorter fragment it starts with, so overlapping fragments of
+    different categories are never missed.
+    """
+
+    def __init__(self):
+        fragments: Dict[str, int] = defaultdict(int)
+
+        def add_fragments(patterns: Iterable[str], flag: int) -> None:
+            # Substrings of a lowercased path can't hold uppercase table entries
+            for pattern in patterns:
+                if pattern and pattern == pattern.lower():
+                    fragments[pattern] |= flag
+
+        add_fragments(['readme', f'{_EDGE}docs/', '/docs/', f'.md{_EDGE}'], FILE_DOCS)
+        add_fragments(TEST_PATH_PATTERNS, FILE_TEST)
+        add_fragments(CICD_PATH_PATTERNS, FILE_CICD)
+        add_fragments(PACKAGE_FILES, FILE_PACKAGE)
+        add_fragments(DEPLOYMENT_FILES, FILE_DEPLOYMENT)
+        add_fragments(RELEASE_FILES, FILE_RELEASE)
+        add_fragments(RELEASE_PATH_PATTERNS, FILE_RELEASE)
+
+        self._fragment_flags = {fragment: self._prefix_flags(fragment, fragments) for fragment in fragments}
+
+        trie: Dict = {}
+        for fragment in fragments:
+            node = trie
+            for char in fragment:
+                node = node.setdefault(char, {})
+            node[''] = True
+        scanner = re.compile(f"(?=({_trie_pattern(trie)}))")
+        self._scan = scanner.findall
+        self._scan_positions = scanner.finditer
+
+        # Exact file names, case-sensitive (SPECIAL_FILENAMES) and lowercased
+        self._name_flags: Dict[str, int] = defaultdict(int)
+        for filename, file_type in SPECIAL_FILENAMES.items():
+            for types, flag in ((CICD_FILE_TYPES, FILE_CICD), (CONFIG_FILE_TYPES, FILE_CONFIG),
+                                (PACKAGE_FILE_TYPES, FILE_PACKAGE), (DEPLOYMENT_FILE_TYPES, FILE_DEPLOYMENT)):
+                if any(category in file_type for category in types):
+                    self._name_flags[filename] |= flag
+
+        self._lower_name_flags: Dict[str, int] = defaultdict(int)
+        for filename in CONFIG_FILES:
+            self._lower_name_flags[filename] |= FILE_CONFIG
+        for filename in CICD_FILENAMES:
+            self._lower_name_flags[filename] |= FILE_CICD
+
+        self._extension_flags = {ext: FILE_BINARY for ext in BINARY_EXTENSIONS | MEDIA_FILE_EXTENSIONS}
+
+    @staticmethod
+    def _prefix_flags(fragment: str, fragments: Dict[str, int]) -> int:
+        """Flags of a fragment and of every fragment it starts with"""
+        flags = 0
+        for other, other_flags in fragments.items():
+            if fragment.startswith(other):
+                flags |= other_flags
+        return flags
+
+    def _name_and_extension_flags(self, file_path: str) -> int:
+        """Flags decided by the exact file name and extension"""
+        name = file_path.rpartition('/')[2]
+        lower_name = name.lower()
+        return (self._name_flags.get(name, 0) |
+                self._lower_name_flags.get(lower_name, 0) |
+                self._extension_flags.get(_suffix(name).lower(), 0))
+
+    def classify(self, file_path: str) -> int:
+        """Classify one path into FILE_* flags"""
+        flags = self._name_and_extension_flags(file_path)
+        fragment_flags = self._fragment_flags
+        for fragment in self._scan(f"{_EDGE}{file_path.lower()}{_EDGE}"):
+            flags |= fragment_flags[fragment]
+        return flags
+
+    def classify_many(self, file_paths: List[str]) -> List[int]:
+        """
+        Classify a whole listing with one scan over the joined paths.
+
+        Args:
+            file_paths: Paths to classify
+
+        Returns:
+            FILE_* flags per path, in the same order
+        """
+        lowered = [file_path.lower() for file_path in file_paths]
+
+        # Offset of each path in the joined text, which starts with a separator
+        starts = []
+        offset = 1
+        for path in lowered:
+            starts.append(offset)
+            offset += len(path) + 1
+
+        flags = [self._name_and_extension_flags(file_path) for file_path in file_paths]
+        fragment_flags = self._fragment_flags
+        text = f"{_EDGE}{_EDGE.join(lowered)}{_EDGE}"
+        for match in self._scan_positions(text):
+            fragment = match.group(1)
+            # A fragment anchored at a path start begins on the separator before it
+            position = match.start() + (fragment[0] == _EDGE)
+            flags[bisect.bisect_right(starts, position) - 1] |= fragment_flags[fragment]
+
+        return flags
+
+
+path_classifier = PathClassifier()
@@ -0,0 +1,202 @@
+"""
+Rate Limit Budget for GitHub Repository RunnerAnalyzer
+
+This module tracks the GitHub API rate limit from the ``X-RateLimit-*`` headers
+every response already carries, instead of polling the rate limit endpoint
+before each repository. Workers ask the budget for request tokens; once the
+budget runs low faster than the limit refills, grants are spaced out so it
+lasts exactly until the reset time rather than running dry and sleeping for
+the rest of the hour. Secondary rate limits (``Retry-After``)
+pause every worker until they lift.
+
+Key components:
+- RateBudget: Thread-safe budget per rate limit resource with request pacing
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# Length of a primary rate limit window in seconds
+RATE_LIMIT_WINDOW = 3600
+
+# Share of the limit below which pacing may start; runs that fit in the rest are never slowed
+PACING_THRESHOLD_FRACTION = 0.2
+
+# Wait applied to a secondary rate limit response that carries no Retry-After
+SECONDARY_LIMIT_WAIT = 60
+
+
+def _lower_keys(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Normalize header names; PyGithub reports them lowercased, requests and aiohttp as sent"""
+    return {name.lower(): value for name, value in headers.items()}
+
+
+class _Bucket:
+    """Rate limit state of one resource (core, graphql, search)"""
+
+    __slots__ = ('limit', 'remaining', 'reset', 'next_grant')
+
+    def __init__(self):
+        self.limit = 0
+        self.remaining: Optional[int] = None
+        self.reset = 0.0
+        self.next_grant = 0.0
+
+
+class RateBudget:
+    """
+    Central rate limit budget fed from response headers.
+
+    ``acquire`` reserves tokens before requests are sent (async engine),
+    ``pace`` accounts for requests already reflected in the headers (PyGithub
+    path). Both return how long the caller has to wait; ``acquire_async``
+    sleeps for it on the event loop.
+    """
+
+    def __init__(self, reserve: int = 0, pacing: bool = True, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            reserve: Requests left for finishing up once the run stops (not paced)
+            pacing: Whether to space out requests once spending outruns the refill rate
+            clock: Source of the current Unix time (replaceable in tests)
+        """
+        self.reserve = reserve
+        self.pacing = pacing
+        self.clock = clock
+        self.retry_until = 0.0
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, resource: str) -> _Bucket:
+        bucket = self._buckets.get(resource)
+        if bucket is None:
+            bucket = self._buckets[resource] = _Bucket()
+        return bucket
+
+    def update(self, remaining: int, limit: int, reset: float, resource: str = 'core') -> None:
+        """Record the rate limit reported by a response"""
+        with self._lock:
+            bucket = self._bucket(resource)
+            if reset != bucket.reset or bucket.remaining is None:
+                # A new window (or the first observation) replaces the estimate
+                bucket.remaining = remaining
+                bucket.reset = reset
+            else:
+                # Responses can arrive out of order; the lowest count is the freshest
+                bucket.remaining = min(bucket.remaining, remaining)
+            bucket.limit = limit
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Record the rate limit from the headers of any REST or GraphQL response"""
+        headers = _lower_keys(headers)
+        if 'x-ratelimit-remaining' not in headers:
+            return
+        self.update(int(headers['x-ratelimit-remaining']), int(headers.get('x-ratelimit-limit', 0)),
+                    float(headers.get('x-ratelimit-reset', 0)), headers.get('x-ratelimit-resource', 'core'))
+
+    def update_from_github(self, github) -> int:
+        """
+        Record the rate limit PyGithub parsed from its last response.
+
+        Returns:
+            Number of core requests spent since the previous observation
+        """
+        remaining, limit = github.rate_limiting
+        reset = github.rate_limiting_resettime
+
+        with self._lock:
+            bucket = self._bucket('core')
+            previous = bucket.remaining if reset == bucket.reset else None
+        self.update(remaining, limit, reset)
+
+        return max(0, previous - remaining) if previous is not None else 0
+
+    def session_hook(self, response, *args, **kwargs):
+        """requests response hook feeding the budget from every response of a session"""
+        self.update_from_headers(response.headers)
+        delay = self.retry_delay(response.status_code, response.headers)
+        if delay is not None:
+            self.note_retry_after(delay)
+        return response
+
+    def note_retry_after(self, seconds: float) -> None:
+        """Pause all grants for a secondary rate limit"""
+        with self._lock:
+            self.retry_until = max(self.retry_until, self.clock() + seconds)
+
+    def retry_delay(self, status: int, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Seconds to wait before retrying a rate limited response, or None if it wasn't rate limited.
+
+        403 responses count as rate limited only when they say so through
+        ``Retry-After`` or an exhausted ``X-RateLimit-Remaining``; plain
+        permission errors are not retried.
+        """
+        if status not in (403, 429):
+            return None
+        headers = _lower_keys(headers)
+        if 'retry-after' in headers:
+            return float(headers['retry-after'])
+        if headers.get('x-ratelimit-remaining') == '0':
+            return max(0.0, float(headers.get('x-ratelimit-reset', 0)) - self.clock()) + 1
+        return SECONDARY_LIMIT_WAIT if status == 429 else None
+
+    def acquire(self, cost: int = 1, resource: str = 'core') -> float:
+        """Reserve tokens for requests about to be sent and return the seconds to wait first"""
+        return self._schedule(cost, resource, reserve_tokens=True)
+
+    def pace(self, spent: int, resource: str = 'core') -> float:
+        """Account for requests already made and return the seconds to wait before the next ones"""
+        return self._schedule(spent, resource, reserve_tokens=False)
+
+    async def acquire_async(self, cost: int = 1, resource: str = 'core') -> None:
+        """Reserve tokens and sleep on the event loop until they may be spent"""
+        delay = self.acquire(cost, resource)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _schedule(self, cost: int, resource: str, reserve_tokens: bool) -> float:
+        """Work out when ``cost`` requests may be made and update the bucket accordingly"""
+        with self._lock:
+            now = self.clock()
+            wait = max(0.0, self.retry_until - now)
+
+            bucket = self._bucket(resource)
+            if bucket.remaining is None:
+                return wait
+
+            time_left = bucket.reset - now
+            if time_left <= 0:
+                # The window has reset since the last response; the next one will tell the new state
+                bucket.remaining = bucket.limit
+                return wait
+
+            if bucket.remaining <= 0:
+                return max(wait, time_left + 1)
+
+            # Once the budget runs low ahead of an even schedule, grants are spread evenly until reset.
+            # The reserve itself is left unpaced so in-flight work can finish once callers stop.
+            available = bucket.remaining - self.reserve
+            pacing_start = bucket.limit * min(PACING_THRESHOLD_FRACTION, time_left / RATE_LIMIT_WINDOW)
+            if self.pacing and 0 < available < pacing_start:
+                start = max(now + wait, bucket.next_grant)
+                bucket.next_grant = start + cost * time_left / available
+                wait = start - now
+
+            if reserve_tokens:
+                bucket.remaining -= cost
+            return wait
+
+    def snapshot(self, resource: str = 'core') -> Dict[str, Any]:
+        """Current state of a resource in the shape used by RateLimitDisplay"""
+        with self._lock:
+            bucket = self._bucket(resource)
+            remaining = bucket.remaining if bucket.remaining is not None else 0
+            return {
+                'limit': bucket.limit,
+                'remaining': remaining,
+                'reset': bucket.reset,
+                'used': max(0, bucket.limit - remaining)
+            }
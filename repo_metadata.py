@@ -0,0 +1,228 @@
+"""
+Batched Repository Metadata for GitHub Repository RunnerAnalyzer
+
+This module fetches the per-repository counts used for community and activity
+metrics through the GitHub GraphQL API. Many repositories are requested in one
+aliased query, so metadata that takes several REST calls per repository costs
+a fraction of one request each.
+
+Key components:
+- RepoMetadataFetcher: Builds aliased queries and caches results per repository
+- GraphQLTransport: Sends queries to the GraphQL endpoint over a requests session
+- RecordedTransport: Replays recorded responses for offline tests
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import requests
+
+from console import logger
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Closed issues count closed and merged pull requests too, as the REST issues endpoint does
+REPO_METADATA_FRAGMENT = """
+fragment RepoMetadata on Repository {
+  pullRequests(states: OPEN) { totalCount }
+  issues(states: CLOSED) { totalCount }
+  closedPullRequests: pullRequests(states: [CLOSED, MERGED]) { totalCount }
+  releases { totalCount }
+  languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+    edges { size node { name } }
+  }
+  defaultBranchRef {
+    target {
+      ... on Commit {
+        oid
+        authoredDate
+        lastMonth: history(since: $monthAgo) { totalCount }
+        lastYear: history(since: $yearAgo) { totalCount }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL request fails as a whole"""
+
+
+class GraphQLTransport:
+    """Send GraphQL queries through an authenticated requests session"""
+
+    def __init__(self, session: requests.Session, url: str = GRAPHQL_URL, timeout: int = 60):
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+
+    def execute(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a query and return the decoded response body.
+
+        Raises:
+            GraphQLError: If the request fails or returns no data
+        """
+        try:
+            response = self.session.post(self.url, json={'query': query, 'variables': variables},
+                                         timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise GraphQLError(f"GraphQL request failed: {e}") from e
+
+        if body.get('data') is None:
+            raise GraphQLError(f"GraphQL query returned no data: {body.get('errors')}")
+        return body
+
+
+class RecordedTransport:
+    """
+    Transport that replays recorded GraphQL responses in order.
+
+    Queries and variables sent through it are kept in ``requests`` so tests
+    can check how many round trips were made.
+    """
+
+    def __init__(self, responses: List[Dict[str, Any]]):
+        self.responses = list(responses)
+        self.requests: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'RecordedTransport':
+        """Load a JSON list of recorded response bodies"""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def execute(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the query and return the next recorded response"""
+        self.requests.append({'query': query, 'variables': variables})
+        if not self.responses:
+            raise GraphQLError("No recorded response left")
+        return self.responses.pop(0)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GraphQL DateTime/GitTimestamp value"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class RepoMetadataFetcher:
+    """
+    Fetch community and activity counts for many repositories per GraphQL query.
+
+    Results are cached by repository full name; repositories that could not be
+    fetched are simply absent, and callers fall back to the REST API for them.
+    """
+
+    def __init__(self, transport, batch_size: int = 20):
+        """
+        Args:
+            transport: Object with an ``execute(query, variables)`` method
+            batch_size: Number of repositories requested per query
+        """
+        self.transport = transport
+        self.batch_size = max(1, batch_size)
+        self.queries_sent = 0
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._attempted: set = set()
+        self._lock = threading.Lock()
+
+    def prefetch(self, repos: Iterable) -> None:
+        """Fetch metadata for every repository not fetched yet, one query per batch"""
+        with self._lock:
+            pending = [repo for repo in repos if repo.full_name not in self._attempted]
+
+        for start in range(0, len(pending), self.batch_size):
+            self._fetch_batch(pending[start:start + self.batch_size])
+
+    def get(self, repo) -> Optional[Dict[str, Any]]:
+        """Return cached metadata for a repository, fetching it on its own if it wasn't prefetched"""
+        with self._lock:
+            attempted = repo.full_name in self._attempted
+
+        if not attempted:
+            self._fetch_batch([repo])
+
+        with self._lock:
+            return self._cache.get(repo.full_name)
+
+    def seed(self, full_name: str, metadata: Optional[Dict[str, Any]]) -> None:
+        """Cache metadata fetched elsewhere; None marks the repository for the REST fallback"""
+        with self._lock:
+            self._attempted.add(full_name)
+            if metadata is not None:
+                self._cache[full_name] = metadata
+
+    def _fetch_batch(self, repos: List) -> None:
+        """Run one aliased query for a batch of repositories and cache the results"""
+        with self._lock:
+            self._attempted.update(repo.full_name for repo in repos)
+
+        try:
+            body = self.transport.execute(self.build_query(repos), self.query_variables())
+            self.queries_sent += 1
+        except GraphQLError as e:
+            logger.warning(f"Could not fetch metadata for {len(repos)} repositories via GraphQL: {e}")
+            return
+
+        if body.get('errors'):
+            logger.debug(f"GraphQL metadata query returned errors: {body['errors']}")
+
+        data = body['data']
+        with self._lock:
+            for index, repo in enumerate(repos):
+                node = data.get(f"r{index}")
+                if node is not None:
+                    self._cache[repo.full_name] = self.parse_repository(node)
+
+    @staticmethod
+    def query_variables() -> Dict[str, str]:
+        """Variables for the history windows of the metadata fragment"""
+        now = datetime.now(timezone.utc)
+        return {
+            'monthAgo': (now - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'yearAgo': (now - timedelta(days=365)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        }
+
+    @staticmethod
+    def build_query(repos: List) -> str:
+        """Build an aliased query requesting the metadata fragment for each repository"""
+        fields = []
+        for index, repo in enumerate(repos):
+            owner, _, name = repo.full_name.partition('/')
+            fields.append(f"  r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                          f"{{ ...RepoMetadata }}")
+
+        return ("query($monthAgo: GitTimestamp!, $yearAgo: GitTimestamp!) {\n"
+                + "\n".join(fields) + "\n}\n" + REPO_METADATA_FRAGMENT)
+
+    @staticmethod
+    def parse_repository(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a repository node into the metadata dictionary used by the analyzer"""
+        metadata = {
+            'open_prs': node['pullRequests']['totalCount'],
+            'closed_issues': node['issues']['totalCount'] + node['closedPullRequests']['totalCount'],
+            'release_count': node['releases']['totalCount'],
+            'languages': {edge['node']['name']: edge['size'] for edge in node['languages']['edges']},
+            'head_sha': None,
+            'last_commit_date': None,
+            'commits_last_month': None,
+            'commits_last_year': None
+        }
+
+        # Empty repositories have no default branch
+        target = (node.get('defaultBranchRef') or {}).get('target')
+        if target:
+            metadata['head_sha'] = target['oid']
+            metadata['last_commit_date'] = _parse_datetime(target['authoredDate'])
+            metadata['commits_last_month'] = target['lastMonth']['totalCount']
+            metadata['commits_last_year'] = target['lastYear']['totalCount']
+
+        return metadata
@@ -0,0 +1,143 @@
+"""
+Repository Scheduler for GitHub Repository RunnerAnalyzer
+
+This module runs the repositories of a threaded analysis on one long-lived
+pool of worker threads fed from a priority queue. The largest repositories
+start first, so a big one found late no longer leaves every other worker idle
+while it finishes, and no batch boundary makes workers wait for the slowest
+repository of a batch. A running analysis can also spread its own work (such
+as shards of a big repository's files) over the queue: idle workers steal
+those shards before starting another repository, and the analysis runs any
+shard nobody took yet itself. Outside parallel runs, a scheduler of its own
+processes the shards of a single repository's files.
+
+Key components:
+- RepoScheduler: Worker threads running repository tasks largest first, and the shards they spread
+"""
+
+import concurrent.futures
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# Queue tiers: shards of running repositories go before repositories not started yet
+_SHARD_TIER = 0
+_REPO_TIER = 1
+_STOP_TIER = 2
+# Marks the end of the shards given to spread
+_END = object()
+
+
+class _Task:
+    """A queued call and the future receiving its result"""
+
+    def __init__(self, function: Callable, args: tuple):
+        self.function = function
+        self.args = args
+        self.future = concurrent.futures.Future()
+
+    def run(self) -> None:
+        # False once cancelled, or claimed by the repository the shard belongs to
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            self.future.set_result(self.function(*self.args))
+        except BaseException as e:
+            self.future.set_exception(e)
+
+
+class RepoScheduler:
+    """
+    Long-lived worker threads fed from one priority queue.
+
+    ``submit`` queues a repository task by priority (its size); ``spread``
+    lets a running task hand shards of its work to idle workers.
+    """
+
+    def __init__(self, workers: int):
+        """
+        Args:
+            workers: Number of worker threads
+        """
+        self.workers = max(1, workers)
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        # Ties in priority keep submission order
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self) -> 'RepoScheduler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        for index in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self._work, name=f"RepoScheduler-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, function: Callable, *args: Any, priority: int = 0) -> concurrent.futures.Future:
+        """
+        Queue a repository task.
+
+        Args:
+            function: Called with ``args`` on a worker thread
+            priority: Higher priorities start first, e.g. the repository size
+
+        Returns:
+            Future of the call; cancelling it before it starts drops the task
+        """
+        return self._put(_REPO_TIER, -priority, function, args).future
+
+    def spread(self, function: Callable[[Any], Any], shards: Iterable[Any]) -> Iterator[Any]:
+        """
+        Run ``function`` on each shard, on idle workers or the calling thread, yielding the results in order.
+
+        Only a window of shards, one per worker, is queued ahead of the one
+        being consumed. A shard no worker has started when its turn comes is
+        run by the caller, so the caller never waits on work still queued.
+        """
+        shards = iter(shards)
+        window: List[_Task] = []
+        try:
+            while True:
+                while len(window) <= self.workers:
+                    shard = next(shards, _END)
+                    if shard is _END:
+                        break
+                    window.append(self._put(_SHARD_TIER, 0, function, (shard,)))
+                if not window:
+                    return
+                task = window.pop(0)
+                if task.future.cancel():
+                    yield function(*task.args)
+                else:
+                    yield task.future.result()
+        finally:
+            # A caller that stops early leaves no shards queued behind it
+            for task in window:
+                task.future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once the queued tasks are done"""
+        for _ in self._threads:
+            self._put(_STOP_TIER, 0, None, ())
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _put(self, tier: int, rank: int, function: Optional[Callable], args: tuple) -> _Task:
+        task = _Task(function, args)
+        self._queue.put((tier, rank, next(self._sequence), task))
+        return task
+
+    def _work(self) -> None:
+        while True:
+            _, _, _, task = self._queue.get()
+            if task.function is None:
+                return
+            task.run()
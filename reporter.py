@@ -1011,10 +1011,12 @@ class DetailedReportGenerator:
     @staticmethod
     def _analyze_project_organization(stats):
         """Analyze project organization patterns"""
-        if not stats.project_structure:
+        if stats.directory_tree is not None:
+            structure_keys = [d.lower() for d in stats.directory_tree.project_structure()]
+        elif stats.project_structure:
+            structure_keys = [d.lower() for d in stats.project_structure.keys()]
+        else:
             return []
-
-        structure_keys = [d.lower() for d in stats.project_structure.keys()]
         patterns = []
 
         has_src = any(d in ['src', 'source', 'lib', 'app'] for d in structure_keys)
@@ -1037,6 +1039,10 @@ class DetailedReportGenerator:
     @staticmethod
     def _get_structure_overview(stats):
         """Get project structure overview"""
+        if stats.directory_tree is not None:
+            directories = stats.directory_tree.children
+            return len(directories), sum(directory.files for directory in directories.values())
+
         if not stats.project_structure:
             return None, None
 
@@ -1046,19 +1052,24 @@ class DetailedReportGenerator:
 
     @staticmethod
     def _get_top_directories(stats, limit: int = 8):
-        """Get top directories by file count"""
+        """Get top directories by file count, as (name, files, loc, primary language)"""
+        if stats.directory_tree is not None:
+            return [(name, directory.files, directory.loc, directory.primary_language)
+                    for name, directory in stats.directory_tree.top_directories(limit)]
+
         if not stats.project_structure:
             return []
-        return sorted(stats.project_structure.items(), key=lambda x: x[1], reverse=True)[:limit]
+        top_directories = sorted(stats.project_structure.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return [(name, count, None, None) for name, count in top_directories]
 
     def write_individual_repository_project_structure(self, f, stats):
         """Write project structure section for an individual repository"""
-        if not stats.project_structure:
+        total_dirs, total_dir_files = self._get_structure_overview(stats)
+        if not total_dirs:
             return
 
         f.write("### 📂 Project Structure\n")
 
-        total_dirs, total_dir_files = self._get_structure_overview(stats)
         patterns = self._analyze_project_organization(stats)
 
         f.write(f"Repository contains {total_dirs} top-level directories with {total_dir_files} files.\n\n")
@@ -1068,9 +1079,12 @@ class DetailedReportGenerator:
 
         f.write("**Top-level directories:**\n\n")
         top_directories = self._get_top_directories(stats)
-        for dir_name, count in top_directories:
+        for dir_name, count, loc, language in top_directories:
             percentage = (count / total_dir_files * 100) if total_dir_files > 0 else 0
-            f.write(f"- `{dir_name}/` - {count} files ({percentage:.1f}%)\n")
+            details = f"{count} files ({percentage:.1f}%)"
+            if loc:
+                details += f", {loc:,} LOC" + (f", mostly {language}" if language else "")
+            f.write(f"- `{dir_name}/` - {details}\n")
         f.write("\n")
 
     @staticmethod
@@ -1083,7 +1097,7 @@ class DetailedReportGenerator:
         f.write(f"- **Documentation Score:** {stats.documentation_score:.1f}/100\n")
         f.write(f"- **Popularity Score:** {stats.popularity_score:.1f}/100\n")
         if stats.is_monorepo:
-            f.write("- **Repository Type:** 📦 Monorepo (multiple major languages)\n")
+            f.write("- **Repository Type:** 📦 Monorepo (multiple major languages or subprojects)\n")
         f.write("\n")
 
     @staticmethod
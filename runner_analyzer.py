@@ -7,7 +7,8 @@ from typing import Optional, List
 from github import Github, GithubException, RateLimitExceededException
 from rich.panel import Panel
 
-from config import create_sample_config, DEFAULT_CONFIG, load_config_from_file, Configuration
+from config import create_sample_config, DEFAULT_CONFIG, load_config_from_file, Configuration, \
+    extra_tokens_from_env
 from console import logger, print_info, print_warning, print_header, rprint, create_progress_bar, console, print_success
 from lens import GithubLens
 from models import RepoStats
@@ -34,6 +35,9 @@ class RunnerAnalyzer:
             config.update(file_config)
 
         config["GITHUB_TOKEN"] = token
+        extra_tokens = extra_tokens_from_env()
+        if extra_tokens:
+            config["GITHUB_EXTRA_TOKENS"] = extra_tokens
         config["USERNAME"] = username
         config["VISIBILITY"] = visibility
 
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures: GithubAnalyzers wired to a local mock of the GitHub API
+"""
+
+import os
+import sys
+from typing import List
+
+import pytest
+import requests
+from github import Github
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import GithubAnalyzer
+from config import DEFAULT_CONFIG
+from console import RateLimitDisplay
+from models import RepoStats
+from repo_metadata import GraphQLTransport, RepoMetadataFetcher
+from utilities import Checkpoint
+
+
+@pytest.fixture
+def make_analyzer(tmp_path):
+    """
+    Factory of analyzers for a MockGithubServer.
+
+    Keyword arguments override configuration keys; checkpoints, the blob
+    cache and extra threads are off unless a test turns them on. Caches and
+    process pools the analyzers opened are closed after the test.
+    """
+    analyzers = []
+
+    def make(server, **overrides) -> GithubAnalyzer:
+        config = DEFAULT_CONFIG.copy()
+        config.update({
+            "GITHUB_TOKEN": "mock-token",
+            "USE_ASYNC_ENGINE": False,
+            "MAX_WORKERS": 1,
+            "FILE_WORKERS": 1,
+            "ENABLE_BLOB_CACHE": False,
+            "BLOB_CACHE_FILE": str(tmp_path / "blob_cache.sqlite"),
+            "ENABLE_CHECKPOINTING": False,
+            "CHECKPOINT_DIR": str(tmp_path),
+        })
+        config.update(overrides)
+
+        analyzer = GithubAnalyzer(Github("mock-token", base_url=server.base_url), "octo", config)
+        analyzer.rate_display = RateLimitDisplay()
+        analyzer.checkpoint = Checkpoint(config, "octo")
+        analyzer.session = requests.Session()
+        analyzer.metadata_fetcher = RepoMetadataFetcher(GraphQLTransport(analyzer.session,
+                                                                         url=f"{server.base_url}/graphql"))
+        analyzers.append(analyzer)
+        return analyzer
+
+    yield make
+
+    for analyzer in analyzers:
+        if analyzer.blob_cache is not None:
+            analyzer.blob_cache.close()
+        if analyzer.loc_pool is not None:
+            analyzer.loc_pool.shutdown()
+
+
+@pytest.fixture
+def analyze(make_analyzer):
+    """Analyze every repository of a MockGithubServer, with a new analyzer unless one is given"""
+
+    def run(server, analyzer=None, **overrides) -> List[RepoStats]:
+        analyzer = analyzer or make_analyzer(server, **overrides)
+        repos = [analyzer.github.get_repo(full_name) for full_name in server.repos]
+        return analyzer.analyze_repositories(repos)
+
+    return run
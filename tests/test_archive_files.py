@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for reading file contents from one streamed tarball per repository
+"""
+
+import io
+import os
+import random
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import ArchiveMemberStream
+from benchmarks.mock_github import MockGithubServer
+
+
+def _blob_requests(server) -> int:
+    return sum('/git/blobs/' in path for path in server.requested_paths)
+
+
+def test_archive_matches_blob_requests(analyze):
+    with MockGithubServer(repo_count=2, file_count=5, latency=0) as server:
+        expected = analyze(server)
+
+        before = _blob_requests(server)
+        assert analyze(server, DOWNLOAD_ARCHIVES=True) == expected
+        assert _blob_requests(server) == before
+
+
+def test_members_missing_from_the_archive_are_fetched(analyze):
+    with MockGithubServer(repo_count=1, file_count=5, latency=0) as server:
+        expected = analyze(server)
+
+        server.archive_missing = {'src/module_3.py'}
+        before = _blob_requests(server)
+        assert analyze(server, DOWNLOAD_ARCHIVES=True) == expected
+        assert _blob_requests(server) == before + 1
+
+
+def test_truncated_archive_falls_back_to_blob_requests(analyze):
+    rng = random.Random(3)
+    big = b''.join(b'value_%d = %d\n' % (i, rng.getrandbits(48)) for i in range(100000))
+    with MockGithubServer(repo_count=1, file_count=5, latency=0) as server:
+        mock_repo = next(iter(server.repos.values()))
+        mock_repo.add_file('src/big.py', big)
+        mock_repo.add_file('src/after.py', b'after = 1\n')
+        expected = analyze(server)
+
+        # The archive breaks off in the middle of the large file, which comes after the small ones
+        server.archive_truncate_at = len(mock_repo.tarball(server.COMMIT_SHA)) // 2
+        before = _blob_requests(server)
+        assert analyze(server, DOWNLOAD_ARCHIVES=True) == expected
+        # The rest of the large file and the file after it came from the blob API
+        assert _blob_requests(server) == before + 2
+
+
+class _BrokenMember(io.BytesIO):
+    """Archive member whose stream breaks off after ``limit`` bytes"""
+
+    def __init__(self, content: bytes, limit: int):
+        super().__init__(content[:limit])
+        self.limit = limit
+
+    def read(self, size=-1):
+        if self.tell() >= self.limit:
+            raise EOFError("unexpected end of data")
+        return super().read(size)
+
+
+def test_resumed_member_reads_at_most_size_bytes():
+    content = bytes(range(256)) * 40
+    stream = ArchiveMemberStream(_BrokenMember(content, 1000),
+                                 lambda: iter([content[:4096], content[4096:]]))
+
+    pieces = []
+    while True:
+        piece = stream.read(300)
+        if not piece:
+            break
+        assert len(piece) <= 300
+        pieces.append(piece)
+
+    assert b''.join(pieces) == content
+    assert isinstance(stream.error, EOFError)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tests that the asyncio engine produces the same stats as the threaded path
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.mock_github import MockGithubServer
+
+
+def test_async_engine_matches_threaded_engine(analyze):
+    def run(use_async):
+        requests_before = server.request_count
+        stats = {stats.name: stats for stats in analyze(server, USE_ASYNC_ENGINE=use_async, MAX_WORKERS=2)}
+        return server.request_count - requests_before, stats
+
+    with MockGithubServer(repo_count=3, file_count=4, latency=0) as server:
+        threaded_requests, threaded = run(use_async=False)
+        async_requests, async_stats = run(use_async=True)
+
+    assert sorted(async_stats) == ["repo0", "repo1", "repo2"]
+    assert async_stats == threaded
+    assert async_requests <= threaded_requests
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite cache of LOC counts and verdicts by blob SHA
+"""
+
+import gc
+import os
+import sqlite3
+import threading
+import weakref
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from blob_cache import BlobCache
+
+
+def test_hits_and_misses(tmp_path):
+    cache = BlobCache(str(tmp_path / 'cache.sqlite'))
+    # Nothing is created until the cache is used
+    assert not (tmp_path / 'cache.sqlite').exists()
+
+    assert cache.get_loc('a' * 40, 'python') is None
+    cache.store_loc('a' * 40, 'python', 12, 'Python')
+    assert cache.get_loc('a' * 40, 'python') == (12, 'Python')
+    assert cache.get_loc('a' * 40, 'text') is None
+    assert cache.contains('a' * 40, 'python')
+    assert cache.stats == {'hits': 1, 'misses': 2, 'stores': 1, 'evictions': 0}
+
+    cache.store_verdict('b' * 40, '.js', 'generated', 1)
+    assert cache.get_verdict('b' * 40, '.js', 1) == 'generated'
+    # The same content under another extension, or judged by other rules, is decided again
+    assert cache.get_verdict('b' * 40, '.txt', 1) is None
+    assert cache.get_verdict('b' * 40, '.js', 2) is None
+    cache.close()
+
+    reopened = BlobCache(str(tmp_path / 'cache.sqlite'))
+    assert reopened.get_loc('a' * 40, 'python') == (12, 'Python')
+    reopened.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(BlobCache, 'COMMIT_INTERVAL', 1)
+    cache = BlobCache(str(tmp_path / 'cache.sqlite'), max_entries=10)
+    for index in range(10):
+        cache.store_loc(f'{index:040d}', 'python', index, 'Python')
+    # Using the oldest entry keeps it
+    assert cache.get_loc(f'{0:040d}', 'python') == (0, 'Python')
+
+    cache.store_loc(f'{10:040d}', 'python', 10, 'Python')
+    assert cache.evictions == 2
+    assert cache.contains(f'{0:040d}', 'python')
+    assert not cache.contains(f'{1:040d}', 'python')
+    assert not cache.contains(f'{2:040d}', 'python')
+    assert cache.contains(f'{10:040d}', 'python')
+    cache.close()
+
+
+def test_concurrent_writers_share_the_database(tmp_path):
+    caches = [BlobCache(str(tmp_path / 'cache.sqlite')) for _ in range(2)]
+
+    def write(cache, offset):
+        for index in range(200):
+            cache.store_loc(f'{offset + index:040d}', 'python', index, 'Python')
+        cache.flush()
+
+    threads = [threading.Thread(target=write, args=(cache, offset * 1000)) for offset, cache in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert caches[0].contains(f'{1199:040d}', 'python')
+    assert caches[1].contains(f'{199:040d}', 'python')
+    for cache in caches:
+        cache.close()
+
+
+def test_corrupt_or_outdated_databases_start_over(tmp_path, monkeypatch):
+    cache_file = tmp_path / 'cache.sqlite'
+    cache_file.write_bytes(b'not a database' * 100)
+    cache = BlobCache(str(cache_file))
+    assert cache.get_loc('a' * 40, 'python') is None
+    cache.store_loc('a' * 40, 'python', 3, 'Python')
+    cache.close()
+
+    # Counts made by other counting rules are misses
+    monkeypatch.setattr(BlobCache, 'LOC_VERSION', BlobCache.LOC_VERSION + 1)
+    cache = BlobCache(str(cache_file))
+    assert cache.get_loc('a' * 40, 'python') is None
+    cache.close()
+
+    # A database of another layout is rebuilt
+    connection = sqlite3.connect(str(cache_file))
+    connection.execute("PRAGMA user_version = 0")
+    connection.close()
+    cache = BlobCache(str(cache_file))
+    assert not cache.contains('a' * 40, 'python')
+    cache.store_loc('a' * 40, 'python', 3, 'Python')
+    assert cache.get_loc('a' * 40, 'python') == (3, 'Python')
+    cache.close()
+
+
+def test_default_cache_file_follows_checkpoint_dir(tmp_path):
+    from analyzer import GithubAnalyzer
+    from config import DEFAULT_CONFIG
+
+    config = dict(DEFAULT_CONFIG, CHECKPOINT_DIR=str(tmp_path / 'state'))
+    analyzer = GithubAnalyzer(None, "octo", config)
+
+    assert analyzer.blob_cache.cache_file == tmp_path / 'state' / 'blob_cache.sqlite'
+    analyzer.blob_cache.close()
+
+
+def test_unused_caches_are_not_kept_alive(tmp_path):
+    cache = BlobCache(str(tmp_path / 'cache.sqlite'))
+    cache.store_loc('a' * 40, 'python', 1, 'Python')
+    cache.close()
+    reference = weakref.ref(cache)
+    del cache
+    gc.collect()
+
+    assert reference() is None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only checkpoint log
+"""
+
+import os
+from datetime import datetime, timezone
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.mock_github import MockGithubServer
+from models import BaseRepoInfo, CodeStats, DirectoryStats, RepoStats
+from utilities import Checkpoint
+
+
+def _stats(name: str) -> RepoStats:
+    created = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    tree = DirectoryStats(files=2, loc=30, languages={'Python': 30},
+                          children={'src': DirectoryStats(depth=1, files=2, loc=30, languages={'Python': 30})})
+    return RepoStats(base_info=BaseRepoInfo(name, False, 'main', False, False, False, created, created),
+                     code_stats=CodeStats(languages={'Python': 30}, total_files=2, total_loc=30, directory_tree=tree))
+
+
+def test_saves_append_only_new_repositories(tmp_path):
+    checkpoint = Checkpoint({"CHECKPOINT_DIR": str(tmp_path)}, "octocat")
+    all_stats = [_stats('a'), _stats('b')]
+    assert checkpoint.save(all_stats, ['a', 'b'], [])
+    all_stats.append(_stats('c'))
+    assert checkpoint.save(all_stats, ['a', 'b', 'c'], [])
+    assert len(checkpoint.log_file.read_bytes().splitlines()) == 3
+
+    loaded = Checkpoint({"CHECKPOINT_DIR": str(tmp_path)}, "octocat").load()
+    assert loaded['all_stats'] == all_stats
+    assert loaded['analyzed_repo_names'] == ['a', 'b', 'c']
+    assert Checkpoint({"CHECKPOINT_DIR": str(tmp_path)}, "someone-else").load() is None
+
+
+def test_an_interrupted_save_leaves_earlier_records_intact(tmp_path):
+    checkpoint = Checkpoint({"CHECKPOINT_DIR": str(tmp_path)}, "octocat")
+    checkpoint.save([_stats('a')], ['a'], [])
+    with open(checkpoint.log_file, 'ab') as f:
+        f.write(b'{"base_info": {"name": "b", "is_pri')  # Cut off before the manifest was replaced
+
+    resumed = Checkpoint({"CHECKPOINT_DIR": str(tmp_path)}, "octocat")
+    all_stats = resumed.load()['all_stats']
+    assert [stats.name for stats in all_stats] == ['a']
+
+    # The torn record is dropped, not appended to
+    all_stats.append(_stats('c'))
+    resumed.save(all_stats, ['a', 'c'], [])
+    assert [stats.name for stats in resumed.load()['all_stats']] == ['a', 'c']
+
+    resumed.clear()
+    assert resumed.load() is None
+
+
+def test_analysis_resumes_from_the_log_and_clears_it(make_analyzer):
+    with MockGithubServer(repo_count=3, file_count=3, latency=0) as server:
+        analyzer = make_analyzer(server, ENABLE_CHECKPOINTING=True)
+        repos = [analyzer.github.get_repo(full_name) for full_name in server.repos]
+
+        first = analyzer.analyze_repositories(repos[:1])
+        analyzer.checkpoint.save(first, [repos[0].name], repos[1:])
+
+        resumed = analyzer.analyze_repositories(repos)
+
+    assert [stats.name for stats in resumed] == [repo.name for repo in repos]
+    assert resumed[0] == first[0]
+    assert not analyzer.checkpoint.manifest_file.exists()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for counting recent commits without listing a year of commits
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import GithubAnalyzer, SingleRepoAnalyzer
+from config import DEFAULT_CONFIG
+
+
+class FakeRepo:
+    """Minimal stand-in for a PyGithub Repository serving commit statistics"""
+
+    name = "fake"
+
+    def __init__(self, activity):
+        self.activity = activity
+        self.listed = False
+
+    def get_stats_commit_activity(self):
+        return self.activity
+
+    def get_commits(self, since=None):
+        self.listed = True
+        now = datetime.now(timezone.utc)
+        return [SimpleNamespace(commit=SimpleNamespace(author=SimpleNamespace(date=now - timedelta(days=d))))
+                for d in (1, 2, 100)]
+
+
+def _single_analyzer():
+    config = DEFAULT_CONFIG.copy()
+    config["ENABLE_BLOB_CACHE"] = False
+    return SingleRepoAnalyzer(GithubAnalyzer(None, "tester", config))
+
+
+def test_counts_come_from_commit_activity_stats():
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    weeks = [SimpleNamespace(week=today - timedelta(days=7 * (51 - i)), days=[1, 0, 0, 0, 0, 0, 0], total=1)
+             for i in range(52)]
+    repo = FakeRepo(weeks)
+
+    last_month, last_year = _single_analyzer()._count_recent_commits(repo)
+
+    assert last_year == 52
+    assert last_month == 5
+    assert not repo.listed
+
+
+def test_listing_is_used_while_stats_are_computed():
+    repo = FakeRepo(None)
+
+    assert _single_analyzer()._count_recent_commits(repo) == (2, 3)
+    assert repo.listed
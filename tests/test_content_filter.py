@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for leaving binary, generated and vendored files out of LOC counts
+"""
+
+import os
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.mock_github import MockGithubServer
+from blob_cache import BlobCache
+from content_filter import ContentFilter, VERDICT_BINARY, VERDICT_GENERATED, VERDICT_VENDORED
+
+
+def test_path_verdicts():
+    assert ContentFilter.path_verdict('web/package-lock.json') == VERDICT_GENERATED
+    assert ContentFilter.path_verdict('static/app.min.js') == VERDICT_GENERATED
+    assert ContentFilter.path_verdict('api/service_pb2.py') == VERDICT_GENERATED
+    assert ContentFilter.path_verdict('third_party/zlib/inflate.c') == VERDICT_VENDORED
+    assert ContentFilter.path_verdict('src/third_party.py') is None
+    assert ContentFilter.path_verdict('src/app.js') is None
+    # Directories named like this hold a project's own code as often as copied code
+    assert ContentFilter.path_verdict('src/external/client.py') is None
+    assert ContentFilter.path_verdict('extern/bindings.c') is None
+
+
+def test_prefix_verdicts():
+    content_filter = ContentFilter()
+    assert content_filter.prefix_verdict('data.txt', b'header\n\0\x01payload') == VERDICT_BINARY
+    assert content_filter.prefix_verdict('api.go', b'// Code generated by protoc-gen-go. DO NOT EDIT.\n'
+                                                   b'package api\n') == VERDICT_GENERATED
+    assert content_filter.prefix_verdict('bundle.js', b'var a=1;' * 1000) == VERDICT_GENERATED
+    assert content_filter.prefix_verdict('app.js', b'const a = 1;\n' * 1000) is None
+    assert content_filter.prefix_verdict('schema.js', b'/**\n * @generated SignedSource<<abc>>\n */\n') \
+        == VERDICT_GENERATED
+    # Markers further down a file are ordinary text
+    assert content_filter.prefix_verdict('notes.py', b'# notes\n' * 300 + b'# Code generated by hand\n') is None
+    # A marker counts only when it opens a line
+    assert content_filter.prefix_verdict('settings.py', b'# Settings. DO NOT EDIT in production.\n') is None
+    assert content_filter.prefix_verdict('docs.py', b'HELP = "Code generated by protoc is skipped"\n') is None
+    # A long data line in hand-written code isn't minification
+    assert content_filter.prefix_verdict('icons.js', b'const a = 1;\n' * 300 + b'const icon = "' + b'A' * 900
+                                         + b'";\n') is None
+    assert content_filter.prefix_verdict('theme.css', b'.a{color:red}' * 100 + b'\n' + b'.b { margin: 0; }\n') \
+        == VERDICT_GENERATED
+
+
+def test_cached_verdicts_are_per_extension(tmp_path):
+    cache = BlobCache(str(tmp_path / 'cache.sqlite'))
+    content_filter = ContentFilter(cache)
+    minified = SimpleNamespace(path='dist/bundle.js', sha='c' * 40, size=8000)
+
+    assert not content_filter.accept_prefix(minified, b'var a=1;' * 1000, 8000)
+    assert content_filter.unread_verdict('dist/bundle.js', 'c' * 40) == VERDICT_GENERATED
+    # The same blob as a .txt file was never judged by the minification rule
+    assert content_filter.unread_verdict('notes/bundle.txt', 'c' * 40) is None
+    cache.close()
+
+
+def test_generated_files_are_not_downloaded_or_counted(make_analyzer, analyze):
+    generated = b'// Code generated by mockgen. DO NOT EDIT.\n' + b'var value = 1\n' * 100000
+    lockfile = b'{\n  "lockfileVersion": 3\n}\n'
+
+    def run():
+        analyzer = make_analyzer(server, ENABLE_BLOB_CACHE=True, DETECT_GENERATED_FILES=True)
+        return analyze(server, analyzer)[0].code_stats.total_loc, analyzer.content_filter
+
+    with MockGithubServer(repo_count=1, file_count=2, latency=0) as server:
+        mock_repo = next(iter(server.repos.values()))
+        expected_loc = analyze(server)[0].code_stats.total_loc
+
+        mock_repo.add_file('src/mocks.go', generated)
+        mock_repo.add_file('package-lock.json', lockfile)
+
+        total_loc, content_filter = run()
+        assert total_loc == expected_loc
+        assert content_filter.skipped == {VERDICT_GENERATED: 2}
+        # Only the first chunk of the large file was downloaded
+        assert content_filter.bytes_avoided > len(generated) // 2
+
+        # The next run skips the rejected blob without requesting it
+        total_loc, content_filter = run()
+        assert total_loc == expected_loc
+        assert content_filter.bytes_avoided == len(generated) + len(lockfile)
+
+
+def test_small_rejected_files_are_judged_from_a_prefix(make_analyzer, analyze):
+    minified = b'var a=1;' * 50000
+
+    with MockGithubServer(repo_count=1, file_count=2, latency=0) as server:
+        expected_loc = analyze(server)[0].code_stats.total_loc
+        next(iter(server.repos.values())).add_file('static/bundle.js', minified)
+        analyzer = make_analyzer(server, DETECT_GENERATED_FILES=True)
+        total_loc = analyze(server, analyzer)[0].code_stats.total_loc
+
+    assert total_loc == expected_loc
+    assert analyzer.content_filter.skipped == {VERDICT_GENERATED: 1}
+    # Only the probed prefix of the file was read before it was rejected
+    assert analyzer.content_filter.bytes_avoided == len(minified) - ContentFilter.PROBE_SIZE
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for rolling the flat file list up into per-directory totals
+"""
+
+import os
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.mock_github import MockGithubServer
+from directory_tree import DirectoryAggregator
+from models import CodeStats
+
+
+def _tree(files):
+    aggregator = DirectoryAggregator()
+    for path, language, loc in files:
+        aggregator.add_file(path)
+        aggregator.add_loc(path, language, loc)
+    return aggregator.build()
+
+
+def test_directories_roll_up_into_their_parents():
+    root = _tree([('README.md', 'Markdown', 5), ('src/app.py', 'Python', 100),
+                  ('src/core/models/user.py', 'Python', 40), ('src/web/app.js', 'JavaScript', 60)])
+
+    assert (root.files, root.loc, root.max_depth) == (4, 205, 3)
+    assert root.languages == {'Markdown': 5, 'Python': 140, 'JavaScript': 60}
+    src = root.find('src')
+    assert (src.depth, src.files, src.loc, src.primary_language) == (1, 3, 200, 'Python')
+    # Directories holding only subdirectories still get their totals
+    assert (root.find('src/core').files, root.find('src/core').loc) == (1, 40)
+    assert root.find('src/missing') is None
+    assert [path for path, _ in root.walk()][0] == ''
+    assert {path for path, _ in root.walk()} == {'', 'src', 'src/core', 'src/core/models', 'src/web'}
+
+
+def test_wrapper_folders_are_skipped_for_the_project_root():
+    root = _tree([('MyGame/Assets/Player.cs', 'C#', 10), ('MyGame/ProjectSettings/Tags.asset', 'Other', 0)])
+    assert root.project_root()[0] == 'MyGame'
+    assert root.project_structure() == {'Assets': 1, 'ProjectSettings': 1}
+
+    root = _tree([('README.md', 'Markdown', 1), ('MyGame/Assets/Player.cs', 'C#', 10)])
+    assert root.project_root()[0] == ''
+
+
+def test_subprojects_in_a_container_make_a_monorepo():
+    files = [('packages/api/index.ts', 'TypeScript', 300), ('packages/web/index.ts', 'TypeScript', 300),
+             ('README.md', 'Markdown', 10)]
+    code_stats = CodeStats(languages={'TypeScript': 600, 'Markdown': 10}, total_loc=610, directory_tree=_tree(files))
+    code_stats.detect_monorepo()
+    assert code_stats.is_monorepo
+
+    files = [('src/api/index.ts', 'TypeScript', 300), ('src/web/index.ts', 'TypeScript', 300)]
+    code_stats = CodeStats(languages={'TypeScript': 600}, total_loc=600, directory_tree=_tree(files))
+    code_stats.detect_monorepo()
+    assert not code_stats.is_monorepo
+
+
+def test_analysis_stores_the_tree_on_code_stats(analyze):
+    with MockGithubServer(repo_count=1, file_count=5, latency=0) as server:
+        code_stats = analyze(server)[0].code_stats
+
+    tree = code_stats.directory_tree
+    assert (tree.files, tree.loc) == (code_stats.total_files, code_stats.total_loc)
+    assert tree.languages == code_stats.languages
+    assert tree.find('src').files == 5
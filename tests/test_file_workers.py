@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for processing the files of one repository on several threads
+"""
+
+import os
+
+from github import Github
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import AnalyzerRepoFiles
+from benchmarks.mock_github import MockGithubServer
+from directory_tree import DirectoryAggregator
+from token_pool import TokenPool
+
+
+def test_sharded_files_give_the_same_stats(analyze, monkeypatch):
+    # Shards that don't divide the file count, so the last one is partial
+    monkeypatch.setattr(AnalyzerRepoFiles, 'SHARD_SIZE', 4)
+    with MockGithubServer(repo_count=1, file_count=21, latency=0.002) as server:
+        expected = analyze(server, FILE_WORKERS=1)[0]
+        sharded = analyze(server, FILE_WORKERS=4)[0]
+
+    assert sharded.code_stats.total_files == expected.code_stats.total_files == 22
+    assert sharded.code_stats.total_loc == expected.code_stats.total_loc
+    assert sharded.code_stats.languages == expected.code_stats.languages
+    assert sharded.file_types == expected.file_types
+    assert sharded.docs_files_count == expected.docs_files_count
+    assert sharded.readme_line_count == expected.readme_line_count > 0
+    assert sharded.directory_tree.find('src').files == 21
+    assert sharded.directory_tree.languages == expected.directory_tree.languages
+
+
+def test_partial_totals_merge_in_file_order():
+    stats = AnalyzerRepoFiles._initialize_stats()
+    stats['languages']['Python'] = 10
+    stats['docs_files'].append('README.md')
+    partial = AnalyzerRepoFiles._initialize_stats()
+    partial['languages'].update({'Python': 5, 'Go': 7})
+    partial['docs_files'].append('docs/guide.md')
+    partial['has_docs'] = True
+    partial['media_metrics']['image_count'] = 2
+
+    AnalyzerRepoFiles._merge_totals(stats, partial)
+    assert stats['languages'] == {'Python': 15, 'Go': 7}
+    assert stats['docs_files'] == ['README.md', 'docs/guide.md']
+    assert stats['has_docs'] and stats['media_metrics']['image_count'] == 2
+
+    aggregator, shard = DirectoryAggregator(), DirectoryAggregator()
+    aggregator.add_file('src/a.py')
+    aggregator.add_loc('src/a.py', 'Python', 3)
+    shard.add_file('src/b.py')
+    shard.add_loc('src/b.py', 'Python', 4)
+    aggregator.merge(shard)
+    root = aggregator.build()
+    assert (root.find('src').files, root.find('src').loc) == (2, 7)
+
+
+def test_shards_are_served_by_the_repository_token(make_analyzer, analyze, monkeypatch):
+    tokens = []
+    process_file = AnalyzerRepoFiles._process_file_safely
+
+    def record_token(self, *args):
+        tokens.append(self.github_analyzer.current_token.token)
+        return process_file(self, *args)
+
+    monkeypatch.setattr(AnalyzerRepoFiles, 'SHARD_SIZE', 2)
+    monkeypatch.setattr(AnalyzerRepoFiles, '_process_file_safely', record_token)
+    with MockGithubServer(repo_count=1, file_count=8, latency=0) as server:
+        analyzer = make_analyzer(server, FILE_WORKERS=3)
+        analyzer.token_pool = TokenPool(["mock-token", "second"],
+                                        github_factory=lambda token: Github(token, base_url=server.base_url))
+        # The primary token looks spent, so the repository is routed to the second one
+        analyzer.token_pool.primary.budget.update(10, 5000, 2_000_000_000)
+        assert analyze(server, analyzer)[0].code_stats.total_files == 9
+
+    assert set(tokens) == {"second"}
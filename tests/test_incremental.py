@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental re-analysis of repositories changed since the last run
+"""
+
+import base64
+import hashlib
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import AnalyzerIncrementalFiles, AnalyzerRepoFiles, GithubAnalyzer, IncrementalAnalyzer
+from config import DEFAULT_CONFIG
+from models import BaseRepoInfo, RepoStats
+from utilities import Checkpoint, IncrementalEntry, IncrementalStore
+
+OLD_FILES = {
+    "src/app.py": b"import os\n\nprint(os.name)\n",
+    "src/util.py": b"# helper\nx = 1\n",
+    "lib/old.py": b"a = 1\nb = 2\n",
+}
+
+NEW_FILES = {
+    "src/app.py": b"import os\n\nprint(os.name)\nprint(os.sep)\n",
+    "src/util.py": b"# helper\nx = 1\n",
+    "pkg/new.py": b"y = 2\n",
+}
+
+
+def _sha(content):
+    return hashlib.sha1(content).hexdigest()
+
+
+class FakeRepo:
+    """Minimal stand-in for a PyGithub Repository serving trees, blobs and comparisons"""
+
+    name = "fake"
+    full_name = "tester/fake"
+    default_branch = "main"
+
+    def __init__(self, files, changes=None, status="ahead"):
+        self.blobs = {_sha(content): content for content in list(OLD_FILES.values()) + list(files.values())}
+        self.files = files
+        self.changes = changes or []
+        self.status = status
+        self.blob_calls = []
+
+    def get_git_tree(self, sha, recursive=False):
+        elements = [SimpleNamespace(path=path, type="blob", sha=_sha(content), size=len(content), mode="100644")
+                    for path, content in self.files.items()]
+        elements += [SimpleNamespace(path=d, type="tree", sha="", size=None, mode="040000")
+                     for d in sorted({path.rpartition('/')[0] for path in self.files})]
+        return SimpleNamespace(sha=sha, tree=elements, truncated=False)
+
+    def get_git_blob(self, sha):
+        self.blob_calls.append(sha)
+        content = self.blobs[sha]
+        return SimpleNamespace(content=base64.b64encode(content).decode(), encoding="base64", size=len(content))
+
+    def compare(self, base, head):
+        return SimpleNamespace(status=self.status, files=self.changes)
+
+    def get_releases(self):
+        return []
+
+
+def _github_analyzer(tmp_path):
+    config = DEFAULT_CONFIG.copy()
+    config["ENABLE_BLOB_CACHE"] = False
+    config["INCREMENTAL_ANALYSIS"] = True
+    config["CHECKPOINT_DIR"] = str(tmp_path)
+    return GithubAnalyzer(None, "tester", config)
+
+
+def _previous_entry(github_analyzer):
+    stats = AnalyzerRepoFiles(github_analyzer).analyze(FakeRepo(OLD_FILES))
+    return IncrementalEntry("old", None, None, stats['manifest'])
+
+
+def _changes():
+    return [
+        SimpleNamespace(filename="src/app.py", status="modified", sha=_sha(NEW_FILES["src/app.py"]),
+                        previous_filename=None),
+        SimpleNamespace(filename="pkg/new.py", status="renamed", sha=_sha(NEW_FILES["pkg/new.py"]),
+                        previous_filename="lib/old.py"),
+    ]
+
+
+def test_diff_only_fetches_changed_blobs(tmp_path):
+    github_analyzer = _github_analyzer(tmp_path)
+    previous = _previous_entry(github_analyzer)
+    repo = FakeRepo(NEW_FILES, _changes())
+
+    stats = AnalyzerIncrementalFiles(github_analyzer, previous, "new").analyze(repo)
+    full_stats = AnalyzerRepoFiles(github_analyzer).analyze(FakeRepo(NEW_FILES))
+
+    assert sorted(repo.blob_calls) == sorted([_sha(NEW_FILES["src/app.py"]), _sha(NEW_FILES["pkg/new.py"])])
+    assert stats['total_files'] == full_stats['total_files'] == 3
+    assert stats['total_loc'] == full_stats['total_loc']
+    assert dict(stats['project_structure']) == dict(full_stats['project_structure'])
+    assert sorted(entry[0] for entry in stats['manifest']['blob_entries']) == sorted(NEW_FILES)
+
+
+def test_diverged_head_falls_back_to_full_listing(tmp_path):
+    github_analyzer = _github_analyzer(tmp_path)
+    previous = _previous_entry(github_analyzer)
+    repo = FakeRepo(NEW_FILES, _changes(), status="diverged")
+
+    stats = AnalyzerIncrementalFiles(github_analyzer, previous, "new").analyze(repo)
+
+    # Unchanged blobs still keep their previous LOC
+    assert _sha(NEW_FILES["src/util.py"]) not in repo.blob_calls
+    assert stats['total_files'] == 3
+
+
+def test_unchanged_repository_is_reused_without_requests(tmp_path):
+    github_analyzer = _github_analyzer(tmp_path)
+    pushed_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    repo_stats = RepoStats(base_info=BaseRepoInfo("fake", False, "main", False, False, False, pushed_at, pushed_at))
+    repo_stats.code_stats.total_loc = 42
+
+    store = IncrementalStore(github_analyzer.config, "tester")
+    store.put("tester/fake", IncrementalEntry("abc", pushed_at, repo_stats))
+    store.save()
+
+    repo = SimpleNamespace(
+        name="fake", full_name="tester/fake", private=False, default_branch="main", fork=False, archived=False,
+        is_template=False, created_at=pushed_at, pushed_at=pushed_at, description=None, homepage=None,
+        stargazers_count=5, forks_count=1, watchers_count=5, open_issues_count=0, topics=[]
+    )
+    incremental = IncrementalAnalyzer(github_analyzer, IncrementalStore(github_analyzer.config, "tester"))
+
+    result = incremental.analyze(repo)
+
+    assert result.code_stats.total_loc == 42
+    assert result.community.stars == 5
+    assert incremental.counts['reused'] == 1
+
+
+def test_checkpoints_leave_the_store_for_finalize(tmp_path):
+    github_analyzer = _github_analyzer(tmp_path)
+    github_analyzer.checkpoint = Checkpoint(dict(github_analyzer.config, ENABLE_CHECKPOINTING=True), "tester")
+    github_analyzer.incremental.store.put("tester/fake", IncrementalEntry("abc", None, None))
+
+    github_analyzer.save_checkpoint([], ["fake"], [])
+
+    assert not github_analyzer.incremental.store.state_file.exists()
+    assert github_analyzer.incremental.store.save()
+    assert github_analyzer.incremental.store.state_file.exists()
+
+
+def test_sniffed_languages_carry_over_without_fetching(tmp_path):
+    github_analyzer = _github_analyzer(tmp_path)
+    script = b"#!/usr/bin/env python3\nprint('run')\n"
+    old_files = dict(OLD_FILES, **{"scripts/run": script})
+    new_files = dict(NEW_FILES, **{"scripts/run": script})
+    previous = IncrementalEntry("old", None, None,
+                                AnalyzerRepoFiles(github_analyzer).analyze(FakeRepo(old_files))['manifest'])
+    assert previous.manifest['file_languages'] == {"scripts/run": "Python"}
+    repo = FakeRepo(new_files, _changes())
+
+    stats = AnalyzerIncrementalFiles(github_analyzer, previous, "new").analyze(repo)
+
+    assert _sha(script) not in repo.blob_calls
+    assert dict(stats['languages']) == dict(AnalyzerRepoFiles(github_analyzer).analyze(FakeRepo(new_files))['languages'])
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for resolving file languages with one shared engine
+"""
+
+import hashlib
+import os
+
+import pytest
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import GithubAnalyzer, code_analyzer
+from benchmarks.mock_github import MockGithubServer
+from language_engine import language_engine, SNIFFED_STYLE
+from utilities import get_file_language
+
+SCRIPT = b'#!/usr/bin/env -S python3.11 -u\n"""Tool"""\n# comment\nprint("hi")\n'
+
+
+def test_extensions_and_names_agree_everywhere():
+    for path, language, style in (('src/app.py', 'Python', 'python'), ('ui/View.tsx', 'TypeScript', 'typescript'),
+                                  ('paper/main.TEX', 'LaTeX', 'latex'), ('build/Makefile', 'Makefile', 'makefile'),
+                                  ('Gemfile', 'Ruby', 'ruby'), ('data.xyz', 'Other', 'text')):
+        assert GithubAnalyzer.get_file_language(path) == language
+        assert get_file_language(path) == language
+        assert code_analyzer.get_language_from_file(path) == style
+
+
+def test_extensionless_files_are_sniffed():
+    assert language_engine.resolve('bin/tool').comment_style == SNIFFED_STYLE
+    assert language_engine.detect('bin/tool', SCRIPT).language == 'Python'
+    assert language_engine.detect('bin/run', b'#!/bin/bash\nset -e\n').language == 'Bash'
+    assert language_engine.detect('bin/run', b'#!/usr/bin/env node\n').language == 'JavaScript'
+    assert language_engine.detect('public/index', b'\n  <!DOCTYPE html>\n<html></html>').language == 'HTML'
+    assert language_engine.detect('notes', b'just text\n').language == 'Other'
+    # Names and extensions win over content
+    assert language_engine.detect('tool.rb', SCRIPT).language == 'Ruby'
+
+
+def test_sniffed_comment_style_counts_the_same_on_every_path():
+    expected = 1  # Only print(): the shebang, docstring and comment follow Python rules, not plain text
+    assert code_analyzer.count_lines_of_code(SCRIPT.decode(), 'bin/tool') == expected
+    assert code_analyzer.count_lines_of_code_buffer(SCRIPT, 'bin/tool') == expected
+    chunks = [SCRIPT[pos:pos + 3] for pos in range(0, len(SCRIPT), 3)]
+    assert code_analyzer.count_lines_of_code_stream(chunks, 'bin/tool') == expected
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_cached_extensionless_files_are_not_fetched_again(analyze, use_async):
+    if use_async:
+        pytest.importorskip("aiohttp")
+    script = b'#!/bin/bash\nset -e\necho deploy\n'
+    with MockGithubServer(repo_count=1, file_count=2, latency=0) as server:
+        next(iter(server.repos.values())).add_file('tools/deploy', script)
+        script_blob = f"/git/blobs/{hashlib.sha1(script).hexdigest()}"
+
+        first = analyze(server, ENABLE_BLOB_CACHE=True, USE_ASYNC_ENGINE=use_async)[0]
+        assert script_blob in {path.rpartition('/repos/octo/repo0')[2] for path in server.requested_paths}
+        requested = len(server.requested_paths)
+
+        second = analyze(server, ENABLE_BLOB_CACHE=True, USE_ASYNC_ENGINE=use_async)[0]
+        assert not any(path.endswith(script_blob) for path in server.requested_paths[requested:])
+
+    assert second.code_stats.languages == first.code_stats.languages
+    assert first.code_stats.languages['Bash'] > 0
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for counting lines of code in the LOC process pool
+"""
+
+import os
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import (analyze_file_batch, count_lines_of_code, is_binary_file, is_cicd_file, is_config_file,
+                      is_deployment_file, is_package_file, is_release_file, is_test_file)
+from benchmarks.mock_github import MockGithubServer
+from loc_pool import LocProcessPool
+from path_classifier import (FILE_BINARY, FILE_CICD, FILE_CONFIG, FILE_DEPLOYMENT, FILE_DOCS, FILE_PACKAGE,
+                             FILE_RELEASE, FILE_TEST)
+
+PATHS = ['README.md', 'docs/guide.rst', 'src/app.py', 'tests/test_app.py', '.github/workflows/ci.yml',
+         'package.json', 'Dockerfile', 'CHANGELOG.md', 'assets/logo.png', 'setup.cfg', 'Makefile', 'a/b/.gitkeep']
+
+
+def test_pooled_counting_matches_threads(make_analyzer, analyze, monkeypatch):
+    # Small batches so several are in flight per repository
+    monkeypatch.setattr(LocProcessPool, 'BATCH_FILES', 3)
+    with MockGithubServer(repo_count=3, file_count=10, latency=0) as server:
+        expected = {stats.name: stats for stats in analyze(server, MAX_WORKERS=2)}
+        pooled = {stats.name: stats for stats in analyze(server, MAX_WORKERS=2, LOC_PROCESS_WORKERS=2)}
+
+    assert pooled == expected
+    assert all(stats.code_stats.total_loc > 0 for stats in pooled.values())
+
+
+def test_batch_flags_match_classifiers():
+    content = b'import os\n\n# comment\nprint(os.name)\n'
+    results = analyze_file_batch([(path, content) for path in PATHS] + [('src/skipped.py', None)])
+
+    for path, (_, loc, flags) in zip(PATHS, results):
+        assert loc == count_lines_of_code(content.decode(), path), path
+        assert bool(flags & FILE_DOCS) == ('readme' in path.lower() or path.startswith('docs/') or
+                                          path.lower().endswith('.md')), path
+        assert bool(flags & FILE_TEST) == is_test_file(path), path
+        assert bool(flags & FILE_CICD) == is_cicd_file(path), path
+        assert bool(flags & FILE_CONFIG) == is_config_file(path), path
+        assert bool(flags & FILE_PACKAGE) == is_package_file(path), path
+        assert bool(flags & FILE_DEPLOYMENT) == is_deployment_file(path), path
+        assert bool(flags & FILE_RELEASE) == is_release_file(path), path
+        assert bool(flags & FILE_BINARY) == is_binary_file(path), path
+
+    assert results[-1] == ('Python', None, 0)
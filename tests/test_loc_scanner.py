@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the compiled LOC scanner against the line-by-line counting rules
+"""
+
+import os
+import random
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import CodeAnalyzer
+
+analyzer = CodeAnalyzer()
+
+CASES = {
+    'python': [
+        'import os\n\n# comment\nx = 1\n',
+        '"""Module docstring"""\nimport os\n',
+        'def f():\n    """\n    Multi-line docstring\n    """\n    return 1\n',
+        "def f():\n    '''\n    Single quoted\n    '''\n    return 1\n",
+        "x = '''abc'''  # trailing\ny = 2\n",
+        'x = """start\nstill inside\nend""" + y\n',
+        # A block opened with ''' only closes on the primary """ marker
+        "'''\ninside\n'''\nstill counted as comment\n\"\"\"\nz = 1\n",
+        '   \t\n\r\n  # indented comment\r\n  code()\r\n',
+    ],
+    'c': [
+        '/* header */\nint main() {\n  return 0; // done\n}\n',
+        'int a; /* start\n * middle\n */ int b;\n',
+        'int a; /* one */ /* two\n */\n',
+        '/* a */ // only a comment after\nx();\n',
+        '// /* not a block\ny();\n',
+    ],
+    'html': ['<div>\n<!-- comment -->\n<!--\nmulti\n--> <p>after</p>\n</div>\n'],
+    'lua': ['--[[ looks like a block but starts as a line comment\nx = 1\n]]\nlocal y = 2 --[[ inline\n]] z()\n'],
+    'haskell': ['{- block -}\nmain = print 1 -- trailing\n{-\nopen\n-}\n'],
+    'julia': ['#= block =#\nx = 1\n#=\nmulti\n=# y = 2\n'],
+    'markdown': ['# Title\n\ntext\n   \n- item\n'],
+    'sql': ['-- comment\nSELECT 1; /* c */\n/*\n*/ SELECT 2;\n'],
+    'css': ['a { color: red; }\n/* c */\n// not a comment in css\n'],
+}
+
+# Fragments mixing every kind of comment marker, blank space and odd whitespace
+FRAGMENTS = ['x = 1', 'code()', '#', '//', '--', ';', '%', '"""', "'''", '/*', '*/', '<!--', '-->', '{-', '-}',
+             '--[[', ']]', '#=', '=#', '<#', '#>', '=begin', '=end', '=pod', '=cut', ' ', '\t', '\r',
+             '\u00a0', '\u2028', '\x1c', '']
+
+
+def _random_source(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(0, 40)):
+        lines.append(''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 5))))
+    return '\n'.join(lines) + rng.choice(['', '\n'])
+
+
+def test_known_cases_match_line_rules():
+    for language, sources in CASES.items():
+        for source in sources:
+            expected = analyzer._count_standard_file_loc_by_lines(source, language)
+            assert analyzer._count_standard_file_loc(source, language) == expected, (language, source)
+
+
+def test_random_sources_match_line_rules_for_every_language():
+    rng = random.Random(1234)
+    languages = list(analyzer.language_patterns) + ['unknown']
+    for _ in range(3000):
+        language = rng.choice(languages)
+        source = _random_source(rng)
+        expected = analyzer._count_standard_file_loc_by_lines(source, language)
+        assert analyzer._count_standard_file_loc(source, language) == expected, (language, source)
+
+
+def test_scan_resumes_across_line_aligned_pieces():
+    rng = random.Random(99)
+    scanner = analyzer.scanners['python']
+    for _ in range(500):
+        lines = _random_source(rng).split('\n')
+        cut = rng.randint(0, len(lines))
+        first, second = '\n'.join(lines[:cut]) + '\n', '\n'.join(lines[cut:])
+
+        loc, in_block = scanner.scan(first)
+        rest, _ = scanner.scan(second, in_block)
+        assert loc + rest == scanner.count('\n'.join(lines))
+
+
+def test_byte_scanners_match_on_ascii():
+    rng = random.Random(77)
+    languages = list(analyzer.language_patterns)
+    ascii_fragments = [fragment for fragment in FRAGMENTS if fragment.isascii() and fragment != '\x1c']
+    for _ in range(2000):
+        language = rng.choice(languages)
+        lines = [''.join(rng.choice(ascii_fragments) for _ in range(rng.randint(0, 5)))
+                 for _ in range(rng.randint(0, 40))]
+        source = '\n'.join(lines)
+        assert analyzer.byte_scanners[language].count(source.encode()) == \
+               analyzer.scanners[language].count(source), (language, source)
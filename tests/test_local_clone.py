@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for clone-based repository file analysis against local fixture repositories
+"""
+
+import os
+import subprocess
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import AnalyzerCloneFiles, GithubAnalyzer
+from config import DEFAULT_CONFIG
+
+FIXTURE_FILES = {
+    "README.md": "# Fixture\n\nA small repository used for tests.\n",
+    "src/app.py": "import os\n\n# comment\ndef main():\n    return os.getcwd()\n",
+    "tests/test_app.py": "def test_main():\n    assert True\n",
+    ".github/workflows/ci.yml": "name: ci\non: push\n",
+    "requirements.txt": "requests\n",
+    "node_modules/dep/index.js": "module.exports = 1;\n",
+    "assets/logo.png": "not really a png",
+}
+
+
+def _git(*args, cwd=None):
+    subprocess.run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def _make_fixture_repo(path):
+    for name, content in FIXTURE_FILES.items():
+        file_path = path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+    _git("init", "--quiet", "-b", "main", str(path))
+    _git("add", "-A", cwd=path)
+    _git("commit", "--quiet", "-m", "fixture", cwd=path)
+
+
+def _analyze(tmp_path, clone_dir):
+    source = tmp_path / "source"
+    _make_fixture_repo(source)
+    repo = SimpleNamespace(name="fixture", full_name="tester/fixture", clone_url=source.as_uri(),
+                           default_branch="main")
+
+    config = DEFAULT_CONFIG.copy()
+    config.update({"ANALYZE_CLONES": True, "CLONE_DIR": str(clone_dir), "ENABLE_BLOB_CACHE": False})
+    github_analyzer = GithubAnalyzer(None, "tester", config)
+    return AnalyzerCloneFiles(github_analyzer, github_analyzer.cloner).analyze(repo), source
+
+
+def test_clone_analysis_reads_files_from_disk(tmp_path):
+    stats, _ = _analyze(tmp_path, tmp_path / "clones")
+
+    assert (tmp_path / "clones" / "tester" / "fixture" / ".git").exists()
+    assert stats['total_files'] == 5
+    assert stats['languages']['Python'] == 5
+    assert stats['has_readme'] and stats['readme_line_count'] == 3
+    assert stats['has_tests'] and stats['test_files_count'] == 1
+    assert stats['has_cicd']
+    assert "requirements.txt" in stats['dependency_files']
+    assert stats['media_metrics']['image_count'] == 1
+    assert stats['project_structure'] == {"src": 1, "tests": 1, "assets": 1, ".github": 1}
+
+
+def test_clone_analysis_reads_bare_mirror(tmp_path):
+    clone_dir = tmp_path / "clones"
+    source = tmp_path / "source"
+    _make_fixture_repo(source)
+    _git("clone", "--quiet", "--bare", str(source), str(clone_dir / "tester" / "fixture.git"))
+
+    repo = SimpleNamespace(name="fixture", full_name="tester/fixture", clone_url="unused", default_branch="main")
+    config = DEFAULT_CONFIG.copy()
+    config.update({"ANALYZE_CLONES": True, "CLONE_DIR": str(clone_dir), "ENABLE_BLOB_CACHE": False})
+    github_analyzer = GithubAnalyzer(None, "tester", config)
+    stats = AnalyzerCloneFiles(github_analyzer, github_analyzer.cloner).analyze(repo)
+
+    assert not (clone_dir / "tester" / "fixture").exists()
+    assert stats['total_files'] == 5
+    assert stats['languages']['Python'] == 5
+
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for counting notebook code lines without parsing the whole JSON
+"""
+
+import base64
+import json
+import logging
+import os
+import random
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import code_analyzer
+from notebook_scanner import NotebookScanner
+
+SOURCE_LINES = ['import os\n', '# comment\n', '\n', '  x = 1  \n', 'print("\\u00e9")', '\t#!\n', 'a\nb\n', '→ y\n',
+                'z = "' + 'é\\"' * 200 + '"\n']
+MUTATIONS = ['', ',', '}', ']', '"', '\\', '\\u12', '\x01', '0', '-', 'NaN', '1e5', '{"cells": []}', ' ', 'null',
+             '"' + 'x' * 300 + '"', '9' * 150, '["' + '\\n' * 20 + '"]']
+
+
+def _random_notebook(rng: random.Random) -> str:
+    cells = []
+    for _ in range(rng.randint(0, 6)):
+        lines = [rng.choice(SOURCE_LINES) for _ in range(rng.randint(0, 5))]
+        cell = {
+            'cell_type': rng.choice(['code', 'markdown', 'raw', 'code']),
+            'metadata': {'tags': rng.sample(['a', 'b', 'c'], rng.randint(0, 3)), 'collapsed': rng.random() < 0.5},
+            'source': lines if rng.random() < 0.7 else ''.join(lines),
+        }
+        if cell['cell_type'] == 'code':
+            cell['execution_count'] = rng.choice([None, 1, 2.5, -3])
+            cell['outputs'] = [{'output_type': 'display_data',
+                                'data': {'image/png': base64.b64encode(rng.randbytes(rng.randint(0, 64))).decode()}}]
+        cells.append(cell)
+
+    notebook = {'metadata': {'kernelspec': {'name': 'python3'}}, 'nbformat': 4, 'cells': cells}
+    text = json.dumps(notebook, indent=rng.choice([None, 1]), ensure_ascii=rng.random() < 0.5)
+
+    # Break the JSON or the nbformat shape now and then
+    for _ in range(rng.choice([0, 0, 1, 2])):
+        pos = rng.randint(0, len(text))
+        text = text[:pos] + rng.choice(MUTATIONS) + text[pos + rng.randint(0, 2):]
+    return text
+
+
+def test_scanner_matches_json_loads():
+    logging.disable(logging.WARNING)
+    try:
+        rng = random.Random(17)
+        for _ in range(5000):
+            text = _random_notebook(rng)
+            expected = code_analyzer._count_jupyter_notebook_loc_parsed(text, 'n.ipynb')
+            assert code_analyzer._count_jupyter_notebook_loc(text, 'n.ipynb') == expected, text
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_unusual_notebooks_are_left_to_json_loads():
+    scanner = NotebookScanner()
+    assert scanner.count('{"cells": [{"cell_type": "code", "source": ["x = 1"]}]}') == 1
+    # Duplicate keys, non-list sources and invalid JSON take the json.loads path
+    assert scanner.count('{"cells": [], "cells": [{"cell_type": "code", "source": "x"}]}') is None
+    assert scanner.count('{"cells": [{"cell_type": "code", "source": {"x": 1}}]}') is None
+    assert scanner.count('{"cells": [{"cell_type": "code", "source": ["x"]},]}') is None
+    # Deep outputs are skipped without recursion
+    assert scanner.count('{"outputs": ' + '[' * 100 + ']' * 100 + ', "cells": []}') == 0
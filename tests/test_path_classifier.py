@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the compiled path classifier against the is_*_file helpers
+"""
+
+import os
+import random
+from pathlib import PurePosixPath
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import (is_binary_file, is_cicd_file, is_config_file, is_deployment_file, is_package_file,
+                      is_release_file, is_test_file)
+from config import CONFIG_FILES, DEPLOYMENT_FILES, PACKAGE_FILES, RELEASE_FILES, SPECIAL_FILENAMES
+from path_classifier import (FILE_BINARY, FILE_CICD, FILE_CONFIG, FILE_DEPLOYMENT, FILE_DOCS, FILE_PACKAGE,
+                             FILE_RELEASE, FILE_TEST, PathInfo, path_classifier)
+
+DIRECTORIES = ['src', 'lib', 'tests', 'test', 'docs', 'spec', '.github', 'workflows', '.circleci', 'k8s',
+               'deploy', 'releases', 'Docs', 'node_modules', 'a.b', '']
+NAMES = (list(SPECIAL_FILENAMES) + list(CONFIG_FILES) + list(PACKAGE_FILES) + list(DEPLOYMENT_FILES) +
+         list(RELEASE_FILES) + ['main.py', 'README.md', 'x.test.ts', 'foo_test.go', 'logo.PNG', 'a.tar.gz',
+                                '.bashrc', 'notes.', '..hidden', 'x.MD', 'spec.rb', 'Jenkinsfile', 'VERSION'])
+
+
+def _reference_flags(path: str) -> int:
+    lowered = path.lower()
+    checks = [
+        (FILE_DOCS, 'readme' in lowered or lowered.startswith('docs/') or '/docs/' in lowered or
+         lowered.endswith('.md')),
+        (FILE_TEST, is_test_file(path)), (FILE_CICD, is_cicd_file(path)), (FILE_CONFIG, is_config_file(path)),
+        (FILE_PACKAGE, is_package_file(path)), (FILE_DEPLOYMENT, is_deployment_file(path)),
+        (FILE_RELEASE, is_release_file(path)), (FILE_BINARY, is_binary_file(path)),
+    ]
+    return sum(flag for flag, matched in checks if matched)
+
+
+def _random_path(rng: random.Random) -> str:
+    name = rng.choice(NAMES)
+    name = rng.choice([name, name.upper(), name.capitalize(), rng.choice(DIRECTORIES) + name])
+    return '/'.join([rng.choice(DIRECTORIES) for _ in range(rng.randint(0, 3))] + [name])
+
+
+def test_classify_matches_helpers():
+    rng = random.Random(7)
+    for _ in range(20000):
+        path = _random_path(rng)
+        assert path_classifier.classify(path) == _reference_flags(path), path
+
+
+def test_classify_many_matches_classify():
+    rng = random.Random(8)
+    paths = [_random_path(rng) for _ in range(5000)] + ['docs/a.md', 'readme', '']
+    assert path_classifier.classify_many(paths) == [path_classifier.classify(path) for path in paths]
+    assert path_classifier.classify_many([]) == []
+
+
+def test_path_info_matches_pathlib():
+    rng = random.Random(9)
+    for _ in range(5000):
+        # Tree listings never hold paths ending in a separator
+        path = _random_path(rng).rstrip('/')
+        info = PathInfo(path)
+        assert (info.name, info.extension) == (PurePosixPath(path).name, PurePosixPath(path).suffix.lower()), path
+        assert (info.lower_path, info.lower_name) == (path.lower(), info.name.lower()), path
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the header-fed rate limit budget
+"""
+
+import os
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from rate_budget import RateBudget
+
+NOW = 1_700_000_000
+
+
+def _budget(remaining, reset_in, reserve=0):
+    budget = RateBudget(reserve=reserve, clock=lambda: NOW)
+    budget.update_from_headers({'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': str(remaining),
+                                'X-RateLimit-Reset': str(NOW + reset_in), 'X-RateLimit-Resource': 'core'})
+    return budget
+
+
+def test_no_pacing_while_on_schedule():
+    budget = _budget(remaining=4000, reset_in=1800)
+
+    assert [budget.acquire() for _ in range(10)] == [0.0] * 10
+    assert budget.snapshot()['remaining'] == 3990
+
+
+def test_spending_ahead_of_schedule_is_spread_until_reset():
+    budget = _budget(remaining=100, reset_in=1000)
+
+    waits = [budget.acquire() for _ in range(3)]
+
+    # 100 requests over 1000s leaves one request every 10s
+    assert waits[0] == 0.0
+    assert 9.9 < waits[1] < 10.2
+    assert 19.9 < waits[2] < 20.4
+
+
+def test_reserve_is_not_paced_and_exhaustion_waits_for_reset():
+    assert _budget(remaining=50, reset_in=1000, reserve=100).acquire() == 0.0
+    assert _budget(remaining=0, reset_in=1000).acquire() == 1001
+
+
+def test_secondary_rate_limits_pause_grants():
+    budget = _budget(remaining=4000, reset_in=1800)
+
+    delay = budget.retry_delay(403, {'retry-after': '30'})
+    budget.note_retry_after(delay)
+
+    assert delay == 30
+    assert budget.acquire() == 30
+    assert budget.retry_delay(403, {'X-RateLimit-Remaining': '12'}) is None
+
+
+def test_spent_requests_come_from_pygithub_headers():
+    github = SimpleNamespace(rate_limiting=(4000, 5000), rate_limiting_resettime=NOW + 1800)
+    budget = RateBudget(clock=lambda: NOW)
+
+    assert budget.update_from_github(github) == 0
+    github.rate_limiting = (3975, 5000)
+    assert budget.update_from_github(github) == 25
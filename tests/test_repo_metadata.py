@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for batched GraphQL repository metadata, using recorded responses
+"""
+
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import GithubAnalyzer, SingleRepoAnalyzer
+from benchmarks.mock_github import MockGithubServer
+from config import DEFAULT_CONFIG
+from repo_metadata import RecordedTransport, RepoMetadataFetcher
+
+
+def _repository_node(open_prs, closed_issues, releases, head=True):
+    return {
+        "pullRequests": {"totalCount": open_prs},
+        "issues": {"totalCount": closed_issues},
+        "closedPullRequests": {"totalCount": 0},
+        "releases": {"totalCount": releases},
+        "languages": {"edges": [{"size": 1200, "node": {"name": "Python"}}]},
+        "defaultBranchRef": {"target": {
+            "oid": "a" * 40,
+            "authoredDate": "2024-05-01T12:00:00Z",
+            "lastMonth": {"totalCount": 4},
+            "lastYear": {"totalCount": 52},
+        }} if head else None,
+    }
+
+
+RECORDED = [
+    {"data": {"r0": _repository_node(3, 10, 2), "r1": _repository_node(0, 0, 0, head=False)}},
+    {"data": {"r0": None}, "errors": [{"type": "NOT_FOUND", "path": ["r0"]}]},
+]
+
+
+def _repo(full_name):
+    return SimpleNamespace(full_name=full_name, name=full_name.split('/')[1],
+                           pushed_at=datetime(2024, 5, 2, tzinfo=timezone.utc),
+                           created_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+
+
+def test_batches_repositories_into_aliased_queries():
+    transport = RecordedTransport(RECORDED)
+    fetcher = RepoMetadataFetcher(transport, batch_size=2)
+    repos = [_repo("octo/one"), _repo("octo/empty"), _repo("octo/gone")]
+
+    fetcher.prefetch(repos)
+
+    assert len(transport.requests) == 2
+    assert 'r1: repository(owner: "octo", name: "empty")' in transport.requests[0]['query']
+
+    one = fetcher.get(repos[0])
+    assert (one['open_prs'], one['closed_issues'], one['release_count']) == (3, 10, 2)
+    assert (one['commits_last_month'], one['commits_last_year']) == (4, 52)
+    assert one['languages'] == {"Python": 1200}
+
+    assert fetcher.get(repos[1])['last_commit_date'] is None
+    assert fetcher.get(repos[2]) is None
+
+    # Everything was served from the two batched queries
+    assert len(transport.requests) == 2
+
+
+def test_activity_metrics_use_prefetched_counts():
+    config = DEFAULT_CONFIG.copy()
+    config["ENABLE_BLOB_CACHE"] = False
+    github_analyzer = GithubAnalyzer(None, "tester", config)
+    github_analyzer.metadata_fetcher = RepoMetadataFetcher(RecordedTransport(RECORDED[:1]))
+    repo = _repo("octo/one")
+
+    metadata = github_analyzer.get_repo_metadata(repo)
+    activity = SingleRepoAnalyzer(github_analyzer)._analyze_repository_activity(repo, metadata)
+
+    assert activity['last_commit_date'] == datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    assert activity['commits_last_month'] == 4
+    assert activity['commits_last_year'] == 52
+
+
+def test_closed_issues_match_between_graphql_and_rest(make_analyzer, analyze):
+    with MockGithubServer(repo_count=1, file_count=2, latency=0) as server:
+        repo = server.repos["octo/repo0"]
+        repo.closed_issues, repo.closed_pulls = 5, 3
+
+        graphql = analyze(server)[0]
+        rest_analyzer = make_analyzer(server)
+        rest_analyzer.metadata_fetcher = None
+        rest = analyze(server, rest_analyzer)[0]
+
+    assert graphql.community.closed_issues == rest.community.closed_issues == 8
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for pausing a repository for the rate limit and resuming its files
+"""
+
+import os
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import AnalyzerRepoFiles, GithubAnalyzer
+from benchmarks.mock_github import MockGithubServer
+
+
+def _summary(stats):
+    code_stats = stats.code_stats
+    return (code_stats.total_files, code_stats.total_loc, dict(code_stats.languages),
+            code_stats.directory_tree.find('src').files)
+
+
+def test_paused_repository_resumes_from_its_progress(make_analyzer, analyze, monkeypatch):
+    monkeypatch.setattr(AnalyzerRepoFiles, 'SHARD_SIZE', 4)
+    with MockGithubServer(repo_count=1, file_count=14, latency=0) as server:
+        expected = _summary(analyze(server)[0])
+        full_requests = server.request_count
+
+        # The rate limit runs low after the first shard
+        checks = []
+        monkeypatch.setattr(GithubAnalyzer, 'rate_limit_low', lambda self: checks.append(1) or len(checks) > 1)
+        server.request_count = 0
+        analyzer = make_analyzer(server, ENABLE_CHECKPOINTING=True)
+        assert analyze(server, analyzer) == []
+        full_name = next(iter(server.repos))
+        progress = analyzer.checkpoint.load_progress(full_name)
+        assert len(progress['files']) == 8
+
+        monkeypatch.setattr(GithubAnalyzer, 'rate_limit_low', lambda self: False)
+        server.request_count = 0
+        analyzer = make_analyzer(server, ENABLE_CHECKPOINTING=True)
+        assert _summary(analyze(server, analyzer)[0]) == expected
+        # Files processed before the pause aren't fetched again
+        assert server.request_count < full_requests
+        assert analyzer.checkpoint.load_progress(full_name) is None
+
+
+def test_progress_of_a_changed_repository_is_dropped(make_analyzer, analyze, monkeypatch):
+    monkeypatch.setattr(AnalyzerRepoFiles, 'SHARD_SIZE', 1)
+    with MockGithubServer(repo_count=1, file_count=3, latency=0) as server:
+        analyzer = make_analyzer(server, ENABLE_CHECKPOINTING=True)
+        full_name = next(iter(server.repos))
+        # Saved for a file no longer in the listing
+        analyzer.checkpoint.save_progress(full_name, {'files': {'src/gone.py': 'abc'}, 'stats': {'total_loc': 999},
+                                                      'directories': {}, 'manifest_locs': {}, 'extensions': []})
+
+        results = analyze(server, analyzer)
+        assert results[0].code_stats.total_files == 4  # With the README
+        assert results[0].code_stats.total_loc < 999
+        assert analyzer.checkpoint.load_progress(full_name) is None
+
+        analyzer.checkpoint.save_progress(full_name, {'files': {}})
+        analyzer.checkpoint.clear()
+        assert analyzer.checkpoint.load_progress(full_name) is None
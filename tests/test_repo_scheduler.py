@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for scheduling repositories largest first on one long-lived worker pool
+"""
+
+import os
+import threading
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import AnalyzerRepoFiles
+from benchmarks.mock_github import MockGithubServer
+from repo_scheduler import RepoScheduler
+
+
+def test_largest_repositories_start_first():
+    started = []
+    gate = threading.Event()
+    with RepoScheduler(1) as scheduler:
+        # Keep the only worker busy until every task is queued
+        scheduler.submit(gate.wait, priority=1000)
+        futures = [scheduler.submit(started.append, size, priority=size) for size in (10, 500, 0, 40)]
+        dropped = scheduler.submit(started.append, 'dropped', priority=20)
+        assert dropped.cancel()
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    assert started == [500, 40, 10, 0]
+
+
+def test_spread_shards_run_on_the_caller_when_workers_are_busy():
+    gate = threading.Event()
+    with RepoScheduler(2) as scheduler:
+        blockers = [scheduler.submit(gate.wait) for _ in range(2)]
+        caller = threading.get_ident()
+        results = list(scheduler.spread(lambda shard: (shard, threading.get_ident()), range(5)))
+        gate.set()
+        for blocker in blockers:
+            blocker.result(timeout=5)
+
+    assert [shard for shard, _ in results] == list(range(5))
+    assert {thread for _, thread in results} == {caller}
+
+
+def test_shards_stolen_by_scheduler_workers_keep_the_results(analyze, monkeypatch):
+    def totals(workers):
+        return {stats.name: (stats.code_stats.total_files, stats.code_stats.total_loc)
+                for stats in analyze(server, MAX_WORKERS=workers)}
+
+    # Small shards so every repository is split across the workers
+    monkeypatch.setattr(AnalyzerRepoFiles, 'SHARD_SIZE', 3)
+    with MockGithubServer(repo_count=3, file_count=12, latency=0) as server:
+        assert totals(workers=3) == totals(workers=1)
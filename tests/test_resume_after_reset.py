@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for sleeping until the rate limit resets and carrying on in the same run
+"""
+
+import os
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import analyzer as analyzer_module
+from analyzer import GithubAnalyzer
+from benchmarks.mock_github import MockGithubServer
+
+
+def _spend_after_first_repository(monkeypatch):
+    """The rate limit is spent once the first repository is done, until the run sleeps"""
+    state = {'checks': 0, 'sleeps': []}
+
+    def rate_limit_spent(self):
+        state['checks'] += 1
+        return not state['sleeps'] and state['checks'] > 1
+
+    def sleep(seconds):
+        # Short sleeps (pacing, retries) pass through
+        if seconds >= GithubAnalyzer.RESET_RETRY_WAIT:
+            state['sleeps'].append(seconds)
+        elif seconds > 0:
+            real_sleep(seconds)
+
+    real_sleep = analyzer_module.time.sleep
+    monkeypatch.setattr(GithubAnalyzer, 'rate_limit_spent', rate_limit_spent)
+    monkeypatch.setattr(analyzer_module.time, 'sleep', sleep)
+    return state
+
+
+def test_run_sleeps_until_reset_and_finishes(analyze, monkeypatch):
+    state = _spend_after_first_repository(monkeypatch)
+    with MockGithubServer(repo_count=3, file_count=2, latency=0) as server:
+        results = analyze(server, ENABLE_CHECKPOINTING=True, RESUME_AFTER_RESET=True)
+
+    assert sorted(stats.base_info.name for stats in results) == ['repo0', 'repo1', 'repo2']
+    # One sleep until the reported reset, not one per second
+    assert len(state['sleeps']) == 1
+    assert 3000 < state['sleeps'][0] <= 3601
+
+
+def test_run_stops_at_the_rate_limit_by_default(analyze, monkeypatch):
+    state = _spend_after_first_repository(monkeypatch)
+    with MockGithubServer(repo_count=3, file_count=2, latency=0) as server:
+        results = analyze(server, ENABLE_CHECKPOINTING=True)
+
+    assert [stats.base_info.name for stats in results] == ['repo0']
+    assert state['sleeps'] == []
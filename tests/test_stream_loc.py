@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for counting lines of code from byte chunks and memory-mapped files
+"""
+
+import os
+import random
+import subprocess
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import code_analyzer, count_lines_of_code, count_lines_of_code_stream
+from benchmarks.mock_github import MockGithubServer
+from local_repo import GitObjectReader, LocalRepoFile
+
+PATHS = ['a.py', 'a.c', 'a.html', 'a.lua', 'a.md', 'a.sql', 'a.xyz', 'Makefile']
+FRAGMENTS = ['x = 1', 'code()', '#', '//', '--', '"""', '/*', '*/', '<!--', '-->', '--[[', ']]', ' ', '\t',
+             'é', '→', '𝄞', ' ', '']
+
+
+def _random_source(rng: random.Random) -> bytes:
+    lines = [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 5))) for _ in range(rng.randint(0, 40))]
+    data = '\n'.join(lines).encode()
+    # Invalid UTF-8 is dropped the same way whether decoded whole or in pieces
+    if rng.random() < 0.3:
+        data += rng.choice([b'\xff', b'\xe2\x82', b'\xf0'])
+    return data
+
+
+def _chunks(data: bytes, rng: random.Random):
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, 12)
+        yield data[pos:pos + size]
+        pos += size
+
+
+def test_stream_matches_whole_content():
+    rng = random.Random(2024)
+    for _ in range(3000):
+        path = rng.choice(PATHS)
+        data = _random_source(rng)
+        expected = count_lines_of_code(data.decode('utf-8', errors='ignore'), path)
+        assert count_lines_of_code_stream(_chunks(data, rng), path) == expected, (path, data)
+
+
+def test_notebook_stream_matches_whole_content():
+    notebook = b'{"cells": [{"cell_type": "code", "source": ["import os\\n", "# c\\n", "x = 1"]}]}'
+    assert count_lines_of_code_stream(_chunks(notebook, random.Random(1)), 'n.ipynb') == 2
+
+
+def test_local_and_mirror_files_stream_in_chunks(tmp_path):
+    content = ('/* header\n * block\n */\nint x;\n// c\n' * 50000).encode()
+    (tmp_path / 'big.c').write_bytes(content)
+    subprocess.run(['git', 'init', '--quiet', str(tmp_path)], check=True)
+    sha = subprocess.run(['git', 'hash-object', '-w', 'big.c'], cwd=tmp_path, check=True,
+                         capture_output=True, text=True).stdout.strip()
+    expected = count_lines_of_code(content.decode(), 'big.c')
+
+    local_file = LocalRepoFile(tmp_path, 'big.c', sha, len(content))
+    assert count_lines_of_code_stream(local_file.iter_chunks(4096), 'big.c') == expected
+
+    reader = GitObjectReader(tmp_path / '.git')
+    try:
+        # An abandoned stream is drained so later reads stay in sync
+        partial = reader.iter_read(sha, 4096)
+        next(partial)
+        partial.close()
+        mirror_file = LocalRepoFile(tmp_path, 'big.c', sha, len(content), reader=reader)
+        assert count_lines_of_code_stream(mirror_file.iter_chunks(4096), 'big.c') == expected
+        assert reader.read(sha) == content
+    finally:
+        reader.close()
+
+
+def test_large_blobs_are_counted_from_the_api(analyze):
+    big = b''.join(b'value_%d = %d\n\n# comment\n' % (i, i) for i in range(80000))
+    with MockGithubServer(repo_count=1, file_count=2, latency=0) as server:
+        mock_repo = next(iter(server.repos.values()))
+        small_loc = analyze(server)[0].code_stats.total_loc
+
+        mock_repo.add_file('src/generated.py', big)
+        assert len(big) > 1024 * 1024
+        assert analyze(server)[0].code_stats.total_loc == small_loc + 80000
+
+
+def test_mapped_files_match_decoded_content(tmp_path):
+    rng = random.Random(5)
+    for _ in range(300):
+        path = rng.choice(PATHS)
+        data = _random_source(rng)
+        (tmp_path / path).write_bytes(data)
+
+        local_file = LocalRepoFile(tmp_path, path, '0' * 40, len(data))
+        with local_file.open_buffer() as buffer:
+            loc = code_analyzer.count_lines_of_code_buffer(buffer, path)
+        assert loc == count_lines_of_code(data.decode('utf-8', errors='ignore'), path), (path, data)
+
+
+def test_nul_bytes_mark_mapped_content_as_binary(tmp_path):
+    (tmp_path / 'data.txt').write_bytes(b'header\n\0\x01\x02payload\n')
+    local_file = LocalRepoFile(tmp_path, 'data.txt', '0' * 40, 20)
+    with local_file.open_buffer() as buffer:
+        assert code_analyzer.count_lines_of_code_buffer(buffer, 'data.txt') is None
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for routing repositories across a pool of GitHub tokens
+"""
+
+import os
+
+from github import Github
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.mock_github import MockGithubServer
+from token_pool import TokenPool
+
+
+def test_rate_limited_token_fails_over(make_analyzer, analyze):
+    with MockGithubServer(repo_count=3, file_count=4, latency=0, token_limits={"small": 5}) as server:
+        expected = {stats.name: stats for stats in analyze(server)}
+
+        # The small token is picked first (it looks unused) and runs out during the first repository
+        analyzer = make_analyzer(server)
+        analyzer.token_pool = TokenPool(["mock-token", "small"], reserve=2, base_url=server.base_url)
+        pooled = {stats.name: stats for stats in analyze(server, analyzer)}
+        small_requests = server.token_requests["small"]
+
+    assert pooled == expected
+    assert small_requests > 5
+
+
+def test_tokens_are_picked_by_remaining_budget():
+    pool = TokenPool(["a", "b"], github_factory=lambda token: Github(token))
+    pool.tokens[0].budget.update(3000, 5000, 2_000_000_000)
+    pool.tokens[1].budget.update(4000, 5000, 2_000_000_000)
+
+    assert pool.acquire() is pool.tokens[1]
+    assert pool.acquire(exclude=[pool.tokens[1]]) is pool.tokens[0]
+
+    pool.tokens[1].budget.note_retry_after(600)
+    assert pool.acquire() is pool.tokens[0]
+
+
+def test_streamed_blobs_use_the_routed_token(make_analyzer, analyze):
+    big = b'value = 1\n' * 120000
+    with MockGithubServer(repo_count=1, file_count=2, latency=0) as server:
+        next(iter(server.repos.values())).add_file('src/big.py', big)
+
+        analyzer = make_analyzer(server)
+        analyzer.token_pool = TokenPool(["mock-token", "second"], base_url=server.base_url)
+        # The primary token looks nearly spent, so the repository is routed to the second one
+        analyzer.token_pool.primary.budget.update(100, 5000, server.reset_time)
+        total_loc = analyze(server, analyzer)[0].code_stats.total_loc
+
+        blob_tokens = {token for path, token in zip(server.requested_paths, server.requested_tokens)
+                       if '/git/blobs/' in path}
+        tree_tokens = {token for path, token in zip(server.requested_paths, server.requested_tokens)
+                       if '/git/trees/' in path}
+
+    assert total_loc > 120000
+    assert blob_tokens == tree_tokens == {"second"}
+    # The streamed download fed the second token's budget, not the primary's
+    assert analyzer.token_pool.primary.budget.snapshot()['remaining'] == 100
+
+
+def test_extra_tokens_from_env_reach_every_mode(monkeypatch, tmp_path):
+    from runner_analyzer import RunnerAnalyzer
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GITHUB_EXTRA_TOKENS", " extra-1, ,extra-2 ")
+    config = RunnerAnalyzer._setup_config("mock-token", "octo", None, None, "all", "disabled", "", "")
+
+    assert config["GITHUB_EXTRA_TOKENS"] == ["extra-1", "extra-2"]
+
+
+def test_pooled_clients_use_the_main_api_url():
+    pool = TokenPool(["a", "b"], base_url="https://ghe.example.com/api/v3")
+
+    assert {pooled.github.requester.base_url for pooled in pool.tokens} == {"https://ghe.example.com/api/v3"}
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for collecting repository files from the Git Trees API
+"""
+
+import os
+from types import SimpleNamespace
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from analyzer import AnalyzerRepoFiles, GithubAnalyzer
+from config import DEFAULT_CONFIG
+
+
+def _element(path, entry_type="blob", sha="0" * 40, size=10):
+    return SimpleNamespace(path=path, type=entry_type, sha=sha, size=size, mode="100644")
+
+
+class FakeRepo:
+    """Minimal stand-in for a PyGithub Repository serving git trees"""
+
+    name = "fake"
+    default_branch = "main"
+
+    def __init__(self, trees):
+        self.trees = trees
+        self.tree_calls = []
+
+    def get_git_tree(self, sha, recursive=False):
+        self.tree_calls.append((sha, recursive))
+        elements, truncated, *resolved_sha = self.trees[(sha, recursive)]
+        return SimpleNamespace(sha=resolved_sha[0] if resolved_sha else sha, tree=elements, truncated=truncated)
+
+
+def _file_analyzer():
+    config = DEFAULT_CONFIG.copy()
+    config["ENABLE_BLOB_CACHE"] = False
+    return AnalyzerRepoFiles(GithubAnalyzer(None, "tester", config))
+
+
+def test_flat_tree_is_filtered_locally():
+    repo = FakeRepo({("main", True): ([
+        _element("src", "tree"),
+        _element("src/app.py"),
+        _element("node_modules", "tree"),
+        _element("node_modules/lib/index.js"),
+        _element("logo.png"),
+        _element("vendored", "commit"),
+        _element("README.md"),
+    ], False)})
+    stats = AnalyzerRepoFiles._initialize_stats()
+
+    files = _file_analyzer()._collect_repository_files(repo, stats)
+
+    assert [f.path for f in files] == ["src/app.py", "README.md"]
+    assert repo.tree_calls == [("main", True)]
+    assert stats['skipped_directories'] == {"node_modules"}
+    assert dict(stats['project_structure']) == {"src": 1}
+    assert stats['excluded_file_count'] == 1
+    assert stats['media_metrics']['image_count'] == 1
+
+
+def test_truncated_tree_falls_back_to_subtree_listing():
+    repo = FakeRepo({
+        ("main", True): ([_element("a.py")], True, "root"),
+        ("root", False): ([_element("a.py"), _element("pkg", "tree", sha="pkg"),
+                           _element("dist", "tree", sha="dist")], False),
+        ("pkg", True): ([_element("mod.py"), _element("sub", "tree"), _element("sub/x.py")], False),
+    })
+    stats = AnalyzerRepoFiles._initialize_stats()
+
+    files = _file_analyzer()._collect_repository_files(repo, stats)
+
+    assert sorted(f.path for f in files) == ["a.py", "pkg/mod.py", "pkg/sub/x.py"]
+    assert ("dist", True) not in repo.tree_calls
+    assert stats['skipped_directories'] == {"dist"}
@@ -0,0 +1,156 @@
+"""
+Token Pool for GitHub Repository RunnerAnalyzer
+
+This module spreads analysis across several GitHub tokens (personal access
+tokens or GitHub App installation tokens), each with its own rate limit
+bucket. Every repository is routed to the token with the most budget left,
+and work interrupted by a rate limit moves to another token.
+
+Key components:
+- PooledToken: One token with its own PyGithub client, session and rate budget
+- TokenPool: Picks tokens by remaining budget and tracks which are limited
+"""
+
+import functools
+import threading
+from typing import Callable, Dict, List, Optional
+
+import requests
+from github import Consts, Github
+from urllib3.util.retry import Retry
+
+from rate_budget import RateBudget
+
+# Pooled clients retry server errors only. PyGithub's default retry sleeps until
+# the reset time on an exhausted token, which is exactly what the pool avoids.
+FAILOVER_RETRY = Retry(total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+
+
+def create_pooled_client(token: str, base_url: str = Consts.DEFAULT_BASE_URL) -> Github:
+    """Create a PyGithub client that surfaces rate limit errors instead of waiting them out"""
+    return Github(token, base_url=base_url, retry=FAILOVER_RETRY)
+
+
+def create_token_session(token: Optional[str], budget: RateBudget) -> requests.Session:
+    """Create a requests session authorized as ``token`` (anonymous without one) whose responses feed ``budget``"""
+    session = requests.Session()
+    session.headers['Accept'] = 'application/vnd.github.v3+json'
+    if token:
+        session.headers['Authorization'] = f'token {token}'
+    session.hooks['response'].append(budget.session_hook)
+    return session
+
+
+class PooledToken:
+    """A token with its own PyGithub client, requests session and header-fed rate budget"""
+
+    def __init__(self, token: str, github: Github, budget: RateBudget, label: str):
+        self.token = token
+        self.github = github
+        self.budget = budget
+        self.label = label
+        # Raw blob and archive downloads, made outside PyGithub
+        self.session = create_token_session(token, budget)
+
+    def available(self) -> bool:
+        """Whether the token has budget left and isn't paused by a secondary limit"""
+        snapshot = self.budget.snapshot()
+        if self.budget.retry_until > self.budget.clock():
+            return False
+        return not snapshot['limit'] or snapshot['remaining'] > self.budget.reserve
+
+    def refused(self) -> bool:
+        """Whether GitHub has started refusing this token's requests"""
+        snapshot = self.budget.snapshot()
+        return self.budget.retry_until > self.budget.clock() or bool(snapshot['limit'] and snapshot['remaining'] == 0)
+
+    def remaining(self) -> int:
+        """Requests left in the token's window; unobserved tokens count as a full bucket"""
+        snapshot = self.budget.snapshot()
+        return snapshot['remaining'] if snapshot['limit'] else 5000
+
+    def bind(self, repo):
+        """
+        Return the repository as this token's client sees it, so its requests go through this token.
+
+        A repository listed by another client is fetched again through this
+        one, which costs one request on this token's budget.
+        """
+        if repo.requester is self.github.requester:
+            return repo
+        return self.github.get_repo(repo.full_name)
+
+
+class TokenPool:
+    """
+    Pool of GitHub tokens routed by remaining rate limit budget.
+
+    The first token is the primary one used for listing repositories and
+    GraphQL; all of them share the analysis load.
+    """
+
+    def __init__(self, tokens: List[str], reserve: int = 0, pacing: bool = True,
+                 base_url: str = Consts.DEFAULT_BASE_URL,
+                 github_factory: Optional[Callable[[str], Github]] = None):
+        """
+        Args:
+            tokens: Tokens in priority order; duplicates and blanks are ignored
+            reserve: Requests each token keeps for finishing up (see RateBudget)
+            pacing: Whether each token's budget paces its requests
+            base_url: API URL of the main client (GitHub Enterprise Server included)
+            github_factory: Creates the PyGithub client of a token, a pooled client for base_url by default
+        """
+        unique = list(dict.fromkeys(token.strip() for token in tokens if token and token.strip()))
+        if not unique:
+            raise ValueError("A token pool needs at least one token")
+        if github_factory is None:
+            github_factory = functools.partial(create_pooled_client, base_url=base_url)
+
+        self.tokens = [PooledToken(token, github_factory(token), RateBudget(reserve, pacing),
+                                   f"token {index + 1} (...{token[-4:]})")
+                       for index, token in enumerate(unique)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def primary(self) -> PooledToken:
+        return self.tokens[0]
+
+    def acquire(self, exclude: Optional[List[PooledToken]] = None) -> PooledToken:
+        """
+        Pick the token with the most remaining budget.
+
+        Tokens in ``exclude`` are skipped while others are available. When
+        every token is limited, the one resetting first is returned so the
+        caller waits as little as possible.
+        """
+        exclude = exclude or []
+        with self._lock:
+            candidates = [t for t in self.tokens if t.available() and t not in exclude]
+            if candidates:
+                return max(candidates, key=lambda t: t.remaining())
+            return min(self.tokens, key=lambda t: max(t.budget.retry_until, t.budget.snapshot()['reset']))
+
+    def has_alternative(self, exclude: List[PooledToken]) -> bool:
+        """Whether a token outside ``exclude`` could take over"""
+        return any(t not in exclude and t.available() for t in self.tokens)
+
+    def any_available(self) -> bool:
+        """Whether any token still has budget above its reserve"""
+        return any(t.available() for t in self.tokens)
+
+    def refresh(self) -> None:
+        """Update every budget from the headers its client last saw (no requests)"""
+        for pooled in self.tokens:
+            if pooled.github.requester.rate_limiting[1] >= 0:
+                pooled.budget.update_from_github(pooled.github)
+
+    def snapshots(self) -> List[Dict]:
+        """Per-token budget state for RateLimitDisplay"""
+        return [dict(pooled.budget.snapshot(), label=pooled.label) for pooled in self.tokens]
+
+    def total_remaining(self) -> int:
+        """Requests left across all tokens"""
+        return sum(pooled.remaining() for pooled in self.tokens)
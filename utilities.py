@@ -6,16 +6,25 @@ Repository RunnerAnalyzer tool. It includes utilities for checkpointing analysis
 file operations, and string/path manipulation.
 
 Key components:
-- Checkpoint: Class for saving and loading analysis checkpoints
+- Checkpoint: Append-only log of analyzed repositories for resuming an analysis
+- IncrementalStore: Per-repository results kept between runs for incremental analysis
 - File operations: Functions for file type detection and analysis
 """
 
+import atexit
+import json
+import os
 import pickle
+import threading
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from console import logger
+from language_engine import language_engine
+from models import RepoStats, from_record, to_record
 
 
 def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
@@ -38,10 +47,19 @@ def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
 class Checkpoint:
     """
     Class for checkpointing analysis progress.
-    
-    Saves and loads checkpoint data to allow resuming analysis.
+
+    Each analyzed repository is appended to a JSON Lines log as it is
+    checkpointed, so a save writes only the repositories finished since the
+    last one. A small manifest, replaced atomically, records how much of the
+    log is complete; loading replays the log up to that point, so a save
+    interrupted mid-write never damages earlier records.
+
+    A repository paused part way by the rate limit also keeps its processed
+    blob SHAs and partial totals in a progress file until it is finished.
     """
 
+    FORMAT_VERSION = 1
+
     def __init__(self, config: Dict[str, Any], username: str) -> None:
         """
         Initialize a checkpoint handler.
@@ -53,82 +71,325 @@ class Checkpoint:
         self.checkpoint_dir = Path(config.get("CHECKPOINT_DIR", "checkpoints"))
         self.checkpoint_dir.mkdir(exist_ok=True)
         self.username = username
-        self.checkpoint_file = self.checkpoint_dir / f"{username}_checkpoint.pkl"
+        self.log_file = self.checkpoint_dir / f"{username}_checkpoint.jsonl"
+        self.manifest_file = self.checkpoint_dir / f"{username}_checkpoint.json"
+        # Pickled checkpoint written by earlier versions, still read to resume from
+        self.legacy_file = self.checkpoint_dir / f"{username}_checkpoint.pkl"
+        # Progress of repositories paused part way, one file each
+        self.progress_dir = self.checkpoint_dir / f"{username}_progress"
+
+        self._lock = threading.Lock()
+        # Stats already in the log, and the size of the log the manifest covers
+        self._logged_count = 0
+        self._log_bytes = 0
 
     def save(self, all_stats: List, analyzed_repo_names: List[str], remaining_repos: List) -> bool:
         """
         Save a checkpoint of the current analysis state.
-        
+
+        Only stats added to ``all_stats`` since the last save are written.
+
         Args:
             all_stats: List of repository statistics gathered so far
             analyzed_repo_names: List of repository names that have been analyzed
             remaining_repos: List of repository objects that still need to be analyzed
         """
-        try:
-            # Save a checkpoint with minimal data to allow resuming
-            checkpoint_data = {
-                'timestamp': datetime.now().replace(tzinfo=timezone.utc),
-                'username': self.username,
-                'analyzed_repo_names': analyzed_repo_names,
-                'all_stats': all_stats,
-                # We don't save the remaining_repos with the full repo objects
-                # as they can't be properly serialized; instead we just save names
-                'remaining_repo_names': [repo.name for repo in remaining_repos],
-                'total_repositories': len(analyzed_repo_names) + len(remaining_repos),
-                'completed_repositories': len(analyzed_repo_names)
-            }
+        with self._lock:
+            try:
+                # A list that shrank isn't the one the log holds, so start the log over
+                if len(all_stats) < self._logged_count:
+                    self._logged_count, self._log_bytes = 0, 0
 
-            with open(self.checkpoint_file, 'wb') as f:
-                pickle.dump(checkpoint_data, f)
+                # Anything after the size in the manifest is a save that never completed
+                with open(self.log_file, 'r+b' if self._log_bytes else 'wb') as f:
+                    f.truncate(self._log_bytes)
+                    f.seek(self._log_bytes)
+                    for repo_stats in all_stats[self._logged_count:]:
+                        f.write(json.dumps(to_record(repo_stats), separators=(',', ':')).encode() + b'\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                    log_bytes = f.tell()
 
-            logger.info(f"Saved checkpoint for {self.username} ({len(analyzed_repo_names)} repos analyzed)")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save checkpoint: {e}")
-            return False
+                self._write_manifest({
+                    'version': self.FORMAT_VERSION,
+                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'username': self.username,
+                    'records': len(all_stats),
+                    'log_bytes': log_bytes,
+                    'total_repositories': len(analyzed_repo_names) + len(remaining_repos),
+                    'completed_repositories': len(analyzed_repo_names)
+                })
+                self._logged_count, self._log_bytes = len(all_stats), log_bytes
+
+                logger.info(f"Saved checkpoint for {self.username} ({len(analyzed_repo_names)} repos analyzed)")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save checkpoint: {e}")
+                return False
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Replace the manifest atomically, so it always describes a complete log"""
+        temp_file = self.manifest_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.manifest_file)
 
     def load(self) -> Optional[Dict[str, Any]]:
         """
-        Load a saved checkpoint if one exists.
+        Load a saved checkpoint if one exists, replaying the log.
         
         Returns:
             Dictionary with checkpoint data if a valid checkpoint exists, otherwise None
         """
-        if not self.checkpoint_file.exists():
+        if not self.manifest_file.exists():
+            if self.legacy_file.exists():
+                return self._load_legacy()
             logger.info(f"No checkpoint file found for {self.username}")
             return None
 
         try:
-            with open(self.checkpoint_file, 'rb') as f:
-                # noinspection PickleLoad
-                checkpoint_data = pickle.load(f)
+            with open(self.manifest_file, encoding='utf-8') as f:
+                manifest = json.load(f)
 
             # Basic validation
-            if not isinstance(checkpoint_data, dict) or 'username' not in checkpoint_data:
+            if not isinstance(manifest, dict) or manifest.get('version') != self.FORMAT_VERSION:
                 logger.warning(f"Invalid checkpoint file for {self.username}")
                 return None
 
-            if checkpoint_data['username'] != self.username:
+            if manifest['username'] != self.username:
                 logger.warning(f"Checkpoint username mismatch: expected {self.username}, "
-                               f"found {checkpoint_data['username']}")
+                               f"found {manifest['username']}")
                 return None
 
-            checkpoint_age = datetime.now().replace(tzinfo=timezone.utc) - checkpoint_data['timestamp']
-            hours_old = checkpoint_age.total_seconds() / 3600
+            with open(self.log_file, 'rb') as f:
+                lines = f.read(manifest['log_bytes']).splitlines()
+            all_stats = [from_record(RepoStats, json.loads(line)) for line in lines[:manifest['records']]]
 
+            timestamp = datetime.fromisoformat(manifest['timestamp'])
+            hours_old = (datetime.now(timezone.utc) - timestamp).total_seconds() / 3600
             logger.info(f"Found checkpoint for {self.username} from "
-                        f"{checkpoint_data['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} "
-                        f"({hours_old:.1f} hours ago)")
+                        f"{timestamp.strftime('%Y-%m-%d %H:%M:%S')} ({hours_old:.1f} hours ago)")
+            logger.info(f"Checkpoint has {manifest['completed_repositories']} of "
+                        f"{manifest['total_repositories']} repositories analyzed")
 
-            logger.info(f"Checkpoint has {checkpoint_data['completed_repositories']} of "
-                        f"{checkpoint_data['total_repositories']} repositories analyzed")
+            # Later saves append to the replayed log
+            with self._lock:
+                self._logged_count, self._log_bytes = len(all_stats), manifest['log_bytes']
+
+            return {
+                'timestamp': timestamp,
+                'username': self.username,
+                'analyzed_repo_names': [repo_stats.name for repo_stats in all_stats],
+                'all_stats': all_stats,
+                'total_repositories': manifest['total_repositories'],
+                'completed_repositories': manifest['completed_repositories']
+            }
+
+        except Exception as e:
+            logger.error(f"Error loading checkpoint: {e}")
+            return None
+
+    def _load_legacy(self) -> Optional[Dict[str, Any]]:
+        """Load a pickled checkpoint; the next save rewrites it as a log"""
+        try:
+            with open(self.legacy_file, 'rb') as f:
+                # noinspection PickleLoad
+                checkpoint_data = pickle.load(f)
 
+            if not isinstance(checkpoint_data, dict) or checkpoint_data.get('username') != self.username:
+                logger.warning(f"Invalid checkpoint file for {self.username}")
+                return None
+
+            logger.info(f"Found pickled checkpoint for {self.username} with "
+                        f"{checkpoint_data['completed_repositories']} of "
+                        f"{checkpoint_data['total_repositories']} repositories analyzed")
             return checkpoint_data
 
         except Exception as e:
             logger.error(f"Error loading checkpoint: {e}")
             return None
 
+    def save_progress(self, full_name: str, progress: Dict[str, Any]) -> bool:
+        """
+        Save the progress of a repository whose analysis paused part way.
+
+        Args:
+            full_name: Repository the progress belongs to
+            progress: JSON-safe processed blob SHAs and partial totals
+        """
+        try:
+            self.progress_dir.mkdir(exist_ok=True)
+            progress_file = self._progress_file(full_name)
+            temp_file = progress_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(dict(progress, version=self.FORMAT_VERSION, full_name=full_name), f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, progress_file)
+
+            logger.info(f"Saved progress of {full_name} ({len(progress.get('files', ()))} files processed)")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save progress of {full_name}: {e}")
+            return False
+
+    def load_progress(self, full_name: str) -> Optional[Dict[str, Any]]:
+        """Progress saved for a repository by a paused analysis, if any"""
+        progress_file = self._progress_file(full_name)
+        if not progress_file.exists():
+            return None
+
+        try:
+            with open(progress_file, encoding='utf-8') as f:
+                progress = json.load(f)
+            if progress.get('version') != self.FORMAT_VERSION or progress.get('full_name') != full_name:
+                logger.warning(f"Ignoring invalid progress file for {full_name}")
+                return None
+            return progress
+        except Exception as e:
+            logger.error(f"Error loading progress of {full_name}: {e}")
+            return None
+
+    def clear_progress(self, full_name: str) -> None:
+        """Forget a repository's progress once its analysis is complete"""
+        self._progress_file(full_name).unlink(missing_ok=True)
+
+    def _progress_file(self, full_name: str) -> Path:
+        return self.progress_dir / f"{full_name.replace('/', '__')}.json"
+
+    def clear(self) -> None:
+        """Delete the checkpoint once the analysis it covers is complete"""
+        with self._lock:
+            for path in (self.manifest_file, self.log_file, self.legacy_file):
+                path.unlink(missing_ok=True)
+            if self.progress_dir.exists():
+                for progress_file in self.progress_dir.glob('*.json'):
+                    progress_file.unlink(missing_ok=True)
+            self._logged_count, self._log_bytes = 0, 0
+
+
+@dataclass
+class IncrementalEntry:
+    """
+    Last analyzed state of a repository.
+
+    Attributes:
+        head_sha: Default branch commit the stats were computed for
+        pushed_at: Repository ``pushed_at`` timestamp at analysis time
+        repo_stats: RepoStats produced by the analysis
+        manifest: Blob listing and per-file LOC used to diff the next run, if available
+    """
+    head_sha: Optional[str]
+    pushed_at: Optional[datetime]
+    repo_stats: Any
+    manifest: Optional[Dict[str, Any]] = None
+
+
+# Stores still open at interpreter exit; one atexit hook saves them all
+_open_stores: "weakref.WeakSet[IncrementalStore]" = weakref.WeakSet()
+
+
+def _save_open_stores() -> None:
+    """Save the incremental stores that are still open at exit"""
+    for store in list(_open_stores):
+        store.save()
+
+
+atexit.register(_save_open_stores)
+
+
+class IncrementalStore:
+    """
+    Class for keeping per-repository analysis results between runs.
+
+    Entries are keyed by the repository's full name and written to a pickle
+    file next to the checkpoint, so unchanged repositories can be skipped on
+    the next run and changed ones diffed against their last analyzed commit.
+    """
+
+    def __init__(self, config: Dict[str, Any], username: str) -> None:
+        """
+        Initialize the store and load entries from a previous run.
+
+        Args:
+            config: Configuration dictionary
+            username: GitHub username being analyzed
+        """
+        self.state_dir = Path(config.get("CHECKPOINT_DIR", "checkpoints"))
+        self.state_dir.mkdir(exist_ok=True)
+        self.username = username
+        self.state_file = self.state_dir / f"{username}_incremental.pkl"
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, IncrementalEntry] = self._load()
+
+        _open_stores.add(self)
+
+    def _load(self) -> Dict[str, IncrementalEntry]:
+        """Read entries saved by a previous run"""
+        if not self.state_file.exists():
+            return {}
+
+        try:
+            with open(self.state_file, 'rb') as f:
+                # noinspection PickleLoad
+                state = pickle.load(f)
+
+            if not isinstance(state, dict) or state.get('username') != self.username:
+                logger.warning(f"Ignoring incremental state that doesn't belong to {self.username}")
+                return {}
+
+            logger.info(f"Loaded incremental state for {len(state['entries'])} repositories")
+            return state['entries']
+
+        except Exception as e:
+            logger.error(f"Error loading incremental state: {e}")
+            return {}
+
+    def get(self, full_name: str) -> Optional[IncrementalEntry]:
+        """Return the last analyzed state of a repository, if any"""
+        with self._lock:
+            return self._entries.get(full_name)
+
+    def put(self, full_name: str, entry: IncrementalEntry) -> None:
+        """Record the analyzed state of a repository"""
+        with self._lock:
+            self._entries[full_name] = entry
+            self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Write entries to disk if anything changed.
+
+        The whole store is rewritten, so the analyzer saves it when an
+        analysis finishes or fails rather than with every checkpoint. The
+        file is replaced atomically so an interrupted save never leaves a
+        truncated state behind.
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+
+            try:
+                temp_file = self.state_file.with_suffix('.tmp')
+                with open(temp_file, 'wb') as f:
+                    pickle.dump({
+                        'timestamp': datetime.now().replace(tzinfo=timezone.utc),
+                        'username': self.username,
+                        'entries': self._entries
+                    }, f)
+                os.replace(temp_file, self.state_file)
+
+                self._dirty = False
+                logger.info(f"Saved incremental state for {len(self._entries)} repositories")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save incremental state: {e}")
+                return False
+
+
 def is_test_file(file_path: str) -> bool:
     """
     Check if a file is likely a test file based on its name or location.
@@ -166,14 +427,4 @@ def get_file_language(file_path: str) -> str:
     Returns:
         Inferred programming language name or 'Other'
     """
-    ext_to_language = {
-        '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript', '.jsx': 'JavaScript', '.tsx': 'TypeScript',
-        '.java': 'Java', '.cpp': 'C++', '.c': 'C', '.cs': 'C#', '.go': 'Go', '.rb': 'Ruby',
-        '.php': 'PHP', '.swift': 'Swift', '.m': 'Objective-C', '.rs': 'Rust', '.scala': 'Scala',
-        '.kt': 'Kotlin', '.kts': 'Kotlin', '.sh': 'Shell', '.bash': 'Shell', '.html': 'HTML',
-        '.css': 'CSS', '.scss': 'SCSS', '.sass': 'SASS', '.less': 'LESS', '.md': 'Markdown',
-        '.json': 'JSON', '.yaml': 'YAML', '.yml': 'YAML', '.xml': 'XML', '.sql': 'SQL',
-        '.dart': 'Dart', '.r': 'R', '.lua': 'Lua', '.pl': 'Perl', '.jl': 'Julia',
-        '.tex': 'LaTeX', '.ltx': 'LaTeX', '.latex': 'LaTeX'
-    }
-    return ext_to_language.get(Path(file_path).suffix.lower(), 'Other')
+    return language_engine.resolve(file_path).language
@@ -21,6 +21,7 @@ from visualize.static import HTMLVisualizer
 from visualize.static import JSCreator
 from config import ThemeConfig, DefaultTheme
 from console import logger
+from language_engine import language_engine
 from models import RepoStats
 from visualize import PersonalRepoAnalysis, OrganizationRepoAnalysis, CreateDetailedCharts
 
@@ -58,59 +59,6 @@ class HtmlContent(NamedTuple):
         ])
 
 
-def _get_ext_to_lang_mapping() -> dict:
-    """Get the mapping of file extensions to languages"""
-    return {
-        ".py": "Python",
-        ".js": "JavaScript",
-        ".tsx": "TypeScript",
-        ".ts": "TypeScript",
-        ".jsx": "JavaScript",
-        ".java": "Java",
-        ".rb": "Ruby",
-        ".php": "PHP",
-        ".go": "Go",
-        ".rs": "Rust",
-        ".cs": "C#",
-        ".cpp": "C++",
-        ".c": "C",
-        ".html": "HTML",
-        ".css": "CSS",
-        ".sh": "Shell",
-        ".vue": "Vue",
-        ".dart": "Dart",
-        ".kt": "Kotlin",
-        ".swift": "Swift",
-        ".scala": "Scala",
-        ".m": "Objective-C",
-        ".mm": "Objective-C",
-        ".pl": "Perl",
-        ".pm": "Perl",
-        ".r": "R",
-        ".lua": "Lua",
-        ".groovy": "Groovy",
-        ".sql": "SQL",
-        ".md": "Markdown",
-        ".json": "JSON",
-        ".yml": "YAML",
-        ".yaml": "YAML",
-        ".xml": "XML",
-        ".toml": "TOML",
-        ".ex": "Elixir",
-        ".exs": "Elixir",
-        ".elm": "Elm",
-        ".clj": "Clojure",
-        ".fs": "F#",
-        ".hs": "Haskell",
-        ".jl": "Julia",
-        ".nim": "Nim",
-        ".zig": "Zig",
-        ".tex": "LaTeX",
-        ".ltx": "LaTeX",
-        ".latex": "LaTeX"
-    }
-
-
 def get_timestamp():
     """Get current timestamp in UTC format"""
     return datetime.now().replace(tzinfo=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
@@ -218,8 +166,6 @@ class GithubVisualizer:
         all_languages = defaultdict(int)
         # Keep track of repositories that need their primary language changed to "Unknown"
         self.repos_with_unknown_language = set()
-        # Store inferred languages based on file extensions
-        self.inferred_languages = {}
 
         # Debug info: log repositories and their assigned languages before processing
         logger.info("Repository language data before processing:")
@@ -232,7 +178,6 @@ class GithubVisualizer:
 
         # Log the repositories marked as having unknown language
         logger.info(f"Repositories with unknown language: {list(self.repos_with_unknown_language)}")
-        logger.info(f"Repositories with inferred languages: {self.inferred_languages}")
 
         # Verify and log the total sum of language-specific LOC
         lang_loc_sum = sum(all_languages.values())
@@ -255,66 +200,22 @@ class GithubVisualizer:
         Returns:
             Standardized language name
         """
-        # Language standardization mapping
-        language_aliases = {
-            'TeX': 'LaTeX',  # Treat TeX as LaTeX
-            'React': 'JavaScript',  # For backward compatibility, treat React as JavaScript
-            'ReactJS': 'JavaScript'
-        }
-
-        return language_aliases.get(language, language)
+        return language_engine.standardize(language)
 
     def _process_repo_language(self, stats: RepoStats, all_languages: dict) -> None:
         """Process language data for a single repository"""
-        # Check if repository has any valid language data
-        lang_sum = sum(stats.languages.values())
-
-        if lang_sum == 0:
-            # No language data
+        # Every counted file has a language, so a repository without language data has no LOC to attribute
+        if sum(stats.languages.values()) == 0:
             if stats.total_loc > 0:
-                # Try to infer language from file types
-                inferred_language = self._infer_language_from_file_types(stats)
-
-                if inferred_language != "Unknown":
-                    logger.info(f"Inferred language '{inferred_language}' for {stats.name} based on file extensions")
-                    all_languages[inferred_language] += stats.total_loc
-                    self.inferred_languages[stats.name] = inferred_language
-                else:
-                    # If we couldn't infer a language, use "Unknown"
-                    logger.info(f"Adding {stats.total_loc} LOC from {stats.name} to 'Unknown' language")
-                    all_languages["Unknown"] += stats.total_loc
-                    self.repos_with_unknown_language.add(stats.name)
-            else:
-                # Zero LOC, just mark as unknown
-                self.repos_with_unknown_language.add(stats.name)
-        else:
-            # Repository has language data
-            for lang, loc in stats.languages.items():
-                # Standardize language names (e.g., treat TeX as LaTeX)
-                standardized_lang = self._standardize_language_name(lang)
-                all_languages[standardized_lang] += loc
+                logger.info(f"Adding {stats.total_loc} LOC from {stats.name} to 'Unknown' language")
+                all_languages["Unknown"] += stats.total_loc
+            self.repos_with_unknown_language.add(stats.name)
+            return
 
-    @staticmethod
-    def _infer_language_from_file_types(stats: RepoStats) -> str:
-        """Infer the primary language of a repository based on file extensions"""
-        # Map of file extensions to languages
-        ext_to_lang = _get_ext_to_lang_mapping()
-
-        # Count files by extension
-        file_counts = defaultdict(int)
-        for ext, count in stats.file_types.items():
-            file_counts[ext] += count
-
-        # Find the most common programming language extension
-        max_count = 0
-        inferred_language = "Unknown"
-        for ext, count in file_counts.items():
-            if ext in ext_to_lang and count > max_count:
-                max_count = count
-                inferred_language = ext_to_lang[ext]
-
-        # Standardize the inferred language name
-        return GithubVisualizer._standardize_language_name(inferred_language)
+        for lang, loc in stats.languages.items():
+            # Standardize language names (e.g., treat TeX as LaTeX)
+            standardized_lang = self._standardize_language_name(lang)
+            all_languages[standardized_lang] += loc
 
     @staticmethod
     def _adjust_language_totals(all_languages: dict, total_loc_sum: int, lang_loc_sum: int) -> None:
@@ -505,11 +406,8 @@ class GithubVisualizer:
 
     def _determine_repository_language(self, repo):
         """Determine the primary language for a repository"""
-        # Check if this repository has an inferred language
-        if hasattr(self, 'inferred_languages') and repo.name in self.inferred_languages:
-            language = self.inferred_languages[repo.name]
-        # Otherwise check if it's marked as Unknown
-        elif hasattr(self, 'repos_with_unknown_language') and repo.name in self.repos_with_unknown_language:
+        # Check if it's marked as Unknown
+        if hasattr(self, 'repos_with_unknown_language') and repo.name in self.repos_with_unknown_language:
             language = "Unknown"
         # Fallback to the original primary language
         else: